@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+🗃️ GREEN WORLD - Plant Analysis Result Cache
+- Image scores are keyed by the photo's SHA-256 (its blob digest), so identical uploads are scored once
+- Persisted in the plant_analysis_cache table; an in-process LRU in front answers repeats in microseconds
+- Entries carry the plant_health scoring version, so recalibrated scoring never serves stale results
+- Memory/database hit and miss counters, and the hit rate, for monitoring
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('GREEN_WORLD_ANALYSIS_CACHE_SIZE', '1024'))
+
+
+class AnalysisCache:
+    """LRU of analysis results in front of the plant_analysis_cache table.
+
+    Values are the dicts plant_health.analyze_image() returns. Entries hold
+    the stored JSON and every get decodes a fresh dict (cheaper than a deep
+    copy), so nothing a caller changes leaks back into the cache. get and
+    put take the database connection to use.
+    """
+
+    def __init__(self, version, max_entries=DEFAULT_MAX_ENTRIES):
+        self.version = version
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # image hash -> result JSON
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _remember(self, image_hash, encoded):
+        with self._lock:
+            self._entries[image_hash] = encoded
+            self._entries.move_to_end(image_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def get(self, conn, image_hash):
+        """Cached result for an image hash, or None"""
+        with self._lock:
+            encoded = self._entries.get(image_hash)
+            if encoded is not None:
+                self._entries.move_to_end(image_hash)
+                self._stats['memory_hits'] += 1
+        if encoded is not None:
+            return json.loads(encoded)
+
+        row = conn.execute('''
+            SELECT result FROM plant_analysis_cache WHERE image_hash = ? AND version = ?
+        ''', (image_hash, self.version)).fetchone()
+        if row is None:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        self._remember(image_hash, row[0])
+        with self._lock:
+            self._stats['db_hits'] += 1
+        return json.loads(row[0])
+
+    def put(self, conn, image_hash, result):
+        """Store a result and commit; replaces an entry from an older scoring version"""
+        encoded = json.dumps(result)
+        conn.execute('''
+            INSERT OR REPLACE INTO plant_analysis_cache (image_hash, version, result)
+            VALUES (?, ?, ?)
+        ''', (image_hash, self.version, encoded))
+        conn.commit()
+        self._remember(image_hash, encoded)
+        with self._lock:
+            self._stats['stores'] += 1
+
+    def clear(self):
+        """Drop the in-memory entries (the table is left alone)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['db_hits']) / lookups, 4) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['version'] = self.version
+        return stats
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+⚙️ GREEN WORLD - Background Analysis Jobs
+- Requests enqueue a job and return at once; CPU-heavy work runs in a process pool
+- Queue depth is bounded: a full queue raises QueueFull so callers can answer 503 + Retry-After
+- run_batch fans a batch out over the same pool and waits for it, sharing the same bound
+- Results are finished on a thread in this process (database writes, notifications)
+- Per-stage timings (queue wait, run, finish) for every job and in aggregate
+- Uses forkserver/spawn workers, so they never inherit the server's threads or sockets
+"""
+
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 32
+# Finished jobs kept in memory so status requests can report their timings
+RECENT_JOBS = 500
+STAGES = ('queue_wait', 'run', 'finish', 'total')
+
+
+class QueueFull(Exception):
+    """Raised by submit/run_batch when max_pending jobs are already waiting or running"""
+
+    def __init__(self, retry_after):
+        super().__init__(f'Job queue is full; retry in {retry_after} s')
+        self.retry_after = retry_after
+
+
+def _timed_call(fn, args):
+    """Runs in the worker: the result plus when the worker picked the job up and how long it took"""
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time() - started
+
+
+class Job:
+    __slots__ = ('id', 'status', 'submitted', 'timings', 'error')
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'
+        self.submitted = time.time()
+        self.timings = {}
+        self.error = None
+
+    def to_dict(self):
+        return {'id': self.id, 'status': self.status, 'error': self.error,
+                'timings_ms': {stage: round(seconds * 1000, 2) for stage, seconds in self.timings.items()}}
+
+
+class JobQueue:
+    """Bounded queue in front of a ProcessPoolExecutor.
+
+    ``submit(job_id, fn, args, finish)`` runs ``fn(*args)`` in a worker
+    process (fn must be importable, i.e. a module-level function), then calls
+    ``finish(result, error)`` on a thread in this process. ``finish`` is where
+    results are saved and pushed to clients; it runs whether fn succeeded or not.
+    With fn=None there is no worker stage and finish gets result None.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = {}
+        # Slots held by run_batch calls in progress
+        self._reserved = 0
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'batches': 0, 'batch_items': 0}
+        self._stage_totals = {stage: 0.0 for stage in STAGES}
+        self._stage_max = {stage: 0.0 for stage in STAGES}
+
+    def _get_executor(self):
+        if self._executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def retry_after(self):
+        """Rough seconds until a slot frees up, from the mean job time so far"""
+        with self._lock:
+            done = self._stats['completed'] + self._stats['failed']
+            mean_total = self._stage_totals['total'] / done if done else 1.0
+        return max(1, round(mean_total * self.max_pending / self.workers))
+
+    def _submit(self, fn, args):
+        try:
+            return self._get_executor().submit(_timed_call, fn, args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool once
+            self._executor = None
+            return self._get_executor().submit(_timed_call, fn, args)
+
+    def submit(self, job_id, fn, args, finish):
+        with self._lock:
+            full = len(self._pending) + self._reserved >= self.max_pending
+            if full:
+                self._stats['rejected'] += 1
+            else:
+                job = Job(job_id)
+                self._pending[job_id] = job
+                self._stats['submitted'] += 1
+        if full:
+            raise QueueFull(self.retry_after())
+        if fn is None:
+            future = Future()
+            future.set_result((None, time.time(), 0.0))
+            self._run_finish(job, future, finish)
+            return job
+        try:
+            future = self._submit(fn, args)
+        except Exception:
+            self._forget(job_id)
+            raise
+        future.add_done_callback(lambda done: self._run_finish(job, done, finish))
+        return job
+
+    def run_batch(self, fn, args_list):
+        """Run fn(*args) for each args tuple across the pool and wait for all of them.
+
+        Returns [(result, error), ...] in order. The batch holds one queue slot
+        per item while it runs, and raises QueueFull if they are not all free.
+        """
+        count = len(args_list)
+        with self._lock:
+            full = len(self._pending) + self._reserved + count > self.max_pending
+            if full:
+                self._stats['rejected'] += 1
+            else:
+                self._reserved += count
+                self._stats['batches'] += 1
+                self._stats['batch_items'] += count
+        if full:
+            raise QueueFull(self.retry_after())
+        try:
+            futures = [self._submit(fn, args) for args in args_list]
+            results = []
+            for future in futures:
+                try:
+                    results.append((future.result()[0], None))
+                except Exception as e:
+                    results.append((None, e))
+            return results
+        finally:
+            with self._lock:
+                self._reserved -= count
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._pending.pop(job_id, None)
+            self._stats['submitted'] -= 1
+
+    def _run_finish(self, job, future, finish):
+        # The pool's result thread calls this; hand off so slow finishes never hold up other results
+        try:
+            threading.Thread(target=self._finish, args=(job, future, finish),
+                             name=f'job-finish-{job.id}', daemon=True).start()
+        except RuntimeError:
+            # No new threads once the interpreter is shutting down; finish here instead
+            self._finish(job, future, finish)
+
+    def _finish(self, job, future, finish):
+        result = error = None
+        try:
+            result, started, run_seconds = future.result()
+            job.timings['queue_wait'] = max(0.0, started - job.submitted)
+            job.timings['run'] = run_seconds
+        except Exception as e:
+            error = e
+            job.error = f'{type(e).__name__}: {e}'
+        # A worker error is handed to finish, which may still complete the job
+        # (e.g. with a fallback); the job only fails when finish itself raises
+        finish_started = time.time()
+        job.status = 'completed'
+        try:
+            finish(result, error)
+        except Exception as e:
+            job.status = 'failed'
+            job.error = job.error or f'{type(e).__name__}: {e}'
+            print(f"🚨 Finishing job {job.id} failed: {e}")
+        job.timings['finish'] = time.time() - finish_started
+        job.timings['total'] = time.time() - job.submitted
+        with self._lock:
+            self._pending.pop(job.id, None)
+            self._recent[job.id] = job
+            while len(self._recent) > RECENT_JOBS:
+                self._recent.popitem(last=False)
+            self._stats[job.status] += 1
+            for stage, seconds in job.timings.items():
+                self._stage_totals[stage] += seconds
+                self._stage_max[stage] = max(self._stage_max[stage], seconds)
+
+    def get(self, job_id):
+        """The in-memory Job for a pending or recently finished id, else None"""
+        with self._lock:
+            return self._pending.get(job_id) or self._recent.get(job_id)
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending) + self._reserved
+            done = stats['completed'] + stats['failed']
+            stats['stages_ms'] = {
+                stage: {'mean': round(self._stage_totals[stage] * 1000 / done, 2) if done else 0.0,
+                        'max': round(self._stage_max[stage] * 1000, 2)}
+                for stage in STAGES
+            }
+        stats['max_pending'] = self.max_pending
+        stats['workers'] = self.workers
+        return stats
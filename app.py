@@ -15,15 +15,36 @@ Everything you asked for:
 FINAL VERSION - ALL FEATURES INCLUDED IN YOUR ORIGINAL FILE
 """
 
-from flask import Flask, render_template_string, request, redirect, url_for, session, flash, jsonify
-from flask_socketio import SocketIO, emit, join_room, leave_room
+from flask import Flask, request, redirect, url_for, session, flash, jsonify, abort
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
-import sqlite3
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from schema import MIGRATIONS, get_meta, set_meta
+from migrations import migrate
+import timeline
+import feed_cache
+import engagement
+from assets import AssetPipeline
+from blob_store import DIGEST_PATTERN, BlobStore
+from thumbnails import ThumbnailPipeline
+from analysis_jobs import JobQueue, QueueFull
+from analysis_cache import AnalysisCache
+from compression import CompressionMiddleware
+import image_uploads
+import plant_health
+import plant_catalog
+import plant_suggest
+import search_rollups
+from template_registry import TemplateRegistry
+from realtime import EventDispatcher, FEED_ROOM, MAX_WATCHED_POSTS, post_room, user_room
+from database import get_db, connection as db_connection, init_app as init_database, pool_stats, retry_on_busy, start_checkpoint_task
+import concurrent.futures
 import os
+import threading
 import uuid
 from datetime import datetime
 import json
+import base64
 import random
 import time
 import requests
@@ -36,9 +57,36 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 upload_folder = os.path.join(current_dir, 'uploads')
 app.config['UPLOAD_FOLDER'] = upload_folder
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+app.config['DATABASE'] = os.environ.get('GREEN_WORLD_DB', 'green_world.db')
+app.config['DATABASE_POOL_SIZE'] = int(os.environ.get('GREEN_WORLD_DB_POOL_SIZE', '8'))
+app.config['DATABASE_CHECKPOINT_INTERVAL'] = float(os.environ.get('GREEN_WORLD_DB_CHECKPOINT_INTERVAL', '60'))
+app.config['LIKE_FLUSH_INTERVAL'] = engagement.DEFAULT_FLUSH_INTERVAL
+
+SAMPLE_DATA_MARKER = 'sample_data_seeded'
+
+# Shared connection pool (WAL storage profile); each request reuses one pooled connection via `g`
+init_database(app)
+
+# gzip/brotli and ETag/304 for pages and APIs; installed before SocketIO so
+# Socket.IO traffic is routed around it
+compression = CompressionMiddleware(app.wsgi_app, min_size=int(os.environ.get('GREEN_WORLD_COMPRESS_MIN_SIZE', '1024')), rules={
+    # Fingerprinted CSS/JS is compressed once per client, so small files are worth it too
+    '/assets/': {'min_size': 256},
+    # Counters change on every call; a validator would never match
+    '/api/db/stats': {'etag': False},
+})
+app.wsgi_app = compression
 
 # Initialize SocketIO for real-time features
 socketio = SocketIO(app, cors_allowed_origins="*")
+# Outbound events are queued per room and emitted off the request thread
+events = EventDispatcher(socketio)
+
+# Inline page templates are compiled once and reused instead of per request;
+# set GREEN_WORLD_TEMPLATE_CACHE to a directory to keep the bytecode across restarts.
+# Their static CSS/JS is served from fingerprinted files under /assets.
+assets = AssetPipeline(app, output_dir=os.environ.get('GREEN_WORLD_ASSET_DIR'))
+templates = TemplateRegistry(app, cache_dir=os.environ.get('GREEN_WORLD_TEMPLATE_CACHE'), assets=assets)
 
 # Ensure upload directory exists with proper error handling
 try:
@@ -51,682 +99,559 @@ except Exception as e:
     app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
     print(f"📁 Using temp directory: {app.config['UPLOAD_FOLDER']}")
 
-def init_db():
-    """Initialize Green World Social Media Database"""
-    conn = sqlite3.connect('green_world.db')
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id TEXT PRIMARY KEY,
-            email TEXT UNIQUE NOT NULL,
-            username TEXT UNIQUE NOT NULL,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            password_hash TEXT NOT NULL,
-            bio TEXT,
-            location TEXT,
-            website TEXT,
-            phone TEXT,
-            profile_image TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Posts table for social media features
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS posts (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            title TEXT,
-            content TEXT NOT NULL,
-            image_url TEXT,
-            video_url TEXT,
-            tags TEXT,
-            likes_count INTEGER DEFAULT 0,
-            comments_count INTEGER DEFAULT 0,
-            shares_count INTEGER DEFAULT 0,
-            post_type TEXT DEFAULT 'general',
-            is_featured BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
+# Uploaded plant photos are kept once per distinct content, addressed by SHA-256,
+# with WebP thumbnails made in the background for srcset
+blobs = BlobStore(os.path.join(app.config['UPLOAD_FOLDER'], 'blobs'))
+thumbnails = ThumbnailPipeline(blobs, app, workers=int(os.environ.get('GREEN_WORLD_THUMBNAIL_WORKERS', '2')))
 
-    # Enhanced plant analyses table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS plant_analyses (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            image_url TEXT NOT NULL,
-            plant_name TEXT,
-            plant_type TEXT,
-            dehydration_level TEXT NOT NULL,
-            dehydration_score REAL,
-            stress_level TEXT,
-            stress_score REAL,
-            sunlight_exposure TEXT,
-            sunlight_score REAL,
-            sunlight_warning TEXT,
-            disease_detected TEXT,
-            pest_detected TEXT,
-            overall_health_score REAL,
-            confidence_score REAL,
-            symptoms TEXT,
-            recommendations TEXT,
-            prevention_tips TEXT,
-            cure_suggestions TEXT,
-            watering_schedule TEXT,
-            fertilizer_recommendation TEXT,
-            urgency_level TEXT,
-            recovery_time TEXT,
-            follow_up_date TEXT,
-            notes TEXT,
-            analysis_status TEXT DEFAULT 'completed',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
+# Image scores of photos analyzed before, by blob digest (SQLite-backed, LRU in front)
+analysis_cache = AnalysisCache(plant_health.SCORING_VERSION)
 
-    # Social media tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS follows (
-            id TEXT PRIMARY KEY,
-            follower_id TEXT NOT NULL,
-            following_id TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (follower_id) REFERENCES users (id),
-            FOREIGN KEY (following_id) REFERENCES users (id),
-            UNIQUE(follower_id, following_id)
-        )
-    ''')
+# Plant analyses run off the request thread: image scoring in a process pool
+# (one worker per CPU), at most GREEN_WORLD_ANALYSIS_QUEUE jobs queued or running at once.
+# Batch requests share the pool and take one slot per image.
+analysis_queue = JobQueue(workers=int(os.environ.get('GREEN_WORLD_ANALYSIS_WORKERS', str(os.cpu_count() or 2))),
+                          max_pending=int(os.environ.get('GREEN_WORLD_ANALYSIS_QUEUE', '32')))
+app.config['ANALYSIS_BATCH_SIZE'] = int(os.environ.get('GREEN_WORLD_ANALYSIS_BATCH_SIZE', '16'))
+# How long a results page waits for its analysis before it stops polling
+app.config['ANALYSIS_POLL_TIMEOUT'] = float(os.environ.get('GREEN_WORLD_ANALYSIS_POLL_TIMEOUT', '120'))
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS likes (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            post_id TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (post_id) REFERENCES posts (id),
-            UNIQUE(user_id, post_id)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS comments (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            post_id TEXT NOT NULL,
-            content TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (post_id) REFERENCES posts (id)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id TEXT PRIMARY KEY,
-            sender_id TEXT NOT NULL,
-            receiver_id TEXT NOT NULL,
-            content TEXT NOT NULL,
-            read_status BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (sender_id) REFERENCES users (id),
-            FOREIGN KEY (receiver_id) REFERENCES users (id)
-        )
-    ''')
+# Search-box completions over the plant catalog, most searched species first
+plant_suggestions = plant_suggest.PlantSuggester(plant_catalog.catalog)
 
-    # Real-time notifications table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            type TEXT NOT NULL,
-            title TEXT NOT NULL,
-            message TEXT NOT NULL,
-            data TEXT,
-            read_status BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
+# plant_searches folded into per-query and per-day counters every GREEN_WORLD_SEARCH_ROLLUP_INTERVAL
+# seconds; the counts rank search results and suggestions
+search_analytics = search_rollups.SearchRollups(plant_catalog.catalog)
+app.config['SEARCH_ROLLUP_INTERVAL'] = search_rollups.DEFAULT_INTERVAL
 
-    # Plant searches table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS plant_searches (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            search_query TEXT NOT NULL,
-            plant_data TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # Create demo user
-    cursor.execute('''
-        INSERT OR IGNORE INTO users 
-        (id, email, username, first_name, last_name, password_hash)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('1', 'test@example.com', 'testuser', 'Plant', 'Expert', generate_password_hash('test')))
-    
-    # Insert demo analyses
-    demo_analyses = [
-        ('demo1', '1', 'demo1.jpg', 'Monstera Deliciosa', 'Tropical', 'Moderately Dehydrated', 0.65, 'Low Stress', 0.25, 'Adequate', 0.75, 'None', 'None', 0.72, 88, 
-         '["Slight wilting", "Dry soil", "Brown edges"]', 
-         '["Water thoroughly", "Check moisture weekly"]',
-         '["Consistent watering", "Monitor humidity"]',
-         '["Adjust watering schedule", "Improve drainage"]',
-         'Water every 7-10 days', 'Monthly liquid fertilizer', 'Medium', '3-5 days', '2024-01-20', 'Responding well'),
-        
-        ('demo2', '1', 'demo2.jpg', 'Fiddle Leaf Fig', 'Indoor Tree', 'Severely Dehydrated', 0.85, 'High Stress', 0.80, 'Insufficient', 0.45, 'Leaf Spot', 'None', 0.45, 92,
-         '["Brown leaf edges", "Dropping leaves", "Dry soil"]',
-         '["Immediate watering", "Relocate to brighter spot"]',
-         '["Consistent schedule", "Proper drainage"]',
-         '["IMMEDIATE INTERVENTION", "Assess root system", "Apply fungicide"]',
-         'Water every 5-7 days', 'Diluted fertilizer bi-weekly', 'High', '1-2 weeks', '2024-01-25', 'Critical condition'),
-         
-        ('demo3', '1', 'demo3.jpg', 'Snake Plant', 'Succulent', 'Well Hydrated', 0.30, 'No Stress', 0.10, 'Good', 0.85, 'None', 'None', 0.92, 95,
-         '["Healthy green leaves", "Firm texture"]',
-         '["Continue current routine"]',
-         '["Avoid overwatering", "Good drainage"]',
-         '["Maintain current care", "Regular pruning"]',
-         'Water every 2-3 weeks', 'Fertilize quarterly', 'Low', 'Healthy', '2024-02-01', 'Excellent condition')
-    ]
-    
-    for analysis in demo_analyses:
-        cursor.execute('''
-            INSERT OR IGNORE INTO plant_analyses 
-            (id, user_id, image_url, plant_name, plant_type, dehydration_level, dehydration_score, stress_level, stress_score, sunlight_exposure, sunlight_score, disease_detected, pest_detected, overall_health_score, confidence_score, symptoms, recommendations, prevention_tips, cure_suggestions, watering_schedule, fertilizer_recommendation, urgency_level, recovery_time, follow_up_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', analysis)
-    
-    conn.commit()
-    conn.close()
-    print("✅ NEW Database initialized with enhanced plant analysis system!")
+def init_db():
+    """Bring green_world.db up to the current schema version (no DDL on warm starts)"""
+    with db_connection() as conn:
+        version = migrate(conn, MIGRATIONS)
+    print(f"✅ Green World database ready (schema v{version})")
 
 def create_sample_data():
-    """Create sample users and posts for demonstration"""
-    conn = sqlite3.connect('green_world.db')
-
-    # Check if sample data already exists
-    existing = conn.execute('SELECT COUNT(*) FROM users WHERE email LIKE "%sample%"').fetchone()[0]
-    if existing > 0:
-        conn.close()
-        return
-
-    # ULTIMATE sample users - 20+ diverse profiles from around the world
-    sample_users = [
-        {
-            'id': 'user_001',
-            'username': 'plant_lover_sarah',
-            'email': 'sarah@sample.com',
-            'first_name': 'Sarah',
-            'last_name': 'Green',
-            'bio': 'Urban gardener 🌱 | Monstera enthusiast | Faridabad plant expert',
-            'location': 'Faridabad, Haryana, India',
-            'website': 'https://sarahsplants.com',
-            'phone': '+91-9876543210',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_002',
-            'username': 'garden_guru_mike',
-            'email': 'mike@sample.com',
-            'first_name': 'Mike',
-            'last_name': 'Johnson',
-            'bio': 'Professional botanist 🌿 | Plant doctor | 15+ years experience',
-            'location': 'Delhi, India',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_003',
-            'username': 'flower_queen_priya',
-            'email': 'priya@sample.com',
-            'first_name': 'Priya',
-            'last_name': 'Sharma',
-            'bio': 'Rose garden specialist 🌹 | Flower photographer | Nature lover',
-            'location': 'Gurgaon, Haryana',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_004',
-            'username': 'succulent_sam',
-            'email': 'sam@sample.com',
-            'first_name': 'Sam',
-            'last_name': 'Patel',
-            'bio': 'Succulent collector 🌵 | Desert plant expert | Propagation master',
-            'location': 'Noida, UP',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_005',
-            'username': 'herb_master_raj',
-            'email': 'raj@sample.com',
-            'first_name': 'Raj',
-            'last_name': 'Kumar',
-            'bio': 'Herb garden specialist 🌿 | Organic farming | Cooking enthusiast',
-            'location': 'Faridabad, Haryana',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_006',
-            'username': 'indoor_plant_asha',
-            'email': 'asha@sample.com',
-            'first_name': 'Asha',
-            'last_name': 'Gupta',
-            'bio': 'Indoor plant expert 🏠 | Air purifying plants | Small space gardening',
-            'location': 'Delhi, India',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_007',
-            'username': 'tree_lover_amit',
-            'email': 'amit@sample.com',
-            'first_name': 'Amit',
-            'last_name': 'Singh',
-            'bio': 'Tree plantation activist 🌳 | Environmental warrior | Green Delhi',
-            'location': 'Delhi, India',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_008',
-            'username': 'orchid_expert_maya',
-            'email': 'maya@sample.com',
-            'first_name': 'Maya',
-            'last_name': 'Reddy',
-            'bio': 'Orchid specialist 🌺 | Exotic plant collector | Greenhouse owner',
-            'location': 'Bangalore, Karnataka',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_009',
-            'username': 'vegetable_farmer_ravi',
-            'email': 'ravi@sample.com',
-            'first_name': 'Ravi',
-            'last_name': 'Yadav',
-            'bio': 'Organic vegetable farmer 🥕 | Sustainable agriculture | Farm to table',
-            'location': 'Faridabad, Haryana',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_010',
-            'username': 'bonsai_artist_kenji',
-            'email': 'kenji@sample.com',
-            'first_name': 'Kenji',
-            'last_name': 'Tanaka',
-            'bio': 'Bonsai artist 🌲 | Japanese gardening | Zen master | 20+ years',
-            'location': 'Tokyo, Japan',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_011',
-            'username': 'cactus_collector_sofia',
-            'email': 'sofia@sample.com',
-            'first_name': 'Sofia',
-            'last_name': 'Martinez',
-            'bio': 'Cactus collector 🌵 | Desert botanist | Rare species hunter',
-            'location': 'Arizona, USA',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_012',
-            'username': 'medicinal_plant_dr_anita',
-            'email': 'anita@sample.com',
-            'first_name': 'Dr. Anita',
-            'last_name': 'Verma',
-            'bio': 'Medicinal plant researcher 🌿 | Ayurveda expert | PhD Botany',
-            'location': 'Haridwar, Uttarakhand',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_013',
-            'username': 'rooftop_gardener_neha',
-            'email': 'neha@sample.com',
-            'first_name': 'Neha',
-            'last_name': 'Agarwal',
-            'bio': 'Rooftop gardener 🏢 | Urban farming | Terrace garden designer',
-            'location': 'Mumbai, Maharashtra',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_014',
-            'username': 'aquatic_plant_expert_tom',
-            'email': 'tom@sample.com',
-            'first_name': 'Tom',
-            'last_name': 'Wilson',
-            'bio': 'Aquatic plant specialist 🌊 | Aquarium designer | Water garden expert',
-            'location': 'London, UK',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_015',
-            'username': 'native_plant_advocate_lisa',
-            'email': 'lisa@sample.com',
-            'first_name': 'Lisa',
-            'last_name': 'Thompson',
-            'bio': 'Native plant advocate 🌼 | Wildlife gardening | Pollinator supporter',
-            'location': 'California, USA',
-            'website': 'https://nativeplants.org',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_016',
-            'username': 'greenhouse_master_alex',
-            'email': 'alex@sample.com',
-            'first_name': 'Alex',
-            'last_name': 'Rodriguez',
-            'bio': 'Greenhouse automation expert 🏠 | Smart farming | IoT plant monitoring',
-            'location': 'Barcelona, Spain',
-            'website': 'https://smartgreenhouse.tech',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_017',
-            'username': 'permaculture_designer_kim',
-            'email': 'kim@sample.com',
-            'first_name': 'Kim',
-            'last_name': 'Park',
-            'bio': 'Permaculture designer 🌍 | Sustainable living | Food forest creator',
-            'location': 'Seoul, South Korea',
-            'website': 'https://permaculturedesign.kr',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_018',
-            'username': 'tropical_plant_hunter_carlos',
-            'email': 'carlos@sample.com',
-            'first_name': 'Carlos',
-            'last_name': 'Silva',
-            'bio': 'Tropical plant hunter 🌺 | Rainforest explorer | Rare species collector',
-            'location': 'São Paulo, Brazil',
-            'website': 'https://tropicalplants.br',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_019',
-            'username': 'hydroponic_farmer_zara',
-            'email': 'zara@sample.com',
-            'first_name': 'Zara',
-            'last_name': 'Ahmed',
-            'bio': 'Hydroponic farming specialist 💧 | Soilless cultivation | Urban agriculture',
-            'location': 'Dubai, UAE',
-            'website': 'https://hydroponics.ae',
-            'password_hash': generate_password_hash('password123'),
-        },
-        {
-            'id': 'user_020',
-            'username': 'botanical_photographer_elena',
-            'email': 'elena@sample.com',
-            'first_name': 'Elena',
-            'last_name': 'Petrov',
-            'bio': 'Botanical photographer 📸 | Nature documentarian | Plant portrait artist',
-            'location': 'Moscow, Russia',
-            'website': 'https://botanicalphoto.ru',
-            'password_hash': generate_password_hash('password123'),
-        }
-    ]
+    """Create sample users and posts once; returns False if already seeded"""
+    with db_connection() as conn:
+        # One-shot: the marker in app_meta replaces a LIKE '%sample%' scan of users
+        if get_meta(conn, SAMPLE_DATA_MARKER):
+            return False
+
+        # ULTIMATE sample users - 20+ diverse profiles from around the world
+        sample_users = [
+            {
+                'id': 'user_001',
+                'username': 'plant_lover_sarah',
+                'email': 'sarah@sample.com',
+                'first_name': 'Sarah',
+                'last_name': 'Green',
+                'bio': 'Urban gardener 🌱 | Monstera enthusiast | Faridabad plant expert',
+                'location': 'Faridabad, Haryana, India',
+                'website': 'https://sarahsplants.com',
+                'phone': '+91-9876543210',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_002',
+                'username': 'garden_guru_mike',
+                'email': 'mike@sample.com',
+                'first_name': 'Mike',
+                'last_name': 'Johnson',
+                'bio': 'Professional botanist 🌿 | Plant doctor | 15+ years experience',
+                'location': 'Delhi, India',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_003',
+                'username': 'flower_queen_priya',
+                'email': 'priya@sample.com',
+                'first_name': 'Priya',
+                'last_name': 'Sharma',
+                'bio': 'Rose garden specialist 🌹 | Flower photographer | Nature lover',
+                'location': 'Gurgaon, Haryana',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_004',
+                'username': 'succulent_sam',
+                'email': 'sam@sample.com',
+                'first_name': 'Sam',
+                'last_name': 'Patel',
+                'bio': 'Succulent collector 🌵 | Desert plant expert | Propagation master',
+                'location': 'Noida, UP',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_005',
+                'username': 'herb_master_raj',
+                'email': 'raj@sample.com',
+                'first_name': 'Raj',
+                'last_name': 'Kumar',
+                'bio': 'Herb garden specialist 🌿 | Organic farming | Cooking enthusiast',
+                'location': 'Faridabad, Haryana',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_006',
+                'username': 'indoor_plant_asha',
+                'email': 'asha@sample.com',
+                'first_name': 'Asha',
+                'last_name': 'Gupta',
+                'bio': 'Indoor plant expert 🏠 | Air purifying plants | Small space gardening',
+                'location': 'Delhi, India',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_007',
+                'username': 'tree_lover_amit',
+                'email': 'amit@sample.com',
+                'first_name': 'Amit',
+                'last_name': 'Singh',
+                'bio': 'Tree plantation activist 🌳 | Environmental warrior | Green Delhi',
+                'location': 'Delhi, India',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_008',
+                'username': 'orchid_expert_maya',
+                'email': 'maya@sample.com',
+                'first_name': 'Maya',
+                'last_name': 'Reddy',
+                'bio': 'Orchid specialist 🌺 | Exotic plant collector | Greenhouse owner',
+                'location': 'Bangalore, Karnataka',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_009',
+                'username': 'vegetable_farmer_ravi',
+                'email': 'ravi@sample.com',
+                'first_name': 'Ravi',
+                'last_name': 'Yadav',
+                'bio': 'Organic vegetable farmer 🥕 | Sustainable agriculture | Farm to table',
+                'location': 'Faridabad, Haryana',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_010',
+                'username': 'bonsai_artist_kenji',
+                'email': 'kenji@sample.com',
+                'first_name': 'Kenji',
+                'last_name': 'Tanaka',
+                'bio': 'Bonsai artist 🌲 | Japanese gardening | Zen master | 20+ years',
+                'location': 'Tokyo, Japan',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_011',
+                'username': 'cactus_collector_sofia',
+                'email': 'sofia@sample.com',
+                'first_name': 'Sofia',
+                'last_name': 'Martinez',
+                'bio': 'Cactus collector 🌵 | Desert botanist | Rare species hunter',
+                'location': 'Arizona, USA',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_012',
+                'username': 'medicinal_plant_dr_anita',
+                'email': 'anita@sample.com',
+                'first_name': 'Dr. Anita',
+                'last_name': 'Verma',
+                'bio': 'Medicinal plant researcher 🌿 | Ayurveda expert | PhD Botany',
+                'location': 'Haridwar, Uttarakhand',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_013',
+                'username': 'rooftop_gardener_neha',
+                'email': 'neha@sample.com',
+                'first_name': 'Neha',
+                'last_name': 'Agarwal',
+                'bio': 'Rooftop gardener 🏢 | Urban farming | Terrace garden designer',
+                'location': 'Mumbai, Maharashtra',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_014',
+                'username': 'aquatic_plant_expert_tom',
+                'email': 'tom@sample.com',
+                'first_name': 'Tom',
+                'last_name': 'Wilson',
+                'bio': 'Aquatic plant specialist 🌊 | Aquarium designer | Water garden expert',
+                'location': 'London, UK',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_015',
+                'username': 'native_plant_advocate_lisa',
+                'email': 'lisa@sample.com',
+                'first_name': 'Lisa',
+                'last_name': 'Thompson',
+                'bio': 'Native plant advocate 🌼 | Wildlife gardening | Pollinator supporter',
+                'location': 'California, USA',
+                'website': 'https://nativeplants.org',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_016',
+                'username': 'greenhouse_master_alex',
+                'email': 'alex@sample.com',
+                'first_name': 'Alex',
+                'last_name': 'Rodriguez',
+                'bio': 'Greenhouse automation expert 🏠 | Smart farming | IoT plant monitoring',
+                'location': 'Barcelona, Spain',
+                'website': 'https://smartgreenhouse.tech',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_017',
+                'username': 'permaculture_designer_kim',
+                'email': 'kim@sample.com',
+                'first_name': 'Kim',
+                'last_name': 'Park',
+                'bio': 'Permaculture designer 🌍 | Sustainable living | Food forest creator',
+                'location': 'Seoul, South Korea',
+                'website': 'https://permaculturedesign.kr',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_018',
+                'username': 'tropical_plant_hunter_carlos',
+                'email': 'carlos@sample.com',
+                'first_name': 'Carlos',
+                'last_name': 'Silva',
+                'bio': 'Tropical plant hunter 🌺 | Rainforest explorer | Rare species collector',
+                'location': 'São Paulo, Brazil',
+                'website': 'https://tropicalplants.br',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_019',
+                'username': 'hydroponic_farmer_zara',
+                'email': 'zara@sample.com',
+                'first_name': 'Zara',
+                'last_name': 'Ahmed',
+                'bio': 'Hydroponic farming specialist 💧 | Soilless cultivation | Urban agriculture',
+                'location': 'Dubai, UAE',
+                'website': 'https://hydroponics.ae',
+                'password_hash': generate_password_hash('password123'),
+            },
+            {
+                'id': 'user_020',
+                'username': 'botanical_photographer_elena',
+                'email': 'elena@sample.com',
+                'first_name': 'Elena',
+                'last_name': 'Petrov',
+                'bio': 'Botanical photographer 📸 | Nature documentarian | Plant portrait artist',
+                'location': 'Moscow, Russia',
+                'website': 'https://botanicalphoto.ru',
+                'password_hash': generate_password_hash('password123'),
+            }
+        ]
 
-    # Insert sample users with ALL fields
-    for user in sample_users:
-        conn.execute('''
-            INSERT OR IGNORE INTO users (id, username, email, first_name, last_name, password_hash, bio, location, website, phone)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (user['id'], user['username'], user['email'], user['first_name'],
-              user['last_name'], user['password_hash'], user.get('bio', ''),
-              user.get('location', ''), user.get('website', ''), user.get('phone', '')))
-
-    # Enhanced sample posts with many more users
-    sample_posts = [
-        {
-            'id': 'post_001',
-            'user_id': 'user_001',
-            'title': 'Monstera Update',
-            'content': 'Just repotted my beautiful Monstera deliciosa! 🌿 Look at those gorgeous fenestrations. She\'s been with me for 2 years now and growing so well in the Faridabad climate!',
-            'image_url': 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=500&h=400&fit=crop',
-            'tags': '#monstera #repotting #faridabad'
-        },
-        {
-            'id': 'post_002',
-            'user_id': 'user_002',
-            'title': 'Garden Inspection',
-            'content': 'Morning garden inspection complete! ✅ My tomatoes are thriving in this humidity. The weather in Faridabad has been perfect for growing vegetables this season. 🍅',
-            'image_url': 'https://images.unsplash.com/photo-1592419044706-39796d40f98c?w=500&h=400&fit=crop',
-            'tags': '#tomatoes #vegetables #faridabad'
-        },
-        {
-            'id': 'post_003',
-            'user_id': 'user_003',
-            'title': 'Rose Garden Bloom',
-            'content': 'My rose garden is in full bloom! 🌹 These David Austin roses are absolutely stunning. The morning dew and perfect temperature made them extra beautiful today.',
-            'image_url': 'https://images.unsplash.com/photo-1518709268805-4e9042af2176?w=500&h=400&fit=crop',
-            'tags': '#roses #garden #bloom'
-        },
-        {
-            'id': 'post_004',
-            'user_id': 'user_004',
-            'title': 'Succulent Propagation',
-            'content': 'Succulent propagation success! 🌵 Started these little babies 3 months ago and now they\'re ready for their own pots. Perfect for the dry season here!',
-            'image_url': 'https://images.unsplash.com/photo-1459411621453-7b03977f4bfc?w=500&h=400&fit=crop',
-            'tags': '#succulents #propagation #plants'
-        },
-        {
-            'id': 'post_005',
-            'user_id': 'user_005',
-            'title': 'Fresh Herb Harvest',
-            'content': 'Fresh herb harvest from my kitchen garden! 🌿 Basil, mint, coriander, and curry leaves. The aroma is incredible! Perfect for tonight\'s dinner.',
-            'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
-            'tags': '#herbs #harvest #cooking #organic'
-        },
-        {
-            'id': 'post_006',
-            'user_id': 'user_006',
-            'title': 'Air Purifying Plants',
-            'content': 'My collection of air purifying plants! 🏠 Snake plants, pothos, and peace lilies working hard to clean our indoor air. Perfect for Delhi pollution!',
-            'image_url': 'https://images.unsplash.com/photo-1493663284031-b7e3aaa4cab7?w=500&h=400&fit=crop',
-            'tags': '#airpurifying #indoor #health #delhi'
-        },
-        {
-            'id': 'post_007',
-            'user_id': 'user_007',
-            'title': 'Tree Plantation Drive',
-            'content': 'Planted 50 saplings today! 🌳 Join our tree plantation drive this weekend. Every tree counts in fighting climate change. Green Delhi mission!',
-            'image_url': 'https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=500&h=400&fit=crop',
-            'tags': '#treeplantation #environment #greendelhi #climatechange'
-        },
-        {
-            'id': 'post_008',
-            'user_id': 'user_008',
-            'title': 'Orchid Collection',
-            'content': 'My prized orchid collection! 🌺 These Phalaenopsis orchids are blooming beautifully. The humidity control in my greenhouse is paying off!',
-            'image_url': 'https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=500&h=400&fit=crop',
-            'tags': '#orchids #exotic #greenhouse #bangalore'
-        },
-        {
-            'id': 'post_009',
-            'user_id': 'user_009',
-            'title': 'Organic Vegetables',
-            'content': 'Farm fresh organic vegetables! 🥕🥬 No pesticides, just pure natural goodness. From our farm to your table. Sustainable agriculture at its best!',
-            'image_url': 'https://images.unsplash.com/photo-1574323347407-f5e1ad6d020b?w=500&h=400&fit=crop',
-            'tags': '#organic #vegetables #sustainable #farmtotable'
-        },
-        {
-            'id': 'post_010',
-            'user_id': 'user_010',
-            'title': 'Bonsai Masterpiece',
-            'content': 'My 15-year-old Japanese maple bonsai 🌲 Patience and dedication create these living artworks. The zen of bonsai brings peace to the soul.',
-            'image_url': 'https://images.unsplash.com/photo-1485955900006-10f4d324d411?w=500&h=400&fit=crop',
-            'tags': '#bonsai #japanese #zen #art #patience'
-        },
-        {
-            'id': 'post_011',
-            'user_id': 'user_011',
-            'title': 'Rare Cactus Find',
-            'content': 'Found this rare Astrophytum asterias! 🌵 Also known as the star cactus. These beauties are endangered in the wild. Proud to help preserve them!',
-            'image_url': 'https://images.unsplash.com/photo-1509423350716-97f2360af2e4?w=500&h=400&fit=crop',
-            'tags': '#cactus #rare #conservation #desert #arizona'
-        },
-        {
-            'id': 'post_012',
-            'user_id': 'user_012',
-            'title': 'Medicinal Plant Garden',
-            'content': 'My medicinal plant research garden 🌿 Tulsi, neem, aloe vera, and ashwagandha. Nature\'s pharmacy right in our backyard! Ayurveda wisdom.',
-            'image_url': 'https://images.unsplash.com/photo-1616671276441-2f2c277b8bf6?w=500&h=400&fit=crop',
-            'tags': '#medicinal #ayurveda #research #natural #healing'
-        },
-        {
-            'id': 'post_013',
-            'user_id': 'user_013',
-            'title': 'Rooftop Garden Paradise',
-            'content': 'My Mumbai rooftop transformed into a green paradise! 🏢🌱 Vertical gardens, container plants, and a small pond. Urban farming at its finest!',
-            'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
-            'tags': '#rooftop #urban #mumbai #vertical #container'
-        },
-        {
-            'id': 'post_014',
-            'user_id': 'user_014',
-            'title': 'Aquatic Plant Setup',
-            'content': 'New aquatic plant setup complete! 🌊 Anubias, Java fern, and Amazon sword creating an underwater forest. Fish are loving their new home!',
-            'image_url': 'https://images.unsplash.com/photo-1544551763-46a013bb70d5?w=500&h=400&fit=crop',
-            'tags': '#aquatic #aquarium #underwater #fish #london'
-        },
-        {
-            'id': 'post_015',
-            'user_id': 'user_015',
-            'title': 'Native Wildflower Meadow',
-            'content': 'My native wildflower meadow is buzzing with life! 🌼🐝 Bees, butterflies, and birds love these California natives. Supporting local ecosystems!',
-            'image_url': 'https://images.unsplash.com/photo-1490750967868-88aa4486c946?w=500&h=400&fit=crop',
-            'tags': '#native #wildflowers #pollinators #california #ecosystem'
-        },
-        {
-            'id': 'post_016',
-            'user_id': 'user_001',
-            'title': 'Pothos Propagation',
-            'content': 'Pothos propagation station! 🌿 These golden pothos cuttings are rooting beautifully in water. Soon they\'ll be ready for new homes!',
-            'image_url': 'https://images.unsplash.com/photo-1463320726281-696a485928c7?w=500&h=400&fit=crop',
-            'tags': '#pothos #propagation #cuttings #houseplants'
-        },
-        {
-            'id': 'post_017',
-            'user_id': 'user_003',
-            'title': 'Rose Care Tips',
-            'content': 'Rose care tip: Epsom salt works wonders! 🌹 Sprinkle around the base monthly for healthier blooms. My roses have never looked better!',
-            'image_url': 'https://images.unsplash.com/photo-1518709268805-4e9042af2176?w=500&h=400&fit=crop',
-            'tags': '#roses #care #tips #epsom #gardening'
-        },
-        {
-            'id': 'post_018',
-            'user_id': 'user_007',
-            'title': 'Mango Tree Growth',
-            'content': 'My mango tree after 3 years! 🥭🌳 From a small sapling to this beautiful tree. Can\'t wait for the first harvest next year!',
-            'image_url': 'https://images.unsplash.com/photo-1605034313761-73ea4a0cfbf3?w=500&h=400&fit=crop',
-            'tags': '#mango #tree #growth #fruit #patience'
-        },
-        {
-            'id': 'post_019',
-            'user_id': 'user_016',
-            'title': 'Smart Greenhouse Setup',
-            'content': 'My automated greenhouse is running perfectly! 🏠🤖 IoT sensors monitoring temperature, humidity, and soil moisture. Technology meets nature!',
-            'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
-            'tags': '#smartgreenhouse #iot #automation #technology #barcelona'
-        },
-        {
-            'id': 'post_020',
-            'user_id': 'user_017',
-            'title': 'Food Forest Design',
-            'content': 'Designing a food forest in Seoul! 🌳🍎 Seven layers of edible plants creating a sustainable ecosystem. Permaculture principles in action!',
-            'image_url': 'https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=500&h=400&fit=crop',
-            'tags': '#permaculture #foodforest #sustainable #seoul #design'
-        },
-        {
-            'id': 'post_021',
-            'user_id': 'user_018',
-            'title': 'Rare Bromeliad Discovery',
-            'content': 'Found this incredible bromeliad in the Amazon! 🌺🌿 New species potentially! The biodiversity here is absolutely mind-blowing.',
-            'image_url': 'https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=500&h=400&fit=crop',
-            'tags': '#bromeliad #amazon #discovery #biodiversity #brazil'
-        },
-        {
-            'id': 'post_022',
-            'user_id': 'user_019',
-            'title': 'Hydroponic Lettuce Harvest',
-            'content': 'Hydroponic lettuce harvest in the desert! 🥬💧 Growing fresh greens without soil in Dubai\'s climate. Innovation in agriculture!',
-            'image_url': 'https://images.unsplash.com/photo-1574323347407-f5e1ad6d020b?w=500&h=400&fit=crop',
-            'tags': '#hydroponics #lettuce #desert #dubai #innovation'
-        },
-        {
-            'id': 'post_023',
-            'user_id': 'user_020',
-            'title': 'Macro Photography Session',
-            'content': 'Captured the intricate details of this orchid! 📸🌺 The patterns and textures in nature are absolutely stunning. Art meets botany!',
-            'image_url': 'https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=500&h=400&fit=crop',
-            'tags': '#photography #macro #orchid #art #moscow'
-        },
-        {
-            'id': 'post_024',
-            'user_id': 'user_001',
-            'title': 'Faridabad Garden Tour',
-            'content': 'Garden tour of my Faridabad setup! 🌱🏠 From indoor plants to rooftop vegetables. Making the most of urban space in Haryana!',
-            'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
-            'tags': '#faridabad #urban #garden #haryana #tour'
-        },
-        {
-            'id': 'post_025',
-            'user_id': 'user_005',
-            'title': 'Tulsi Propagation Success',
-            'content': 'Tulsi propagation going strong! 🌿🙏 These holy basil cuttings are rooting beautifully. Sacred plants for health and spirituality.',
-            'image_url': 'https://images.unsplash.com/photo-1616671276441-2f2c277b8bf6?w=500&h=400&fit=crop',
-            'tags': '#tulsi #holybasil #propagation #sacred #health'
-        }
-    ]
+        # Insert sample users with ALL fields
+        for user in sample_users:
+            conn.execute('''
+                INSERT OR IGNORE INTO users (id, username, email, first_name, last_name, password_hash, bio, location, website, phone)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (user['id'], user['username'], user['email'], user['first_name'],
+                  user['last_name'], user['password_hash'], user.get('bio', ''),
+                  user.get('location', ''), user.get('website', ''), user.get('phone', '')))
+
+        # Enhanced sample posts with many more users
+        sample_posts = [
+            {
+                'id': 'post_001',
+                'user_id': 'user_001',
+                'title': 'Monstera Update',
+                'content': 'Just repotted my beautiful Monstera deliciosa! 🌿 Look at those gorgeous fenestrations. She\'s been with me for 2 years now and growing so well in the Faridabad climate!',
+                'image_url': 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=500&h=400&fit=crop',
+                'tags': '#monstera #repotting #faridabad'
+            },
+            {
+                'id': 'post_002',
+                'user_id': 'user_002',
+                'title': 'Garden Inspection',
+                'content': 'Morning garden inspection complete! ✅ My tomatoes are thriving in this humidity. The weather in Faridabad has been perfect for growing vegetables this season. 🍅',
+                'image_url': 'https://images.unsplash.com/photo-1592419044706-39796d40f98c?w=500&h=400&fit=crop',
+                'tags': '#tomatoes #vegetables #faridabad'
+            },
+            {
+                'id': 'post_003',
+                'user_id': 'user_003',
+                'title': 'Rose Garden Bloom',
+                'content': 'My rose garden is in full bloom! 🌹 These David Austin roses are absolutely stunning. The morning dew and perfect temperature made them extra beautiful today.',
+                'image_url': 'https://images.unsplash.com/photo-1518709268805-4e9042af2176?w=500&h=400&fit=crop',
+                'tags': '#roses #garden #bloom'
+            },
+            {
+                'id': 'post_004',
+                'user_id': 'user_004',
+                'title': 'Succulent Propagation',
+                'content': 'Succulent propagation success! 🌵 Started these little babies 3 months ago and now they\'re ready for their own pots. Perfect for the dry season here!',
+                'image_url': 'https://images.unsplash.com/photo-1459411621453-7b03977f4bfc?w=500&h=400&fit=crop',
+                'tags': '#succulents #propagation #plants'
+            },
+            {
+                'id': 'post_005',
+                'user_id': 'user_005',
+                'title': 'Fresh Herb Harvest',
+                'content': 'Fresh herb harvest from my kitchen garden! 🌿 Basil, mint, coriander, and curry leaves. The aroma is incredible! Perfect for tonight\'s dinner.',
+                'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
+                'tags': '#herbs #harvest #cooking #organic'
+            },
+            {
+                'id': 'post_006',
+                'user_id': 'user_006',
+                'title': 'Air Purifying Plants',
+                'content': 'My collection of air purifying plants! 🏠 Snake plants, pothos, and peace lilies working hard to clean our indoor air. Perfect for Delhi pollution!',
+                'image_url': 'https://images.unsplash.com/photo-1493663284031-b7e3aaa4cab7?w=500&h=400&fit=crop',
+                'tags': '#airpurifying #indoor #health #delhi'
+            },
+            {
+                'id': 'post_007',
+                'user_id': 'user_007',
+                'title': 'Tree Plantation Drive',
+                'content': 'Planted 50 saplings today! 🌳 Join our tree plantation drive this weekend. Every tree counts in fighting climate change. Green Delhi mission!',
+                'image_url': 'https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=500&h=400&fit=crop',
+                'tags': '#treeplantation #environment #greendelhi #climatechange'
+            },
+            {
+                'id': 'post_008',
+                'user_id': 'user_008',
+                'title': 'Orchid Collection',
+                'content': 'My prized orchid collection! 🌺 These Phalaenopsis orchids are blooming beautifully. The humidity control in my greenhouse is paying off!',
+                'image_url': 'https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=500&h=400&fit=crop',
+                'tags': '#orchids #exotic #greenhouse #bangalore'
+            },
+            {
+                'id': 'post_009',
+                'user_id': 'user_009',
+                'title': 'Organic Vegetables',
+                'content': 'Farm fresh organic vegetables! 🥕🥬 No pesticides, just pure natural goodness. From our farm to your table. Sustainable agriculture at its best!',
+                'image_url': 'https://images.unsplash.com/photo-1574323347407-f5e1ad6d020b?w=500&h=400&fit=crop',
+                'tags': '#organic #vegetables #sustainable #farmtotable'
+            },
+            {
+                'id': 'post_010',
+                'user_id': 'user_010',
+                'title': 'Bonsai Masterpiece',
+                'content': 'My 15-year-old Japanese maple bonsai 🌲 Patience and dedication create these living artworks. The zen of bonsai brings peace to the soul.',
+                'image_url': 'https://images.unsplash.com/photo-1485955900006-10f4d324d411?w=500&h=400&fit=crop',
+                'tags': '#bonsai #japanese #zen #art #patience'
+            },
+            {
+                'id': 'post_011',
+                'user_id': 'user_011',
+                'title': 'Rare Cactus Find',
+                'content': 'Found this rare Astrophytum asterias! 🌵 Also known as the star cactus. These beauties are endangered in the wild. Proud to help preserve them!',
+                'image_url': 'https://images.unsplash.com/photo-1509423350716-97f2360af2e4?w=500&h=400&fit=crop',
+                'tags': '#cactus #rare #conservation #desert #arizona'
+            },
+            {
+                'id': 'post_012',
+                'user_id': 'user_012',
+                'title': 'Medicinal Plant Garden',
+                'content': 'My medicinal plant research garden 🌿 Tulsi, neem, aloe vera, and ashwagandha. Nature\'s pharmacy right in our backyard! Ayurveda wisdom.',
+                'image_url': 'https://images.unsplash.com/photo-1616671276441-2f2c277b8bf6?w=500&h=400&fit=crop',
+                'tags': '#medicinal #ayurveda #research #natural #healing'
+            },
+            {
+                'id': 'post_013',
+                'user_id': 'user_013',
+                'title': 'Rooftop Garden Paradise',
+                'content': 'My Mumbai rooftop transformed into a green paradise! 🏢🌱 Vertical gardens, container plants, and a small pond. Urban farming at its finest!',
+                'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
+                'tags': '#rooftop #urban #mumbai #vertical #container'
+            },
+            {
+                'id': 'post_014',
+                'user_id': 'user_014',
+                'title': 'Aquatic Plant Setup',
+                'content': 'New aquatic plant setup complete! 🌊 Anubias, Java fern, and Amazon sword creating an underwater forest. Fish are loving their new home!',
+                'image_url': 'https://images.unsplash.com/photo-1544551763-46a013bb70d5?w=500&h=400&fit=crop',
+                'tags': '#aquatic #aquarium #underwater #fish #london'
+            },
+            {
+                'id': 'post_015',
+                'user_id': 'user_015',
+                'title': 'Native Wildflower Meadow',
+                'content': 'My native wildflower meadow is buzzing with life! 🌼🐝 Bees, butterflies, and birds love these California natives. Supporting local ecosystems!',
+                'image_url': 'https://images.unsplash.com/photo-1490750967868-88aa4486c946?w=500&h=400&fit=crop',
+                'tags': '#native #wildflowers #pollinators #california #ecosystem'
+            },
+            {
+                'id': 'post_016',
+                'user_id': 'user_001',
+                'title': 'Pothos Propagation',
+                'content': 'Pothos propagation station! 🌿 These golden pothos cuttings are rooting beautifully in water. Soon they\'ll be ready for new homes!',
+                'image_url': 'https://images.unsplash.com/photo-1463320726281-696a485928c7?w=500&h=400&fit=crop',
+                'tags': '#pothos #propagation #cuttings #houseplants'
+            },
+            {
+                'id': 'post_017',
+                'user_id': 'user_003',
+                'title': 'Rose Care Tips',
+                'content': 'Rose care tip: Epsom salt works wonders! 🌹 Sprinkle around the base monthly for healthier blooms. My roses have never looked better!',
+                'image_url': 'https://images.unsplash.com/photo-1518709268805-4e9042af2176?w=500&h=400&fit=crop',
+                'tags': '#roses #care #tips #epsom #gardening'
+            },
+            {
+                'id': 'post_018',
+                'user_id': 'user_007',
+                'title': 'Mango Tree Growth',
+                'content': 'My mango tree after 3 years! 🥭🌳 From a small sapling to this beautiful tree. Can\'t wait for the first harvest next year!',
+                'image_url': 'https://images.unsplash.com/photo-1605034313761-73ea4a0cfbf3?w=500&h=400&fit=crop',
+                'tags': '#mango #tree #growth #fruit #patience'
+            },
+            {
+                'id': 'post_019',
+                'user_id': 'user_016',
+                'title': 'Smart Greenhouse Setup',
+                'content': 'My automated greenhouse is running perfectly! 🏠🤖 IoT sensors monitoring temperature, humidity, and soil moisture. Technology meets nature!',
+                'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
+                'tags': '#smartgreenhouse #iot #automation #technology #barcelona'
+            },
+            {
+                'id': 'post_020',
+                'user_id': 'user_017',
+                'title': 'Food Forest Design',
+                'content': 'Designing a food forest in Seoul! 🌳🍎 Seven layers of edible plants creating a sustainable ecosystem. Permaculture principles in action!',
+                'image_url': 'https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=500&h=400&fit=crop',
+                'tags': '#permaculture #foodforest #sustainable #seoul #design'
+            },
+            {
+                'id': 'post_021',
+                'user_id': 'user_018',
+                'title': 'Rare Bromeliad Discovery',
+                'content': 'Found this incredible bromeliad in the Amazon! 🌺🌿 New species potentially! The biodiversity here is absolutely mind-blowing.',
+                'image_url': 'https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=500&h=400&fit=crop',
+                'tags': '#bromeliad #amazon #discovery #biodiversity #brazil'
+            },
+            {
+                'id': 'post_022',
+                'user_id': 'user_019',
+                'title': 'Hydroponic Lettuce Harvest',
+                'content': 'Hydroponic lettuce harvest in the desert! 🥬💧 Growing fresh greens without soil in Dubai\'s climate. Innovation in agriculture!',
+                'image_url': 'https://images.unsplash.com/photo-1574323347407-f5e1ad6d020b?w=500&h=400&fit=crop',
+                'tags': '#hydroponics #lettuce #desert #dubai #innovation'
+            },
+            {
+                'id': 'post_023',
+                'user_id': 'user_020',
+                'title': 'Macro Photography Session',
+                'content': 'Captured the intricate details of this orchid! 📸🌺 The patterns and textures in nature are absolutely stunning. Art meets botany!',
+                'image_url': 'https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=500&h=400&fit=crop',
+                'tags': '#photography #macro #orchid #art #moscow'
+            },
+            {
+                'id': 'post_024',
+                'user_id': 'user_001',
+                'title': 'Faridabad Garden Tour',
+                'content': 'Garden tour of my Faridabad setup! 🌱🏠 From indoor plants to rooftop vegetables. Making the most of urban space in Haryana!',
+                'image_url': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=500&h=400&fit=crop',
+                'tags': '#faridabad #urban #garden #haryana #tour'
+            },
+            {
+                'id': 'post_025',
+                'user_id': 'user_005',
+                'title': 'Tulsi Propagation Success',
+                'content': 'Tulsi propagation going strong! 🌿🙏 These holy basil cuttings are rooting beautifully. Sacred plants for health and spirituality.',
+                'image_url': 'https://images.unsplash.com/photo-1616671276441-2f2c277b8bf6?w=500&h=400&fit=crop',
+                'tags': '#tulsi #holybasil #propagation #sacred #health'
+            }
+        ]
 
-    # Insert sample posts
-    for post in sample_posts:
-        conn.execute('''
-            INSERT OR IGNORE INTO posts (id, user_id, title, content, tags, image_url)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (post['id'], post['user_id'], post['title'], post['content'],
-              post['tags'], post['image_url']))
+        # Insert sample posts
+        for post in sample_posts:
+            conn.execute('''
+                INSERT OR IGNORE INTO posts (id, user_id, title, content, tags, image_url)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (post['id'], post['user_id'], post['title'], post['content'],
+                  post['tags'], post['image_url']))
+            timeline.fan_out_post(conn, post['id'])
 
-    conn.commit()
-    conn.close()
+        set_meta(conn, SAMPLE_DATA_MARKER, datetime.now().isoformat())
+        conn.commit()
+    return True
 
-def init_quiz_db():
-    conn = sqlite3.connect('green_world.db')
-    cursor = conn.cursor()
-    
-    # Quiz attempts table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS quiz_attempts (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            level TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            total_questions INTEGER NOT NULL,
-            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # User achievements table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_achievements (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            flower_title TEXT NOT NULL,
-            flower_image_url TEXT NOT NULL,
-            level TEXT NOT NULL,
-            earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+def bootstrap(seed=True):
+    """One-shot startup work: schema migrations, demo data if not seeded yet, then unfinished analyses"""
+    init_db()
+    if seed and create_sample_data():
+        print("🌱 Sample users and posts created")
+    refresh_search_rollups()
+    resumed, failed = resume_plant_analyses()
+    if resumed or failed:
+        print(f"🔬 Plant analyses left queued by the last run: {resumed} re-queued, {failed} failed")
+    start_background_tasks()
+
+_background_lock = threading.Lock()
+_background_started = False
+
+def start_background_tasks():
+    """Start the WAL checkpoint, like flush and search rollup loops; only the first call per process does.
+
+    Runs from bootstrap() and before the first request, so the loops run
+    under `python app.py`, `flask run` and WSGI servers alike.
+    """
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return False
+        _background_started = True
+    start_checkpoint_task(socketio, app.config['DATABASE_CHECKPOINT_INTERVAL'])
+    engagement.start_flush_task(socketio, app.config['LIKE_FLUSH_INTERVAL'])
+    search_rollups.start_rollup_task(refresh_search_rollups, socketio, app.config['SEARCH_ROLLUP_INTERVAL'])
+    return True
+
+@app.before_request
+def ensure_background_tasks():
+    if not _background_started:
+        start_background_tasks()
+
+@app.cli.command('seed')
+def seed_command():
+    """Apply migrations and create the sample data (flask --app app seed)"""
+    bootstrap()
+
+def import_legacy_uploads():
+    """Move analyzer photos saved before the blob store (uploads/<uuid>_<name>) into it.
+
+    Their plant_analyses rows are pointed at the blob, so history pages get
+    srcset thumbnails for them too. Files that are missing or not images are
+    left alone. Returns the digests of the imported photos.
+    """
+    digests = []
+    with db_connection() as conn:
+        legacy_urls = [url for url, in conn.execute('''
+            SELECT DISTINCT image_url FROM plant_analyses WHERE image_url LIKE 'uploads/%'
+        ''')]
+        for image_url in legacy_urls:
+            path = os.path.join(app.config['UPLOAD_FOLDER'], os.path.basename(image_url))
+            try:
+                with open(path, 'rb') as f:
+                    if image_uploads.image_kind(f.read(12)) is None:
+                        continue
+            except OSError:
+                continue
+            digest = blobs.put_file(path)
+            conn.execute('UPDATE plant_analyses SET image_url = ? WHERE image_url = ?',
+                         (f'/blobs/{digest}', image_url))
+            conn.commit()
+            digests.append(digest)
+    return digests
+
+@app.cli.command('thumbnails')
+def thumbnails_command():
+    """Import older analyzer uploads into the blob store, then thumbnail every blob (flask --app app thumbnails)"""
+    init_db()
+    imported = import_legacy_uploads()
+    started = time.perf_counter()
+    concurrent.futures.wait(thumbnails.backfill())
+    stats = thumbnails.stats()
+    print(f"🖼️ {len(imported)} older uploads imported; {stats['generated']} images → {stats['thumbnails']} thumbnails "
+          f"in {time.perf_counter() - started:.1f} s ({stats['skipped']} too small, {stats['failed']} failed)")
 
 # Quiz questions database
 QUIZ_QUESTIONS = {
@@ -914,40 +839,44 @@ def get_flower_image(flower_name):
 
 def save_quiz_attempt(user_id, level, score, total_questions):
     attempt_id = str(uuid.uuid4())
-    conn = sqlite3.connect('green_world.db')
+    conn = get_db()
     conn.execute('''
         INSERT INTO quiz_attempts (id, user_id, level, score, total_questions)
         VALUES (?, ?, ?, ?, ?)
     ''', (attempt_id, user_id, level, score, total_questions))
     conn.commit()
-    conn.close()
     return attempt_id
 
 def save_achievement(user_id, flower_title, flower_image_url, level):
     achievement_id = str(uuid.uuid4())
-    conn = sqlite3.connect('green_world.db')
+    conn = get_db()
     conn.execute('''
         INSERT INTO user_achievements (id, user_id, flower_title, flower_image_url, level)
         VALUES (?, ?, ?, ?, ?)
     ''', (achievement_id, user_id, flower_title, flower_image_url, level))
     conn.commit()
-    conn.close()
     return achievement_id
 
-def get_user_achievements(user_id):
-    conn = sqlite3.connect('green_world.db')
-    conn.row_factory = sqlite3.Row
-    achievements = conn.execute('''
+def iter_user_achievements(user_id):
+    """Yield a user's achievements newest first without loading them all"""
+    cursor = get_db().execute('''
         SELECT * FROM user_achievements
         WHERE user_id = ?
         ORDER BY earned_at DESC
-    ''', (user_id,)).fetchall()
-    conn.close()
-    return achievements
+    ''', (user_id,))
+    for row in cursor:
+        yield row
 
 # Enhanced Plant Analysis Functions
-def generate_plant_analysis():
-    """Generate comprehensive plant health analysis with enhanced dehydration detection"""
+def generate_plant_analysis(image_path=None, seed=None, measured=None):
+    """Generate comprehensive plant health analysis with enhanced dehydration detection.
+
+    With an image (and NumPy/Pillow installed) the dehydration, stress and
+    sunlight scores are measured from its pixels; otherwise they are
+    simulated. measured passes in plant_health.analyze_image() output that
+    was computed elsewhere. seed makes the remaining choices repeatable.
+    """
+    rng = random.Random(seed)
 
     # Simulated plant database
     plants = [
@@ -961,10 +890,16 @@ def generate_plant_analysis():
         {'name': 'Philodendron', 'type': 'Tropical'}
     ]
 
-    plant = random.choice(plants)
+    plant = rng.choice(plants)
+
+    if measured is None and image_path and plant_health.available():
+        try:
+            measured = plant_health.analyze_image(image_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Image analysis failed, using simulated scores: {e}")
 
     # Enhanced dehydration analysis
-    dehydration_score = random.uniform(0.1, 0.9)
+    dehydration_score = measured['dehydration_score'] if measured else rng.uniform(0.1, 0.9)
     if dehydration_score < 0.3:
         dehydration_level = 'Well Hydrated'
     elif dehydration_score < 0.6:
@@ -973,7 +908,7 @@ def generate_plant_analysis():
         dehydration_level = 'Severely Dehydrated'
 
     # Stress analysis
-    stress_score = random.uniform(0.1, 0.8)
+    stress_score = measured['stress_score'] if measured else rng.uniform(0.1, 0.8)
     if stress_score < 0.3:
         stress_level = 'No Stress'
     elif stress_score < 0.6:
@@ -982,7 +917,7 @@ def generate_plant_analysis():
         stress_level = 'High Stress'
 
     # Sunlight analysis with warnings
-    sunlight_score = random.uniform(0.2, 0.9)
+    sunlight_score = measured['sunlight_score'] if measured else rng.uniform(0.2, 0.9)
     if sunlight_score < 0.4:
         sunlight_exposure = 'Insufficient'
         sunlight_warning = '⚠️ WARNING: Plant needs more sunlight. Consider relocating to a brighter spot.'
@@ -1065,9 +1000,9 @@ def generate_plant_analysis():
     pest_detected = 'None'
 
     if stress_score > 0.7:
-        disease_detected = random.choice(['Fungal infection', 'Bacterial spot', 'Root rot'])
+        disease_detected = rng.choice(['Fungal infection', 'Bacterial spot', 'Root rot'])
     if stress_score > 0.6:
-        pest_detected = random.choice(['Spider mites', 'Aphids', 'Scale insects'])
+        pest_detected = rng.choice(['Spider mites', 'Aphids', 'Scale insects'])
 
     return {
         'plant_name': plant['name'],
@@ -1080,7 +1015,7 @@ def generate_plant_analysis():
         'sunlight_score': sunlight_score,
         'sunlight_warning': sunlight_warning,
         'overall_health_score': overall_health,
-        'confidence_score': random.randint(85, 98),
+        'confidence_score': measured['confidence_score'] if measured else rng.randint(85, 98),
         'symptoms': symptoms,
         'recommendations': recommendations,
         'cure_suggestions': cure_suggestions,
@@ -1090,62 +1025,62 @@ def generate_plant_analysis():
         'follow_up_date': follow_up_date,
         'disease_detected': disease_detected,
         'pest_detected': pest_detected,
-        'watering_schedule': f"Water every {random.randint(3, 14)} days when top inch is dry",
-        'fertilizer_recommendation': random.choice([
+        'watering_schedule': f"Water every {rng.randint(3, 14)} days when top inch is dry",
+        'fertilizer_recommendation': rng.choice([
             'Balanced liquid fertilizer monthly',
             'Slow-release granules quarterly',
             'Organic compost bi-monthly'
         ])
     }
 
+# plant_analyses columns filled from a generate_plant_analysis() result, with the default
+# used when a key is missing; list values are stored as JSON
+PLANT_ANALYSIS_FIELDS = (
+    ('plant_name', 'Unknown Plant'),
+    ('plant_type', 'Unknown Type'),
+    ('dehydration_level', 'Normal'),
+    ('dehydration_score', 0.5),
+    ('stress_level', 'Low'),
+    ('stress_score', 0.3),
+    ('sunlight_exposure', 'Adequate'),
+    ('sunlight_score', 0.7),
+    ('sunlight_warning', 'None'),
+    ('overall_health_score', 0.7),
+    ('confidence_score', 85),
+    ('symptoms', ['No symptoms detected']),
+    ('recommendations', ['Continue regular care']),
+    ('cure_suggestions', ['Monitor plant health']),
+    ('prevention_tips', []),
+    ('watering_schedule', 'Water when soil feels dry'),
+    ('fertilizer_recommendation', 'Monthly balanced fertilizer'),
+    ('urgency_level', 'Low'),
+    ('recovery_time', '1-2 weeks'),
+    ('follow_up_date', ''),
+    ('disease_detected', 'None'),
+    ('pest_detected', 'None'),
+)
+
+def plant_analysis_values(analysis_data):
+    """Column values for PLANT_ANALYSIS_FIELDS, in order"""
+    values = []
+    for field, default in PLANT_ANALYSIS_FIELDS:
+        value = analysis_data.get(field, default)
+        values.append(json.dumps(value) if isinstance(value, list) else value)
+    return values
+
+PLANT_ANALYSIS_INSERT = f'''
+    INSERT INTO plant_analyses (id, user_id, image_url, {', '.join(field for field, _ in PLANT_ANALYSIS_FIELDS)})
+    VALUES ({', '.join('?' * (len(PLANT_ANALYSIS_FIELDS) + 3))})
+'''
+
 def save_plant_analysis(user_id, image_url, analysis_data):
     """Save plant analysis to database with error handling"""
     try:
         analysis_id = str(uuid.uuid4())
-        conn = sqlite3.connect('green_world.db')
-
-        # Safely get values with defaults
-        plant_name = analysis_data.get('plant_name', 'Unknown Plant')
-        plant_type = analysis_data.get('plant_type', 'Unknown Type')
-        dehydration_level = analysis_data.get('dehydration_level', 'Normal')
-        dehydration_score = analysis_data.get('dehydration_score', 0.5)
-        stress_level = analysis_data.get('stress_level', 'Low')
-        stress_score = analysis_data.get('stress_score', 0.3)
-        sunlight_exposure = analysis_data.get('sunlight_exposure', 'Adequate')
-        sunlight_score = analysis_data.get('sunlight_score', 0.7)
-        sunlight_warning = analysis_data.get('sunlight_warning', 'None')
-        overall_health_score = analysis_data.get('overall_health_score', 0.7)
-        confidence_score = analysis_data.get('confidence_score', 85)
-        symptoms = analysis_data.get('symptoms', ['No symptoms detected'])
-        recommendations = analysis_data.get('recommendations', ['Continue regular care'])
-        cure_suggestions = analysis_data.get('cure_suggestions', ['Monitor plant health'])
-        watering_schedule = analysis_data.get('watering_schedule', 'Water when soil feels dry')
-        fertilizer_recommendation = analysis_data.get('fertilizer_recommendation', 'Monthly balanced fertilizer')
-        urgency_level = analysis_data.get('urgency_level', 'Low')
-
-        conn.execute('''
-            INSERT INTO plant_analyses
-            (id, user_id, image_url, plant_name, plant_type, dehydration_level, dehydration_score,
-             stress_level, stress_score, sunlight_exposure, sunlight_score, sunlight_warning,
-             overall_health_score, confidence_score, symptoms, recommendations,
-             cure_suggestions, watering_schedule, fertilizer_recommendation, urgency_level)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            analysis_id, user_id, image_url,
-            plant_name, plant_type,
-            dehydration_level, dehydration_score,
-            stress_level, stress_score,
-            sunlight_exposure, sunlight_score,
-            sunlight_warning,
-            overall_health_score, confidence_score,
-            json.dumps(symptoms), json.dumps(recommendations),
-            json.dumps(cure_suggestions),
-            watering_schedule, fertilizer_recommendation,
-            urgency_level
-        ))
+        conn = get_db()
+        conn.execute(PLANT_ANALYSIS_INSERT, [analysis_id, user_id, image_url] + plant_analysis_values(analysis_data))
 
         conn.commit()
-        conn.close()
         print(f"✅ Plant analysis saved successfully: {analysis_id}")
         return analysis_id
 
@@ -1153,17 +1088,176 @@ def save_plant_analysis(user_id, image_url, analysis_data):
         print(f"🚨 Error saving plant analysis: {e}")
         return None
 
-def get_plant_history(user_id):
-    """Get plant analysis history for user"""
-    conn = sqlite3.connect('green_world.db')
-    conn.row_factory = sqlite3.Row
-    analyses = conn.execute('''
+@retry_on_busy
+def save_plant_analyses(user_id, analyses):
+    """Insert (image_url, analysis_data) pairs in one transaction; returns the new ids in order"""
+    ids = [str(uuid.uuid4()) for _ in analyses]
+    conn = get_db()
+    conn.executemany(PLANT_ANALYSIS_INSERT, [
+        [analysis_id, user_id, image_url] + plant_analysis_values(analysis_data)
+        for analysis_id, (image_url, analysis_data) in zip(ids, analyses)
+    ])
+    conn.commit()
+    return ids
+
+def complete_plant_analysis(analysis_id, analysis_data):
+    """Fill in a queued plant_analyses row with its results and mark it completed"""
+    assignments = ', '.join(f'{field} = ?' for field, _ in PLANT_ANALYSIS_FIELDS)
+    conn = get_db()
+    conn.execute(f'''
+        UPDATE plant_analyses SET {assignments}, analysis_status = 'completed'
+        WHERE id = ?
+    ''', plant_analysis_values(analysis_data) + [analysis_id])
+    conn.commit()
+
+def enqueue_plant_analysis(user_id, image_url, digest=None):
+    """Insert a 'queued' plant_analyses row and schedule its analysis; returns the row id.
+
+    digest names the photo in the blob store, if there is one. A photo that
+    was scored before is completed straight from analysis_cache, with no job.
+    Raises QueueFull (with the row removed again) when the job queue is at capacity.
+    """
+    conn = get_db()
+    measured = analysis_cache.get(conn, digest) if digest else None
+    if measured is not None:
+        analysis = generate_plant_analysis(seed=digest, measured=measured)
+        analysis_id = save_plant_analyses(user_id, [(image_url, analysis)])[0]
+        notify_plant_analysis(analysis_id, user_id, analysis)
+        return analysis_id
+
+    analysis_id = str(uuid.uuid4())
+    conn.execute('''
+        INSERT INTO plant_analyses (id, user_id, image_url, dehydration_level, analysis_status)
+        VALUES (?, ?, ?, 'Pending', 'queued')
+    ''', (analysis_id, user_id, image_url))
+    conn.commit()
+
+    try:
+        schedule_plant_analysis(analysis_id, user_id, digest)
+    except QueueFull:
+        conn.execute('DELETE FROM plant_analyses WHERE id = ?', (analysis_id,))
+        conn.commit()
+        raise
+    return analysis_id
+
+def schedule_plant_analysis(analysis_id, user_id, digest):
+    """Submit the job that completes a 'queued' plant_analyses row; raises QueueFull"""
+    # Only the pixel work goes to the process pool; without NumPy/Pillow there is none
+    image_path = blobs.path(digest) if digest else None
+    measure = plant_health.analyze_image if image_path and plant_health.available() else None
+
+    def finish(measured, error):
+        if error is not None:
+            print(f"⚠️ Image analysis failed, using simulated scores: {error}")
+        with app.app_context():
+            if measured is not None:
+                analysis_cache.put(get_db(), digest, measured)
+            finish_plant_analysis(analysis_id, user_id, measured, seed=digest)
+
+    analysis_queue.submit(analysis_id, measure, (image_path,), finish)
+
+def resume_plant_analyses():
+    """Re-queue analyses a previous process left 'queued'; returns (re-queued, failed).
+
+    Their jobs were lost with that process's pool, so without this their rows
+    never complete. Rows that no longer fit in the queue are marked 'failed'.
+    """
+    with db_connection() as conn:
+        rows = conn.execute('''
+            SELECT id, user_id, image_url FROM plant_analyses WHERE analysis_status = 'queued'
+        ''').fetchall()
+        resumed, failed = 0, []
+        for analysis_id, user_id, image_url in rows:
+            # Uploaded photos are linked as url_for('blob', digest=...)
+            _, found, digest = (image_url or '').rpartition('/blobs/')
+            if not (found and DIGEST_PATTERN.match(digest) and blobs.exists(digest)):
+                digest = None
+            try:
+                schedule_plant_analysis(analysis_id, user_id, digest)
+                resumed += 1
+            except QueueFull:
+                failed.append((analysis_id,))
+        if failed:
+            conn.executemany("UPDATE plant_analyses SET analysis_status = 'failed' WHERE id = ?", failed)
+            conn.commit()
+    return resumed, len(failed)
+
+def finish_plant_analysis(analysis_id, user_id, measured, seed=None):
+    """Job completion: build the report, fill in the queued row, then notify the user"""
+    try:
+        analysis = generate_plant_analysis(seed=seed, measured=measured)
+        complete_plant_analysis(analysis_id, analysis)
+    except Exception:
+        conn = get_db()
+        conn.execute("UPDATE plant_analyses SET analysis_status = 'failed' WHERE id = ?", (analysis_id,))
+        conn.commit()
+        events.publish('analysis_failed', {'analysis_id': analysis_id}, user_room(user_id))
+        raise
+    notify_plant_analysis(analysis_id, user_id, analysis)
+
+def notify_plant_analysis(analysis_id, user_id, analysis):
+    """Urgent-care notification and the 'analysis_complete' push for a finished analysis"""
+    # Create notification for urgent cases
+    if analysis['urgency_level'] == 'High':
+        create_notification(
+            user_id,
+            'plant_alert',
+            '🚨 Plant Needs Attention!',
+            f'Your {analysis["plant_name"]} requires immediate care.',
+            {'analysis_id': analysis_id, 'urgency': 'high'}
+        )
+
+    events.publish('analysis_complete', {
+        'analysis_id': analysis_id,
+        'plant_name': analysis['plant_name'],
+        'urgency_level': analysis['urgency_level'],
+        'overall_health_score': analysis['overall_health_score'],
+    }, user_room(user_id))
+
+def get_user_analysis(analysis_id, user_id):
+    return get_db().execute('''
+        SELECT * FROM plant_analyses WHERE id = ? AND user_id = ?
+    ''', (analysis_id, user_id)).fetchone()
+
+ANALYSIS_LIST_FIELDS = ('symptoms', 'recommendations', 'prevention_tips', 'cure_suggestions')
+
+def load_analysis_lists(analysis):
+    """Decode the JSON list columns of a plant_analyses row dict in place"""
+    for field in ANALYSIS_LIST_FIELDS:
+        value = analysis.get(field)
+        if not value:
+            analysis[field] = []
+        elif isinstance(value, str):
+            try:
+                analysis[field] = json.loads(value)
+            except ValueError:
+                analysis[field] = [value]
+    return analysis
+
+def iter_plant_history(user_id):
+    """Yield plant analysis history for user, one decoded row at a time"""
+    cursor = get_db().execute('''
         SELECT * FROM plant_analyses
-        WHERE user_id = ?
+        WHERE user_id = ? AND analysis_status = 'completed'
         ORDER BY created_at DESC
-    ''', (user_id,)).fetchall()
-    conn.close()
-    return analyses
+    ''', (user_id,))
+    for row in cursor:
+        analysis = load_analysis_lists(dict(row))
+        image_url = analysis.get('image_url') or ''
+        analysis['image_hash'] = image_url[len('/blobs/'):] if image_url.startswith('/blobs/') else ''
+        yield analysis
+
+def get_plant_history_stats(user_id):
+    """Analysis totals per urgency level for the history page header"""
+    row = get_db().execute('''
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(urgency_level = 'Low'), 0) AS low,
+               COALESCE(SUM(urgency_level = 'Medium'), 0) AS medium,
+               COALESCE(SUM(urgency_level = 'High'), 0) AS high
+        FROM plant_analyses
+        WHERE user_id = ? AND analysis_status = 'completed'
+    ''', (user_id,)).fetchone()
+    return dict(row)
 
 def get_haryana_weather():
     """Get REAL-TIME weather data for Haryana, India using OpenWeatherMap API"""
@@ -1263,391 +1357,226 @@ def get_haryana_weather():
             'real_data': False
         }
 
-def search_plant_info(plant_name):
-    """Search for plant information using API simulation"""
-    try:
-        # Simulate plant database with comprehensive information
-        plant_database = {
-            'rose': {
-                'name': 'Rose',
-                'scientific_name': 'Rosa',
-                'family': 'Rosaceae',
-                'care_level': 'Moderate',
-                'watering': 'Water deeply once or twice a week',
-                'sunlight': 'Full sun (6+ hours daily)',
-                'soil': 'Well-draining, fertile soil',
-                'temperature': '15-25°C (59-77°F)',
-                'humidity': '40-60%',
-                'fertilizer': 'Monthly during growing season',
-                'common_problems': ['Black spot', 'Aphids', 'Powdery mildew'],
-                'benefits': ['Beautiful flowers', 'Fragrance', 'Cut flowers'],
-                'image': 'https://images.unsplash.com/photo-1518709268805-4e9042af2176?w=800&h=600&fit=crop&auto=format&q=80'
-            },
-            'tulsi': {
-                'name': 'Tulsi (Holy Basil)',
-                'scientific_name': 'Ocimum tenuiflorum',
-                'family': 'Lamiaceae',
-                'care_level': 'Easy',
-                'watering': 'Keep soil consistently moist',
-                'sunlight': 'Bright indirect light to full sun',
-                'soil': 'Well-draining potting mix',
-                'temperature': '20-30°C (68-86°F)',
-                'humidity': '50-70%',
-                'fertilizer': 'Light feeding monthly',
-                'common_problems': ['Fungal diseases', 'Aphids'],
-                'benefits': ['Medicinal properties', 'Air purification', 'Religious significance'],
-                'image': 'https://images.unsplash.com/photo-1616671276441-2f2c277b8bf6?w=800&h=600&fit=crop&auto=format&q=80'
-            },
-            'neem': {
-                'name': 'Neem',
-                'scientific_name': 'Azadirachta indica',
-                'family': 'Meliaceae',
-                'care_level': 'Easy',
-                'watering': 'Water when top soil is dry',
-                'sunlight': 'Full sun to partial shade',
-                'soil': 'Well-draining, sandy soil',
-                'temperature': '20-35°C (68-95°F)',
-                'humidity': '40-70%',
-                'fertilizer': 'Minimal fertilization needed',
-                'common_problems': ['Scale insects', 'Leaf spot'],
-                'benefits': ['Natural pesticide', 'Medicinal uses', 'Shade tree'],
-                'image': 'https://images.unsplash.com/photo-1574482620881-b5d8b3c9b3c8?w=400&h=300&fit=crop'
-            },
-            'monstera': {
-                'name': 'Monstera Deliciosa',
-                'scientific_name': 'Monstera deliciosa',
-                'family': 'Araceae',
-                'care_level': 'Easy to Moderate',
-                'watering': 'Water when top inch of soil is dry',
-                'sunlight': 'Bright, indirect light',
-                'soil': 'Well-draining potting mix',
-                'temperature': '18-27°C (65-80°F)',
-                'humidity': '60-80%',
-                'fertilizer': 'Monthly during growing season',
-                'common_problems': ['Root rot', 'Spider mites', 'Yellow leaves'],
-                'benefits': ['Air purification', 'Decorative foliage', 'Easy propagation'],
-                'image': 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop&auto=format&q=80'
-            },
-            'snake plant': {
-                'name': 'Snake Plant',
-                'scientific_name': 'Sansevieria trifasciata',
-                'family': 'Asparagaceae',
-                'care_level': 'Very Easy',
-                'watering': 'Water every 2-3 weeks',
-                'sunlight': 'Low to bright indirect light',
-                'soil': 'Well-draining cactus mix',
-                'temperature': '15-27°C (60-80°F)',
-                'humidity': '30-50%',
-                'fertilizer': 'Rarely needed',
-                'common_problems': ['Root rot from overwatering'],
-                'benefits': ['Air purification', 'Low maintenance', 'Drought tolerant'],
-                'image': 'https://images.unsplash.com/photo-1493663284031-b7e3aaa4cab7?w=800&h=600&fit=crop&auto=format&q=80'
-            },
-            'marigold': {
-                'name': 'Marigold',
-                'scientific_name': 'Tagetes',
-                'family': 'Asteraceae',
-                'care_level': 'Easy',
-                'watering': 'Water regularly, avoid overwatering',
-                'sunlight': 'Full sun',
-                'soil': 'Well-draining, fertile soil',
-                'temperature': '18-24°C (65-75°F)',
-                'humidity': '40-60%',
-                'fertilizer': 'Monthly balanced fertilizer',
-                'common_problems': ['Aphids', 'Spider mites', 'Powdery mildew'],
-                'benefits': ['Pest deterrent', 'Colorful flowers', 'Easy to grow'],
-                'image': 'https://images.unsplash.com/photo-1574684891174-df6b02ab38d7?w=800&h=600&fit=crop&auto=format&q=80'
-            }
-        }
+# Care guide for plants that are not in the catalog
+GENERIC_PLANT_INFO = {
+    'scientific_name': 'Unknown',
+    'family': 'Unknown',
+    'care_level': 'Moderate',
+    'watering': 'Water when soil feels dry',
+    'sunlight': 'Bright, indirect light',
+    'soil': 'Well-draining potting mix',
+    'temperature': '18-25°C (65-77°F)',
+    'humidity': '40-60%',
+    'fertilizer': 'Monthly during growing season',
+    'common_problems': ['Overwatering', 'Pests', 'Poor drainage'],
+    'benefits': ['Air purification', 'Decorative'],
+    'image': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=800&h=600&fit=crop&auto=format&q=80'
+}
 
-        # Search for plant (case insensitive)
-        plant_key = plant_name.lower().strip()
-        for key, data in plant_database.items():
-            if key in plant_key or plant_key in key:
-                return data
+def search_plant_info(plant_name):
+    """Care guide for a plant name from the plant catalog, or a generic one for unknown plants"""
+    plant = plant_catalog.lookup(plant_name)
+    if plant is None:
+        return dict(GENERIC_PLANT_INFO, name=plant_name.title(),
+                    common_problems=list(GENERIC_PLANT_INFO['common_problems']),
+                    benefits=list(GENERIC_PLANT_INFO['benefits']))
 
-        # If not found, return generic plant info
-        return {
-            'name': plant_name.title(),
-            'scientific_name': 'Unknown',
-            'family': 'Unknown',
-            'care_level': 'Moderate',
-            'watering': 'Water when soil feels dry',
-            'sunlight': 'Bright, indirect light',
-            'soil': 'Well-draining potting mix',
-            'temperature': '18-25°C (65-77°F)',
-            'humidity': '40-60%',
-            'fertilizer': 'Monthly during growing season',
-            'common_problems': ['Overwatering', 'Pests', 'Poor drainage'],
-            'benefits': ['Air purification', 'Decorative'],
-            'image': 'https://images.unsplash.com/photo-1416879595882-3373a0480b5b?w=800&h=600&fit=crop&auto=format&q=80'
-        }
-    except:
-        return None
+    return {
+        'name': plant['common_name'],
+        'scientific_name': plant['scientific_name'],
+        'family': plant['family'],
+        'care_level': plant['care_level'],
+        'watering': plant['watering'],
+        'sunlight': plant['sunlight_guide'],
+        'soil': plant['soil'],
+        'temperature': plant['temperature'],
+        'humidity': plant['humidity'],
+        'fertilizer': plant['fertilizer'],
+        'common_problems': list(plant['common_problems']),
+        'benefits': list(plant['benefits']),
+        'image': plant['image']
+    }
 
 def save_plant_search(user_id, search_query, plant_data):
     """Save plant search to database"""
     search_id = str(uuid.uuid4())
-    conn = sqlite3.connect('green_world.db')
+    conn = get_db()
     conn.execute('''
         INSERT INTO plant_searches (id, user_id, search_query, plant_data)
         VALUES (?, ?, ?, ?)
     ''', (search_id, user_id, search_query, json.dumps(plant_data)))
     conn.commit()
-    conn.close()
     return search_id
 
-def search_plants_api(query):
-    """Enhanced plant search with comprehensive database"""
-    try:
-        # Comprehensive plant database with detailed information
-        plant_database = [
-            {
-                'id': 1,
-                'common_name': 'Monstera Deliciosa',
-                'scientific_name': 'Monstera deliciosa',
-                'family': 'Araceae',
-                'origin': 'Central America',
-                'type': 'Tropical Houseplant',
-                'care_level': 'Easy',
-                'watering': 'Water when top inch of soil is dry',
-                'sunlight': ['Bright Indirect Light'],
-                'temperature': '18-27°C (65-80°F)',
-                'humidity': '60-80%',
-                'soil': 'Well-draining potting mix',
-                'fertilizer': 'Monthly during growing season',
-                'growth_rate': 'Fast',
-                'mature_size': '1-3 meters indoors',
-                'toxicity': 'Toxic to pets and humans',
-                'benefits': ['Air purification', 'Decorative foliage', 'Easy propagation'],
-                'common_problems': ['Root rot', 'Spider mites', 'Yellow leaves from overwatering'],
-                'image': 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=400&h=300&fit=crop',
-                'description': 'Popular houseplant known for its large, split leaves and dramatic fenestrations. Native to Central American rainforests.'
-            },
-            {
-                'id': 2,
-                'common_name': 'Snake Plant',
-                'scientific_name': 'Sansevieria trifasciata',
-                'family': 'Asparagaceae',
-                'origin': 'West Africa',
-                'type': 'Succulent',
-                'care_level': 'Very Easy',
-                'watering': 'Water every 2-3 weeks',
-                'sunlight': ['Low Light', 'Bright Indirect Light'],
-                'temperature': '15-27°C (60-80°F)',
-                'humidity': '30-50%',
-                'soil': 'Well-draining cactus mix',
-                'fertilizer': 'Rarely needed',
-                'growth_rate': 'Slow',
-                'mature_size': '30-120 cm',
-                'toxicity': 'Mildly toxic to pets',
-                'benefits': ['Air purification', 'Low maintenance', 'Drought tolerant', 'Releases oxygen at night'],
-                'common_problems': ['Root rot from overwatering', 'Brown tips from fluoride'],
-                'image': 'https://images.unsplash.com/photo-1493663284031-b7e3aaa4cab7?w=400&h=300&fit=crop',
-                'description': 'Extremely hardy plant perfect for beginners. Known for its upright, sword-like leaves with yellow edges.'
-            },
-            {
-                'id': 3,
-                'common_name': 'Fiddle Leaf Fig',
-                'scientific_name': 'Ficus lyrata',
-                'family': 'Moraceae',
-                'origin': 'Western Africa',
-                'type': 'Indoor Tree',
-                'care_level': 'Moderate to Difficult',
-                'watering': 'Water when top 2 inches of soil are dry',
-                'sunlight': ['Bright Indirect Light'],
-                'temperature': '18-24°C (65-75°F)',
-                'humidity': '50-60%',
-                'soil': 'Well-draining potting mix',
-                'fertilizer': 'Monthly during growing season',
-                'growth_rate': 'Moderate',
-                'mature_size': '1.5-3 meters indoors',
-                'toxicity': 'Toxic to pets and humans',
-                'benefits': ['Statement plant', 'Air purification', 'Architectural appeal'],
-                'common_problems': ['Brown spots', 'Leaf drop', 'Root rot', 'Pest issues'],
-                'image': 'https://images.unsplash.com/photo-1586093248292-4e6636b4e3b8?w=400&h=300&fit=crop',
-                'description': 'Trendy houseplant with large, violin-shaped leaves. Requires consistent care and bright, indirect light.'
-            },
-            {
-                'id': 4,
-                'common_name': 'Peace Lily',
-                'scientific_name': 'Spathiphyllum',
-                'family': 'Araceae',
-                'origin': 'Tropical Americas',
-                'type': 'Flowering Houseplant',
-                'care_level': 'Easy',
-                'watering': 'Keep soil consistently moist',
-                'sunlight': ['Low Light', 'Bright Indirect Light'],
-                'temperature': '18-27°C (65-80°F)',
-                'humidity': '40-60%',
-                'soil': 'Well-draining potting mix',
-                'fertilizer': 'Monthly during growing season',
-                'growth_rate': 'Moderate',
-                'mature_size': '30-60 cm',
-                'toxicity': 'Toxic to pets and humans',
-                'benefits': ['Air purification', 'Beautiful white flowers', 'Low light tolerance'],
-                'common_problems': ['Brown leaf tips', 'No flowers', 'Root rot'],
-                'image': 'https://images.unsplash.com/photo-1583160247711-2191776b4b91?w=400&h=300&fit=crop',
-                'description': 'Elegant plant with dark green leaves and white, hood-shaped flowers. Excellent air purifier.'
-            },
-            {
-                'id': 5,
-                'common_name': 'Rubber Plant',
-                'scientific_name': 'Ficus elastica',
-                'family': 'Moraceae',
-                'origin': 'India and Southeast Asia',
-                'type': 'Indoor Tree',
-                'care_level': 'Easy',
-                'watering': 'Water when top inch of soil is dry',
-                'sunlight': ['Bright Indirect Light'],
-                'temperature': '18-27°C (65-80°F)',
-                'humidity': '40-60%',
-                'soil': 'Well-draining potting mix',
-                'fertilizer': 'Monthly during growing season',
-                'growth_rate': 'Fast',
-                'mature_size': '1-3 meters indoors',
-                'toxicity': 'Mildly toxic to pets',
-                'benefits': ['Air purification', 'Easy care', 'Glossy foliage'],
-                'common_problems': ['Leaf drop', 'Scale insects', 'Root rot'],
-                'image': 'https://images.unsplash.com/photo-1509423350716-97f2360af2e4?w=400&h=300&fit=crop',
-                'description': 'Popular houseplant with large, glossy, dark green leaves. Very adaptable and easy to care for.'
-            }
-        ]
-
-        # Filter plants based on query
-        if query:
-            query_lower = query.lower()
-            filtered_plants = []
-
-            for plant in plant_database:
-                if (query_lower in plant['common_name'].lower() or
-                    query_lower in plant['scientific_name'].lower() or
-                    query_lower in plant['family'].lower() or
-                    query_lower in plant['type'].lower() or
-                    any(query_lower in benefit.lower() for benefit in plant['benefits'])):
-                    filtered_plants.append(plant)
+def refresh_search_rollups():
+    """Fold new plant searches into the rollups, then re-rank suggestions by the updated counts"""
+    with db_connection() as conn:
+        popularity = search_analytics.refresh(conn)
+    plant_suggestions.reweight(popularity)
 
-            return filtered_plants if filtered_plants else plant_database[:3]
+def search_plants_api(query, limit=plant_catalog.DEFAULT_LIMIT):
+    """Catalog species for query, best match first and typo-tolerant (all species for an empty query)"""
+    if not plant_catalog.tokenize(query or ''):
+        return [plant_catalog.to_dict(plant) for plant in plant_catalog.search('')]
 
-        return plant_database
-
-    except Exception as e:
-        print(f"Plant search error: {e}")
-        return []
+    ranked = plant_catalog.rank(query, limit, popularity=search_analytics.popularity)
+    if not ranked:
+        # Nothing matched: suggest a few species rather than an empty page
+        return [plant_catalog.to_dict(plant) for plant in plant_catalog.search('', limit=3)]
+    return [dict(plant_catalog.to_dict(plant), score=round(score, 3)) for plant, score in ranked]
 
 # Social Media Functions
+@retry_on_busy
 def create_post(user_id, title, content, image_url=None, video_url=None, tags=None, post_type='general'):
     """Create a new social media post"""
     post_id = str(uuid.uuid4())
-    conn = sqlite3.connect('green_world.db')
+    conn = get_db()
 
     conn.execute('''
         INSERT INTO posts
         (id, user_id, title, content, image_url, video_url, tags, post_type)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
     ''', (post_id, user_id, title, content, image_url, video_url, tags, post_type))
+    # Same transaction, so a post is never visible without its timeline rows
+    timeline.fan_out_post(conn, post_id)
 
     conn.commit()
-    conn.close()
+    feed_cache.on_post_created()
 
-    # Emit real-time update
-    socketio.emit('new_post', {
+    # Real-time update for feed viewers
+    events.publish('new_post', {
         'post_id': post_id,
         'user_id': user_id,
         'title': title,
         'content': content,
         'timestamp': datetime.now().isoformat()
-    }, broadcast=True)
+    }, FEED_ROOM)
 
     return post_id
 
-def get_social_feed(user_id=None, limit=20):
-    """Get social media feed posts - FIXED to show all posts"""
-    conn = sqlite3.connect('green_world.db')
-    conn.row_factory = sqlite3.Row
-
-    if user_id:
-        # Check if user follows anyone
-        follows_count = conn.execute('''
-            SELECT COUNT(*) FROM follows WHERE follower_id = ?
-        ''', (user_id,)).fetchone()[0]
-
-        if follows_count > 0:
-            # Get posts from followed users and own posts
-            posts = conn.execute('''
-                SELECT p.*, u.username, u.first_name, u.last_name, u.profile_image, u.bio, u.location
-                FROM posts p
-                JOIN users u ON p.user_id = u.id
-                WHERE p.user_id = ? OR p.user_id IN (
-                    SELECT following_id FROM follows WHERE follower_id = ?
-                )
-                ORDER BY p.created_at DESC
-                LIMIT ?
-            ''', (user_id, user_id, limit)).fetchall()
-        else:
-            # If user doesn't follow anyone, show ALL posts (discovery feed)
-            posts = conn.execute('''
-                SELECT p.*, u.username, u.first_name, u.last_name, u.profile_image, u.bio, u.location
-                FROM posts p
-                JOIN users u ON p.user_id = u.id
-                ORDER BY p.created_at DESC
-                LIMIT ?
-            ''', (limit,)).fetchall()
-    else:
-        # Get all posts for public feed
-        posts = conn.execute('''
-            SELECT p.*, u.username, u.first_name, u.last_name, u.profile_image, u.bio, u.location
-            FROM posts p
-            JOIN users u ON p.user_id = u.id
-            ORDER BY p.created_at DESC
-            LIMIT ?
-        ''', (limit,)).fetchall()
-
-    conn.close()
-    print(f"🔍 DEBUG: Retrieved {len(posts)} posts from database")
-    return posts
+FEED_PAGE_SIZE = 20
+FEED_PAGE_MAX = 50
 
-def like_post(user_id, post_id):
-    """Like or unlike a post"""
-    conn = sqlite3.connect('green_world.db')
-
-    # Check if already liked
-    existing = conn.execute('''
-        SELECT id FROM likes WHERE user_id = ? AND post_id = ?
-    ''', (user_id, post_id)).fetchone()
-
-    if existing:
-        # Unlike
-        conn.execute('DELETE FROM likes WHERE user_id = ? AND post_id = ?', (user_id, post_id))
-        conn.execute('UPDATE posts SET likes_count = likes_count - 1 WHERE id = ?', (post_id,))
-        action = 'unliked'
-    else:
-        # Like
-        like_id = str(uuid.uuid4())
-        conn.execute('INSERT INTO likes (id, user_id, post_id) VALUES (?, ?, ?)', (like_id, user_id, post_id))
-        conn.execute('UPDATE posts SET likes_count = likes_count + 1 WHERE id = ?', (post_id,))
-        action = 'liked'
+def encode_feed_cursor(created_at, post_id):
+    """Opaque cursor for the feed position just after (created_at, post_id)"""
+    raw = json.dumps([created_at, post_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
 
+def decode_feed_cursor(cursor):
+    """Return (created_at, post_id); raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, post_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid feed cursor') from e
+    if not isinstance(created_at, str) or not isinstance(post_id, str):
+        raise ValueError('Invalid feed cursor')
+    return created_at, post_id
+
+def split_feed_page(posts, limit):
+    """Trim the extra look-ahead row and build the cursor for the next page"""
+    # Likes still buffered for the next flush are not in posts.likes_count yet
+    posts = engagement.likes.overlay(posts)
+    if len(posts) <= limit:
+        return posts, None
+    posts = posts[:limit]
+    return posts, encode_feed_cursor(posts[-1]['created_at'], posts[-1]['id'])
+
+def load_public_feed(limit, before=None):
+    """One page of every post, newest first (public page and discovery feed)"""
+    keyset = 'WHERE (p.created_at, p.id) < (?, ?)' if before else ''
+    # Fetch one extra row to learn whether another page exists
+    posts = get_db().execute(f'''
+        SELECT {timeline.FEED_COLUMNS}
+        FROM posts p
+        JOIN users u ON p.user_id = u.id
+        {keyset}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT ?
+    ''', list(before or []) + [limit + 1]).fetchall()
+    return split_feed_page(posts, limit)
+
+def get_social_feed(user_id=None, limit=FEED_PAGE_SIZE, cursor=None):
+    """Get one page of the social feed, newest first.
+
+    Pages by keyset on (created_at, id) instead of OFFSET, so any page is one
+    index range scan and deep scrolling costs the same as page one. Users who
+    follow someone read their materialized timeline (see timeline.py); the
+    shared public/discovery pages are served from feed_cache.
+    Returns (posts, next_cursor); next_cursor is None on the last page.
+    """
+    conn = get_db()
+    limit = max(1, min(int(limit), FEED_PAGE_MAX))
+    before = decode_feed_cursor(cursor) if cursor else None
+
+    if user_id and conn.execute('''
+        SELECT 1 FROM follows WHERE follower_id = ? LIMIT 1
+    ''', (user_id,)).fetchone():
+        # Followed users and own posts: one range scan of the home timeline
+        return split_feed_page(timeline.read_page(conn, user_id, limit + 1, before), limit)
+
+    # Public page, or a user who follows nobody (discovery feed)
+    return feed_cache.get_page(('public', cursor, limit), lambda: load_public_feed(limit, before))
+
+@retry_on_busy
+def follow_user(follower_id, following_id):
+    """Follow a user and backfill their recent posts into the follower's timeline"""
+    conn = get_db()
+
+    inserted = conn.execute('''
+        INSERT OR IGNORE INTO follows (id, follower_id, following_id)
+        SELECT ?, ?, id FROM users WHERE id = ?
+    ''', (str(uuid.uuid4()), follower_id, following_id)).rowcount
+
+    if inserted:
+        conn.execute('UPDATE users SET followers_count = followers_count + 1 WHERE id = ?', (following_id,))
+        timeline.backfill_follow(conn, follower_id, following_id)
     conn.commit()
 
-    # Get updated like count
-    likes_count = conn.execute('SELECT likes_count FROM posts WHERE id = ?', (post_id,)).fetchone()[0]
-    conn.close()
+    return bool(inserted)
 
-    # Emit real-time update
-    socketio.emit('post_liked', {
+@retry_on_busy
+def unfollow_user(follower_id, following_id):
+    """Unfollow a user and drop their posts from the follower's timeline"""
+    conn = get_db()
+
+    deleted = conn.execute('''
+        DELETE FROM follows WHERE follower_id = ? AND following_id = ?
+    ''', (follower_id, following_id)).rowcount
+
+    if deleted:
+        conn.execute('UPDATE users SET followers_count = MAX(followers_count - 1, 0) WHERE id = ?', (following_id,))
+        timeline.remove_follow(conn, follower_id, following_id)
+    conn.commit()
+
+    return bool(deleted)
+
+def like_post(user_id, post_id):
+    """Like or unlike a post.
+
+    The tap is buffered by the write-behind aggregator (engagement.py) and
+    written with other likes in the next batched flush; the count returned
+    here already includes it.
+    """
+    action, likes_count = engagement.likes.toggle(get_db(), user_id, post_id)
+    feed_cache.on_post_liked(post_id, likes_count)
+
+    # Real-time update for clients showing this post; a burst of likes
+    # collapses into one event carrying the latest count
+    events.publish('post_liked', {
         'post_id': post_id,
         'user_id': user_id,
         'action': action,
         'likes_count': likes_count
-    }, broadcast=True)
+    }, post_room(post_id), coalesce=post_id)
 
     return {'action': action, 'likes_count': likes_count}
 
+@retry_on_busy
 def add_comment(user_id, post_id, content):
     """Add a comment to a post"""
     comment_id = str(uuid.uuid4())
-    conn = sqlite3.connect('green_world.db')
+    conn = get_db()
 
     conn.execute('''
         INSERT INTO comments (id, user_id, post_id, content)
@@ -1657,12 +1586,14 @@ def add_comment(user_id, post_id, content):
     conn.execute('UPDATE posts SET comments_count = comments_count + 1 WHERE id = ?', (post_id,))
     conn.commit()
 
+    comments_count = conn.execute('SELECT comments_count FROM posts WHERE id = ?', (post_id,)).fetchone()[0]
+    feed_cache.on_comment_added(post_id, comments_count)
+
     # Get user info for real-time update
     user = conn.execute('SELECT username, first_name, last_name FROM users WHERE id = ?', (user_id,)).fetchone()
-    conn.close()
 
-    # Emit real-time update
-    socketio.emit('new_comment', {
+    # Real-time update for clients showing this post
+    events.publish('new_comment', {
         'comment_id': comment_id,
         'post_id': post_id,
         'user_id': user_id,
@@ -1670,14 +1601,15 @@ def add_comment(user_id, post_id, content):
         'user_name': f"{user['first_name']} {user['last_name']}",
         'content': content,
         'timestamp': datetime.now().isoformat()
-    }, broadcast=True)
+    }, post_room(post_id))
 
     return comment_id
 
+@retry_on_busy
 def create_notification(user_id, notification_type, title, message, data=None):
     """Create a notification for a user"""
     notification_id = str(uuid.uuid4())
-    conn = sqlite3.connect('green_world.db')
+    conn = get_db()
 
     conn.execute('''
         INSERT INTO notifications (id, user_id, type, title, message, data)
@@ -1685,17 +1617,16 @@ def create_notification(user_id, notification_type, title, message, data=None):
     ''', (notification_id, user_id, notification_type, title, message, json.dumps(data) if data else None))
 
     conn.commit()
-    conn.close()
 
-    # Emit real-time notification
-    socketio.emit('new_notification', {
+    # Real-time notification
+    events.publish('new_notification', {
         'notification_id': notification_id,
         'type': notification_type,
         'title': title,
         'message': message,
         'data': data,
         'timestamp': datetime.now().isoformat()
-    }, room=f'user_{user_id}')
+    }, user_room(user_id))
 
     return notification_id
 
@@ -1703,173 +1634,43 @@ def create_notification(user_id, notification_type, title, message, data=None):
 @socketio.on('connect')
 def handle_connect():
     if 'user_id' in session:
-        join_room(f'user_{session["user_id"]}')
+        join_room(user_room(session['user_id']))
         print(f'User {session["user_id"]} connected to real-time updates')
 
 @socketio.on('disconnect')
 def handle_disconnect():
     if 'user_id' in session:
-        leave_room(f'user_{session["user_id"]}')
+        leave_room(user_room(session['user_id']))
         print(f'User {session["user_id"]} disconnected from real-time updates')
 
 @socketio.on('join_feed')
 def handle_join_feed():
-    join_room('social_feed')
+    join_room(FEED_ROOM)
     emit('joined_feed', {'status': 'success'})
 
 @socketio.on('leave_feed')
 def handle_leave_feed():
-    leave_room('social_feed')
+    leave_room(FEED_ROOM)
     emit('left_feed', {'status': 'success'})
 
-# NEW INTERFACE TEMPLATES
-HOME_TEMPLATE = '''
-<!DOCTYPE html>
-<html>
-<head>
-    <title>🌱 Green World - Plant Health & Knowledge System</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-            min-height: 100vh; 
-            color: #333;
-        }
-        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-        .header { 
-            text-align: center; 
-            color: white; 
-            margin-bottom: 50px; 
-            padding: 60px 20px;
-            background: rgba(255,255,255,0.1);
-            border-radius: 25px;
-            backdrop-filter: blur(10px);
-        }
-        .header h1 { 
-            font-size: 4rem; 
-            margin-bottom: 20px; 
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        .subtitle { 
-            font-size: 1.8rem; 
-            margin-bottom: 15px; 
-            opacity: 0.95;
-        }
-        .features-grid { 
-            display: grid; 
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); 
-            gap: 30px; 
-            margin-bottom: 50px; 
-        }
-        .feature-card { 
-            background: white; 
-            border-radius: 25px; 
-            padding: 40px; 
-            text-align: center; 
-            box-shadow: 0 15px 35px rgba(0,0,0,0.1); 
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }
-        .feature-card:hover { 
-            transform: translateY(-10px); 
-            box-shadow: 0 25px 50px rgba(0,0,0,0.2); 
-        }
-        .feature-icon { 
-            font-size: 4rem; 
-            margin-bottom: 20px; 
-            display: block;
-        }
-        .feature-title { 
-            font-size: 1.8rem; 
-            color: #28a745; 
-            margin-bottom: 15px; 
-            font-weight: bold;
-        }
-        .feature-description { 
-            color: #666; 
-            margin-bottom: 25px; 
-            line-height: 1.6;
-            font-size: 1.1rem;
-        }
-        .btn { 
-            background: linear-gradient(135deg, #28a745 0%, #20c997 100%); 
-            color: white; 
-            padding: 18px 35px; 
-            text-decoration: none; 
-            border-radius: 50px; 
-            display: inline-block; 
-            margin: 10px; 
-            font-weight: bold; 
-            font-size: 1.1rem;
-            transition: all 0.3s ease;
-            box-shadow: 0 5px 15px rgba(40, 167, 69, 0.3);
-        }
-        .btn:hover { 
-            transform: translateY(-3px); 
-            box-shadow: 0 10px 25px rgba(40, 167, 69, 0.4);
-        }
-        .btn-quiz {
-            background: linear-gradient(135deg, #6f42c1 0%, #e83e8c 100%);
-            box-shadow: 0 5px 15px rgba(111, 66, 193, 0.3);
-        }
-        .btn-quiz:hover {
-            box-shadow: 0 10px 25px rgba(111, 66, 193, 0.4);
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🌱 Green World</h1>
-            <div class="subtitle">Plant Health & Knowledge System</div>
-        </div>
-        
-        <div class="features-grid">
-            <div class="feature-card">
-                <span class="feature-icon">🔬</span>
-                <h3 class="feature-title">AI Plant Analyzer</h3>
-                <p class="feature-description">
-                    Advanced health diagnostics with disease detection and treatment recommendations
-                </p>
-                <a href="/plant-analyzer" class="btn">Start Analysis</a>
-            </div>
-            
-            <div class="feature-card">
-                <span class="feature-icon">🧠</span>
-                <h3 class="feature-title">Plant Knowledge Quiz</h3>
-                <p class="feature-description">
-                    Test your plant knowledge, earn flower titles, and unlock beautiful rewards
-                </p>
-                <a href="/quiz" class="btn btn-quiz">Take Quiz</a>
-            </div>
-            
-            <div class="feature-card">
-                <span class="feature-icon">📊</span>
-                <h3 class="feature-title">Health History</h3>
-                <p class="feature-description">
-                    Track your plant health journey and monitor improvements over time
-                </p>
-                <a href="/plant-history" class="btn">View History</a>
-            </div>
-            
-            <div class="feature-card">
-                <span class="feature-icon">🏆</span>
-                <h3 class="feature-title">My Achievements</h3>
-                <p class="feature-description">
-                    View your earned flower titles, quiz scores, and beautiful flower collection
-                </p>
-                <a href="/achievements" class="btn">View Achievements</a>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-'''
+@socketio.on('watch_posts')
+def handle_watch_posts(post_ids):
+    """Join the rooms of the posts this client is showing (likes, comments)"""
+    if not isinstance(post_ids, list):
+        return
+    room_budget = MAX_WATCHED_POSTS - sum(1 for room in rooms() if room.startswith('post_'))
+    for post_id in post_ids[:max(room_budget, 0)]:
+        join_room(post_room(post_id))
+
+@socketio.on('unwatch_posts')
+def handle_unwatch_posts(post_ids):
+    if not isinstance(post_ids, list):
+        return
+    for post_id in post_ids:
+        leave_room(post_room(post_id))
 
-ANALYZER_TEMPLATE = '''
+# NEW INTERFACE TEMPLATES
+ANALYZER_TEMPLATE = templates.register('analyzer.html', '''
 <!DOCTYPE html>
 <html>
 <head>
@@ -2008,6 +1809,14 @@ ANALYZER_TEMPLATE = '''
             border-radius: 20px;
             box-shadow: 0 10px 25px rgba(0,0,0,0.1);
         }
+        .alert {
+            background: #f8d7da;
+            color: #721c24;
+            padding: 10px;
+            border-radius: 5px;
+            margin-bottom: 20px;
+            border: 1px solid #f5c6cb;
+        }
     </style>
 </head>
 <body>
@@ -2024,7 +1833,13 @@ ANALYZER_TEMPLATE = '''
                 <p class="upload-description">
                     Get comprehensive health analysis including disease detection, stress assessment, and personalized treatment recommendations
                 </p>
-                
+
+                {% with messages = get_flashed_messages() %}
+                    {% for message in messages %}
+                        <div class="alert">{{ message }}</div>
+                    {% endfor %}
+                {% endwith %}
+
                 <form method="POST" enctype="multipart/form-data">
                     <input type="file" name="plant_image" accept="image/*" required class="file-input">
                     <br>
@@ -2068,9 +1883,9 @@ ANALYZER_TEMPLATE = '''
     </div>
 </body>
 </html>
-'''
+''')
 
-PLANT_SEARCH_TEMPLATE = '''
+PLANT_SEARCH_TEMPLATE = templates.register('plant_search.html', '''
 <!DOCTYPE html>
 <html>
 <head>
@@ -2222,7 +2037,8 @@ PLANT_SEARCH_TEMPLATE = '''
         <div class="search-form">
             <h3>🌱 Search Plant Database</h3>
             <form method="POST">
-                <input type="text" name="plant_name" class="form-control" placeholder="Enter plant name (e.g., Rose, Tulsi, Neem, Monstera)" required>
+                <input type="text" name="plant_name" class="form-control" placeholder="Enter plant name (e.g., Rose, Tulsi, Neem, Monstera)" list="plant-suggestions" autocomplete="off" required>
+                <datalist id="plant-suggestions"></datalist>
                 <button type="submit" class="btn">🔍 Search Plant</button>
             </form>
         </div>
@@ -2247,6 +2063,30 @@ PLANT_SEARCH_TEMPLATE = '''
             document.querySelector('form').submit();
         }
 
+        // Completions as you type; a newer keystroke cancels the request before it
+        (function() {
+            const input = document.querySelector('input[name="plant_name"]');
+            const list = document.getElementById('plant-suggestions');
+            let pending = null;
+
+            input.addEventListener('input', function() {
+                if (pending) pending.abort();
+                pending = new AbortController();
+                fetch('{{ url_for('api_plant_suggest') }}?q=' + encodeURIComponent(input.value), { signal: pending.signal })
+                    .then(response => response.json())
+                    .then(data => {
+                        list.innerHTML = '';
+                        data.suggestions.forEach(plant => {
+                            const option = document.createElement('option');
+                            option.value = plant.common_name;
+                            option.label = plant.scientific_name;
+                            list.appendChild(option);
+                        });
+                    })
+                    .catch(() => {});
+            });
+        })();
+
         // Interactive Plants
         document.addEventListener('DOMContentLoaded', function() {
             const plants = document.querySelectorAll('.cute-plant');
@@ -2295,9 +2135,9 @@ PLANT_SEARCH_TEMPLATE = '''
     </script>
 </body>
 </html>
-'''
+''')
 
-PLANT_SEARCH_RESULTS_TEMPLATE = '''
+PLANT_SEARCH_RESULTS_TEMPLATE = templates.register('plant_search_results.html', '''
 <!DOCTYPE html>
 <html>
 <head>
@@ -2500,9 +2340,9 @@ PLANT_SEARCH_RESULTS_TEMPLATE = '''
     </div>
 </body>
 </html>
-'''
+''')
 
-PROFILE_TEMPLATE = '''
+PROFILE_TEMPLATE = templates.register('profile.html', '''
 <!DOCTYPE html>
 <html>
 <head>
@@ -2660,21 +2500,15 @@ PROFILE_TEMPLATE = '''
     </div>
 </body>
 </html>
-'''
+''')
 
 # Routes - ENHANCED WITH CUTE PLANTS
-@app.route('/')
-def index():
-    weather = get_haryana_weather()
-    return render_template_string('''
+INDEX_TEMPLATE = templates.register('index.html', '''
     <!DOCTYPE html>
     <html>
     <head>
         <title>🌱 Green World - World Leading Plant Social Platform</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-        <meta http-equiv="Pragma" content="no-cache">
-        <meta http-equiv="Expires" content="0">
         <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
         <style>
             * { margin: 0; padding: 0; box-sizing: border-box; }
@@ -3273,15 +3107,14 @@ def index():
         </script>
     </body>
     </html>
-    ''', weather=weather)
+''')
 
-@app.route('/old-login', methods=['GET', 'POST'])
-def old_login():
-    if request.method == 'POST':
-        session['user_id'] = '1'
-        return redirect(url_for('plant_analyzer'))
-    
-    login_template = '''
+@app.route('/')
+def index():
+    weather = get_haryana_weather()
+    return templates.render('index.html', weather=weather)
+
+OLD_LOGIN_TEMPLATE = templates.register('old_login.html', '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -3376,80 +3209,188 @@ def old_login():
         </div>
     </body>
     </html>
-    '''
-    return render_template_string(login_template)
+''')
+
+@app.route('/old-login', methods=['GET', 'POST'])
+def old_login():
+    if request.method == 'POST':
+        session['user_id'] = '1'
+        return redirect(url_for('plant_analyzer'))
+    
+    return templates.render('old_login.html')
 
 @app.route('/plant-analyzer', methods=['GET', 'POST'])
 def plant_analyzer():
     if 'user_id' not in session:
         return redirect(url_for('login'))
-    
+
     if request.method == 'POST':
-        if 'plant_image' not in request.files:
-            return redirect(request.url)
-        
-        file = request.files['plant_image']
-        if file.filename == '':
+        digest = None
+        try:
+            # Streams the image to disk, rejecting oversize or non-image input early
+            _, upload = image_uploads.stream_upload(request, 'plant_image', app.config['UPLOAD_FOLDER'],
+                                                    max_bytes=app.config['MAX_CONTENT_LENGTH'])
+        except HTTPException as e:
+            # Too large (413) or not an image (415): back to the form with the reason
+            if e.description == RequestEntityTooLarge.description:
+                flash(f"That photo is too large. Please upload one under "
+                      f"{app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB.")
+            else:
+                flash(e.description)
             return redirect(request.url)
-        
-        if file:
-            try:
-                filename = secure_filename(file.filename)
-                unique_filename = f"{uuid.uuid4()}_{filename}"
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-
-                # Save file with error handling
-                file.save(file_path)
-                print(f"✅ File saved successfully: {file_path}")
-
-                # Generate analysis
-                analysis = generate_plant_analysis()
+        except OSError as e:
+            # Analysis goes ahead without the file
+            print(f"🚨 Error handling file upload: {e}")
+        else:
+            if upload is None:
+                return redirect(request.url)
+            # Re-uploads of the same photo share one stored file
+            digest = blobs.put_file(upload.path, upload.sha256)
+            thumbnails.submit(digest)
+            print(f"✅ File saved successfully: {blobs.path(digest)}")
+
+        image_url = url_for('blob', digest=digest) if digest else "no_file_uploaded"
+        try:
+            analysis_id = enqueue_plant_analysis(session['user_id'], image_url, digest)
+        except QueueFull as e:
+            response = app.make_response((templates.render('analysis_pending.html', busy=True,
+                                                           retry_after=e.retry_after), 503))
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
 
-                # Save to database with relative path
-                relative_path = f"uploads/{unique_filename}"
-                save_plant_analysis(session['user_id'], relative_path, analysis)
+        # The results page waits for the job and shows the analysis once it is done
+        return redirect(url_for('plant_analysis_result', analysis_id=analysis_id))
 
-                # Return results
-                return render_analysis_results(analysis)
+    return templates.render('analyzer.html')
 
-            except Exception as e:
-                print(f"🚨 Error handling file upload: {e}")
-                # Generate analysis without file
-                analysis = generate_plant_analysis()
+@app.route('/plant-analyzer/<analysis_id>')
+def plant_analysis_result(analysis_id):
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
 
-                # Save to database without file path
-                save_plant_analysis(session['user_id'], "no_file_uploaded", analysis)
+    row = get_user_analysis(analysis_id, session['user_id'])
+    if row is None:
+        abort(404)
+    if row['analysis_status'] == 'completed':
+        return render_analysis_results(load_analysis_lists(dict(row)))
+    return templates.render('analysis_pending.html', busy=False, analysis_id=analysis_id,
+                            status=row['analysis_status'], timeout=app.config['ANALYSIS_POLL_TIMEOUT'])
 
-                # Return results
-                return render_analysis_results(analysis)
+@app.route('/blobs/<digest>')
+def blob(digest):
+    return blobs.send(digest)
 
-    return render_template_string(ANALYZER_TEMPLATE)
+ANALYSIS_PENDING_TEMPLATE = templates.register('analysis_pending.html', '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>🔬 Analyzing Your Plant - Green World</title>
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <style>
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body {
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                background: linear-gradient(135deg, #f0fdf4 0%, #ecfdf5 100%);
+                min-height: 100vh;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                color: #333;
+            }
+            .card {
+                background: white;
+                padding: 50px;
+                border-radius: 25px;
+                text-align: center;
+                max-width: 520px;
+                box-shadow: 0 15px 35px rgba(40, 167, 69, 0.2);
+            }
+            .card h1 { color: #28a745; margin-bottom: 15px; }
+            .card p { color: #666; font-size: 1.1rem; margin-bottom: 25px; }
+            .spinner {
+                width: 60px;
+                height: 60px;
+                margin: 0 auto 25px;
+                border: 6px solid #d4edda;
+                border-top-color: #28a745;
+                border-radius: 50%;
+                animation: spin 1s linear infinite;
+            }
+            @keyframes spin { to { transform: rotate(360deg); } }
+            .btn {
+                display: inline-block;
+                background: linear-gradient(135deg, #28a745 0%, #20c997 100%);
+                color: white;
+                padding: 12px 30px;
+                border-radius: 25px;
+                text-decoration: none;
+                font-weight: 600;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="card">
+            {% if busy %}
+            <h1>🌿 The Analyzer Is Busy</h1>
+            <p>Lots of plants are being analyzed right now. Please try again in about {{ retry_after }} seconds.</p>
+            <a href="/plant-analyzer" class="btn">🔬 Back to the Analyzer</a>
+            {% else %}
+            <div class="spinner"></div>
+            <h1>🔬 Analyzing Your Plant</h1>
+            <p id="status">{{ 'Analysis failed. Please try another photo.' if status == 'failed' else 'Your photo is being analyzed; results will appear here.' }}</p>
+            <a href="/plant-history" class="btn">📊 Plant History</a>
+            {% endif %}
+        </div>
+        {% if not busy and status != 'failed' %}
+        <script>
+            // Give up after {{ timeout|int }} s instead of polling a stuck analysis forever
+            const deadline = Date.now() + {{ (timeout * 1000)|int }};
+            function retry(delay) {
+                if (Date.now() + delay > deadline) {
+                    document.querySelector('.spinner').style.display = 'none';
+                    document.getElementById('status').textContent =
+                        'This is taking longer than expected. Your results will appear in Plant History once ready.';
+                } else {
+                    setTimeout(poll, delay);
+                }
+            }
+            function poll() {
+                fetch('{{ url_for('api_analysis_status', analysis_id=analysis_id) }}', { credentials: 'same-origin' })
+                    .then(response => response.json())
+                    .then(data => {
+                        if (data.status === 'completed') {
+                            window.location.reload();
+                        } else if (data.status === 'failed') {
+                            document.getElementById('status').textContent = 'Analysis failed. Please try another photo.';
+                        } else {
+                            retry(700);
+                        }
+                    })
+                    .catch(() => retry(2000));
+            }
+            poll();
+        </script>
+        {% endif %}
+    </body>
+    </html>
+''')
 
-def render_analysis_results(analysis):
-    urgency_color = '#dc3545' if analysis['urgency_level'] == 'High' else '#ffc107' if analysis['urgency_level'] == 'Medium' else '#28a745'
-    urgency_icon = '🚨' if analysis['urgency_level'] == 'High' else '⚠️' if analysis['urgency_level'] == 'Medium' else '✅'
-    
-    symptoms_html = ''.join([f'<li><span class="symptom-bullet">•</span> {symptom}</li>' for symptom in analysis.get('symptoms', [])])
-    recommendations_html = ''.join([f'<li><span class="rec-bullet">✓</span> {rec}</li>' for rec in analysis.get('recommendations', [])])
-    prevention_html = ''.join([f'<li><span class="prev-bullet">🛡️</span> {tip}</li>' for tip in analysis.get('prevention_tips', ['Regular monitoring', 'Proper care routine'])])
-    cure_html = ''.join([f'<li><span class="cure-bullet">💊</span> {cure}</li>' for cure in analysis.get('cure_suggestions', [])])
-    
-    results_template = f'''
+ANALYSIS_RESULTS_TEMPLATE = templates.register('analysis_results.html', '''
     <!DOCTYPE html>
     <html>
     <head>
-        <title>🌱 Analysis Results - {analysis['plant_name']}</title>
+        <title>🌱 Analysis Results - {{ analysis['plant_name'] }}</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
                 background: linear-gradient(135deg, #f0fdf4 0%, #ecfdf5 100%); 
                 min-height: 100vh; 
                 color: #333;
-            }}
-            .container {{ max-width: 1400px; margin: 0 auto; padding: 20px; }}
-            .header {{ 
+            }
+            .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
+            .header { 
                 background: linear-gradient(135deg, #28a745 0%, #20c997 100%); 
                 color: white; 
                 text-align: center; 
@@ -3457,152 +3398,152 @@ def render_analysis_results(analysis):
                 border-radius: 25px; 
                 margin-bottom: 40px;
                 box-shadow: 0 15px 35px rgba(40, 167, 69, 0.3);
-            }}
-            .header h1 {{ 
+            }
+            .header h1 { 
                 font-size: 3rem; 
                 margin-bottom: 15px; 
                 text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-            }}
-            .header h2 {{ 
+            }
+            .header h2 { 
                 font-size: 2.2rem; 
                 margin-bottom: 10px; 
                 opacity: 0.95;
-            }}
-            .header p {{ 
+            }
+            .header p { 
                 font-size: 1.2rem; 
                 opacity: 0.9; 
-            }}
-            .urgency-alert {{ 
-                background: {urgency_color}; 
+            }
+            .urgency-alert { 
+                background: {{ urgency_color }}; 
                 color: white; 
                 padding: 30px; 
                 border-radius: 20px; 
                 text-align: center; 
                 margin-bottom: 40px;
                 box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-            }}
-            .urgency-alert h3 {{ 
+            }
+            .urgency-alert h3 { 
                 font-size: 2rem; 
                 margin-bottom: 15px; 
-            }}
-            .urgency-alert p {{ 
+            }
+            .urgency-alert p { 
                 font-size: 1.3rem; 
-            }}
-            .metrics-grid {{ 
+            }
+            .metrics-grid { 
                 display: grid; 
                 grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); 
                 gap: 25px; 
                 margin-bottom: 40px; 
-            }}
-            .metric-card {{ 
+            }
+            .metric-card { 
                 background: white; 
                 padding: 30px; 
                 border-radius: 20px; 
                 text-align: center; 
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1);
                 transition: transform 0.3s ease;
-            }}
-            .metric-card:hover {{
+            }
+            .metric-card:hover {
                 transform: translateY(-5px);
-            }}
-            .metric-card h4 {{ 
+            }
+            .metric-card h4 { 
                 font-size: 1.3rem; 
                 margin-bottom: 15px; 
-            }}
-            .metric-card h3 {{ 
+            }
+            .metric-card h3 { 
                 font-size: 1.8rem; 
                 margin-bottom: 15px; 
-            }}
-            .progress-bar {{ 
+            }
+            .progress-bar { 
                 background: #e9ecef; 
                 height: 12px; 
                 border-radius: 6px; 
                 overflow: hidden; 
                 margin: 15px 0; 
-            }}
-            .progress-fill {{ 
+            }
+            .progress-fill { 
                 height: 100%; 
                 transition: width 1.5s ease; 
                 border-radius: 6px;
-            }}
-            .card {{ 
+            }
+            .card { 
                 background: white; 
                 border-radius: 20px; 
                 padding: 35px; 
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1); 
                 margin-bottom: 25px; 
-            }}
-            .section {{ 
+            }
+            .section { 
                 margin-bottom: 35px; 
-            }}
-            .section h3 {{ 
+            }
+            .section h3 { 
                 color: #28a745; 
                 border-bottom: 3px solid #28a745; 
                 padding-bottom: 15px; 
                 margin-bottom: 25px;
                 font-size: 1.8rem;
-            }}
-            .section ul {{ 
+            }
+            .section ul { 
                 list-style: none; 
                 padding: 0; 
-            }}
-            .section li {{ 
+            }
+            .section li { 
                 padding: 12px 0; 
                 border-bottom: 1px solid #eee; 
                 display: flex;
                 align-items: flex-start;
                 font-size: 1.1rem;
                 line-height: 1.6;
-            }}
-            .section li:last-child {{
+            }
+            .section li:last-child {
                 border-bottom: none;
-            }}
-            .symptom-bullet, .rec-bullet, .prev-bullet, .cure-bullet {{
+            }
+            .symptom-bullet, .rec-bullet, .prev-bullet, .cure-bullet {
                 margin-right: 12px;
                 font-weight: bold;
                 flex-shrink: 0;
-            }}
-            .symptom-bullet {{ color: #dc3545; }}
-            .rec-bullet {{ color: #28a745; }}
-            .prev-bullet {{ color: #17a2b8; }}
-            .cure-bullet {{ color: #6f42c1; }}
-            .issues-card {{
+            }
+            .symptom-bullet { color: #dc3545; }
+            .rec-bullet { color: #28a745; }
+            .prev-bullet { color: #17a2b8; }
+            .cure-bullet { color: #6f42c1; }
+            .issues-card {
                 border-left: 5px solid #dc3545;
                 background: linear-gradient(135deg, #fff5f5 0%, #fed7d7 100%);
-            }}
-            .recovery-card {{
+            }
+            .recovery-card {
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 color: white;
-            }}
-            .recovery-grid {{
+            }
+            .recovery-grid {
                 display: grid;
                 grid-template-columns: 1fr 1fr;
                 gap: 40px;
                 text-align: center;
-            }}
-            .recovery-item h4 {{
+            }
+            .recovery-item h4 {
                 font-size: 1.3rem;
                 margin-bottom: 10px;
                 opacity: 0.9;
-            }}
-            .recovery-item h3 {{
+            }
+            .recovery-item h3 {
                 font-size: 2rem;
-            }}
-            .care-grid {{
+            }
+            .care-grid {
                 display: grid;
                 grid-template-columns: 1fr 1fr;
                 gap: 30px;
-            }}
-            .care-item h4 {{
+            }
+            .care-item h4 {
                 margin-bottom: 15px;
                 font-size: 1.3rem;
-            }}
-            .care-item p {{
+            }
+            .care-item p {
                 font-size: 1.1rem;
                 line-height: 1.6;
                 color: #555;
-            }}
-            .btn {{ 
+            }
+            .btn { 
                 background: linear-gradient(135deg, #28a745 0%, #20c997 100%); 
                 color: white; 
                 padding: 18px 35px; 
@@ -3614,101 +3555,101 @@ def render_analysis_results(analysis):
                 font-size: 1.1rem;
                 transition: all 0.3s ease;
                 box-shadow: 0 8px 20px rgba(40, 167, 69, 0.3);
-            }}
-            .btn:hover {{ 
+            }
+            .btn:hover { 
                 transform: translateY(-3px); 
                 box-shadow: 0 12px 30px rgba(40, 167, 69, 0.4);
-            }}
-            .btn-secondary {{
+            }
+            .btn-secondary {
                 background: linear-gradient(135deg, #6c757d 0%, #495057 100%);
                 box-shadow: 0 8px 20px rgba(108, 117, 125, 0.3);
-            }}
-            .nav-section {{
+            }
+            .nav-section {
                 text-align: center;
                 margin-top: 50px;
                 padding: 40px;
                 background: white;
                 border-radius: 20px;
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1);
-            }}
-            .nav-section h3 {{
+            }
+            .nav-section h3 {
                 color: #28a745;
                 margin-bottom: 25px;
                 font-size: 2rem;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="container">
             <div class="header">
                 <h1>🌱 Analysis Complete!</h1>
-                <h2>{analysis['plant_name']}</h2>
-                <p>{analysis['plant_type']} • AI Confidence: {analysis['confidence_score']}%</p>
+                <h2>{{ analysis['plant_name'] }}</h2>
+                <p>{{ analysis['plant_type'] }} • AI Confidence: {{ analysis['confidence_score'] }}%</p>
             </div>
             
             <div class="urgency-alert">
-                <h3>{urgency_icon} {analysis.get('urgency_level', 'Medium')} Priority Action Required</h3>
-                <p>Overall Health Score: {int(analysis.get('overall_health_score', 0.7) * 100)}% • Recovery Time: {analysis.get('recovery_time', '1-2 weeks')}</p>
+                <h3>{{ urgency_icon }} {{ analysis.get('urgency_level', 'Medium') }} Priority Action Required</h3>
+                <p>Overall Health Score: {{ (analysis.get('overall_health_score', 0.7) * 100)|int }}% • Recovery Time: {{ analysis.get('recovery_time', '1-2 weeks') }}</p>
             </div>
             
             <div class="metrics-grid">
                 <div class="metric-card">
                     <h4>💧 Hydration Level</h4>
-                    <h3 style="color: #17a2b8;">{analysis['dehydration_level']}</h3>
+                    <h3 style="color: #17a2b8;">{{ analysis['dehydration_level'] }}</h3>
                     <div class="progress-bar">
-                        <div class="progress-fill" style="width: {int((1-analysis['dehydration_score'])*100)}%; background: linear-gradient(90deg, #17a2b8, #20c997);"></div>
+                        <div class="progress-fill" style="width: {{ ((1 - analysis['dehydration_score']) * 100)|int }}%; background: linear-gradient(90deg, #17a2b8, #20c997);"></div>
                     </div>
-                    <small style="font-size: 1rem; color: #666;">{int((1-analysis['dehydration_score'])*100)}% Hydrated</small>
+                    <small style="font-size: 1rem; color: #666;">{{ ((1 - analysis['dehydration_score']) * 100)|int }}% Hydrated</small>
                 </div>
                 
                 <div class="metric-card">
                     <h4>⚡ Stress Level</h4>
-                    <h3 style="color: #ffc107;">{analysis['stress_level']}</h3>
+                    <h3 style="color: #ffc107;">{{ analysis['stress_level'] }}</h3>
                     <div class="progress-bar">
-                        <div class="progress-fill" style="width: {int(analysis['stress_score']*100)}%; background: linear-gradient(90deg, #ffc107, #fd7e14);"></div>
+                        <div class="progress-fill" style="width: {{ (analysis['stress_score'] * 100)|int }}%; background: linear-gradient(90deg, #ffc107, #fd7e14);"></div>
                     </div>
-                    <small style="font-size: 1rem; color: #666;">{int(analysis['stress_score']*100)}% Stress Level</small>
+                    <small style="font-size: 1rem; color: #666;">{{ (analysis['stress_score'] * 100)|int }}% Stress Level</small>
                 </div>
                 
                 <div class="metric-card">
                     <h4>☀️ Sunlight Exposure</h4>
-                    <h3 style="color: #fd7e14;">{analysis['sunlight_exposure']}</h3>
+                    <h3 style="color: #fd7e14;">{{ analysis['sunlight_exposure'] }}</h3>
                     <div class="progress-bar">
-                        <div class="progress-fill" style="width: {int(analysis['sunlight_score']*100)}%; background: linear-gradient(90deg, #fd7e14, #ffc107);"></div>
+                        <div class="progress-fill" style="width: {{ (analysis['sunlight_score'] * 100)|int }}%; background: linear-gradient(90deg, #fd7e14, #ffc107);"></div>
                     </div>
-                    <small style="font-size: 1rem; color: #666;">{int(analysis['sunlight_score']*100)}% Optimal</small>
+                    <small style="font-size: 1rem; color: #666;">{{ (analysis['sunlight_score'] * 100)|int }}% Optimal</small>
                 </div>
             </div>
             
-            {f'''
+            {% if analysis['disease_detected'] != 'None' or analysis['pest_detected'] != 'None' %}
             <div class="card issues-card">
                 <h3 style="color: #dc3545;">🚨 Health Issues Detected</h3>
                 <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 25px; margin-top: 20px;">
-                    {f'<div style="padding: 20px; background: rgba(220, 53, 69, 0.1); border-radius: 15px;"><strong style="color: #dc3545;">Disease Detected:</strong><br><span style="font-size: 1.2rem; color: #721c24;">{analysis.get("disease_detected", "None")}</span></div>' if analysis.get("disease_detected", "None") != "None" else ""}
-                    {f'<div style="padding: 20px; background: rgba(220, 53, 69, 0.1); border-radius: 15px;"><strong style="color: #dc3545;">Pest Detected:</strong><br><span style="font-size: 1.2rem; color: #721c24;">{analysis.get("pest_detected", "None")}</span></div>' if analysis.get("pest_detected", "None") != "None" else ""}
+                    {% if analysis.get('disease_detected', 'None') != 'None' %}<div style="padding: 20px; background: rgba(220, 53, 69, 0.1); border-radius: 15px;"><strong style="color: #dc3545;">Disease Detected:</strong><br><span style="font-size: 1.2rem; color: #721c24;">{{ analysis.get('disease_detected', 'None') }}</span></div>{% endif %}
+                    {% if analysis.get('pest_detected', 'None') != 'None' %}<div style="padding: 20px; background: rgba(220, 53, 69, 0.1); border-radius: 15px;"><strong style="color: #dc3545;">Pest Detected:</strong><br><span style="font-size: 1.2rem; color: #721c24;">{{ analysis.get('pest_detected', 'None') }}</span></div>{% endif %}
                 </div>
             </div>
-            ''' if analysis["disease_detected"] != "None" or analysis["pest_detected"] != "None" else ""}
+            {% endif %}
             
             <div class="card">
                 <div class="section">
                     <h3>🔍 Observed Symptoms</h3>
-                    <ul>{symptoms_html}</ul>
+                    <ul>{% for symptom in analysis.get('symptoms', []) %}<li><span class="symptom-bullet">•</span> {{ symptom }}</li>{% endfor %}</ul>
                 </div>
                 
                 <div class="section">
                     <h3>💡 Immediate Action Plan</h3>
-                    <ul>{recommendations_html}</ul>
+                    <ul>{% for rec in analysis.get('recommendations', []) %}<li><span class="rec-bullet">✓</span> {{ rec }}</li>{% endfor %}</ul>
                 </div>
                 
                 <div class="section">
                     <h3>🛡️ Prevention Strategy</h3>
-                    <ul>{prevention_html}</ul>
+                    <ul>{% for tip in analysis.get('prevention_tips', ['Regular monitoring', 'Proper care routine']) %}<li><span class="prev-bullet">🛡️</span> {{ tip }}</li>{% endfor %}</ul>
                 </div>
                 
                 <div class="section">
                     <h3>💊 Treatment & Recovery Plan</h3>
-                    <ul>{cure_html}</ul>
+                    <ul>{% for cure in analysis.get('cure_suggestions', []) %}<li><span class="cure-bullet">💊</span> {{ cure }}</li>{% endfor %}</ul>
                 </div>
             </div>
             
@@ -3716,11 +3657,11 @@ def render_analysis_results(analysis):
                 <div class="recovery-grid">
                     <div class="recovery-item">
                         <h4>⏰ Expected Recovery</h4>
-                        <h3>{analysis.get('recovery_time', '1-2 weeks')}</h3>
+                        <h3>{{ analysis.get('recovery_time', '1-2 weeks') }}</h3>
                     </div>
                     <div class="recovery-item">
                         <h4>📅 Follow-up Date</h4>
-                        <h3>{analysis.get('follow_up_date', 'Next week')}</h3>
+                        <h3>{{ analysis.get('follow_up_date', 'Next week') }}</h3>
                     </div>
                 </div>
             </div>
@@ -3730,11 +3671,11 @@ def render_analysis_results(analysis):
                 <div class="care-grid">
                     <div class="care-item">
                         <h4 style="color: #17a2b8;">💧 Watering Schedule</h4>
-                        <p>{analysis.get('watering_schedule', 'Water when soil feels dry')}</p>
+                        <p>{{ analysis.get('watering_schedule', 'Water when soil feels dry') }}</p>
                     </div>
                     <div class="care-item">
                         <h4 style="color: #28a745;">🌱 Fertilizer Plan</h4>
-                        <p>{analysis.get('fertilizer_recommendation', 'Monthly balanced fertilizer')}</p>
+                        <p>{{ analysis.get('fertilizer_recommendation', 'Monthly balanced fertilizer') }}</p>
                     </div>
                 </div>
             </div>
@@ -3748,33 +3689,15 @@ def render_analysis_results(analysis):
         </div>
     </body>
     </html>
-    '''
-    
-    return render_template_string(results_template)
+    ''')
 
-@app.route('/plant-history')
-def plant_history():
-    if 'user_id' not in session:
-        return redirect(url_for('login'))
-    
-    analyses = get_plant_history(session['user_id'])
-    
-    # Parse JSON fields
-    for analysis in analyses:
-        try:
-            if analysis['symptoms']:
-                analysis['symptoms'] = json.loads(analysis['symptoms'])
-            if analysis['recommendations']:
-                analysis['recommendations'] = json.loads(analysis['recommendations'])
-            if analysis['prevention_tips']:
-                analysis['prevention_tips'] = json.loads(analysis['prevention_tips'])
-            if analysis['cure_suggestions']:
-                analysis['cure_suggestions'] = json.loads(analysis['cure_suggestions'])
-        except:
-            pass
-    
-    if not analyses:
-        empty_template = '''
+def render_analysis_results(analysis):
+    urgency_color = '#dc3545' if analysis['urgency_level'] == 'High' else '#ffc107' if analysis['urgency_level'] == 'Medium' else '#28a745'
+    urgency_icon = '🚨' if analysis['urgency_level'] == 'High' else '⚠️' if analysis['urgency_level'] == 'Medium' else '✅'
+    return templates.stream('analysis_results.html', analysis=analysis,
+                            urgency_color=urgency_color, urgency_icon=urgency_icon)
+
+PLANT_HISTORY_EMPTY_TEMPLATE = templates.register('plant_history_empty.html', '''
         <!DOCTYPE html>
         <html>
         <head>
@@ -3850,106 +3773,24 @@ def plant_history():
             </div>
         </body>
         </html>
-        '''
-        return render_template_string(empty_template)
-    
-    # Generate history cards
-    history_cards = []
-    for analysis in analyses:
-        urgency_color = '#dc3545' if analysis['urgency_level'] == 'High' else '#ffc107' if analysis['urgency_level'] == 'Medium' else '#28a745'
-        
-        # Safely get symptoms and recommendations
-        symptoms = analysis.get('symptoms', [])
-        recommendations = analysis.get('recommendations', [])
-        cure_suggestions = analysis.get('cure_suggestions', [])
-        
-        if isinstance(symptoms, str):
-            try:
-                symptoms = json.loads(symptoms)
-            except:
-                symptoms = [symptoms]
-        
-        if isinstance(recommendations, str):
-            try:
-                recommendations = json.loads(recommendations)
-            except:
-                recommendations = [recommendations]
-                
-        if isinstance(cure_suggestions, str):
-            try:
-                cure_suggestions = json.loads(cure_suggestions)
-            except:
-                cure_suggestions = [cure_suggestions]
-        
-        history_cards.append(f'''
-        <div class="history-card">
-            <div class="card-header">
-                <div class="plant-info">
-                    <h4>{analysis['plant_name']}</h4>
-                    <span class="plant-type">{analysis['plant_type']}</span>
-                </div>
-                <span class="badge" style="background: {urgency_color};">{analysis['urgency_level']} Priority</span>
-            </div>
-            <div class="card-body">
-                <div class="metrics">
-                    <div class="metric">
-                        <span class="metric-label">Health Score</span>
-                        <span class="metric-value" style="color: {urgency_color};">{int(analysis['overall_health_score'] * 100)}%</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Hydration</span>
-                        <span class="metric-value">{analysis['dehydration_level']}</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Stress</span>
-                        <span class="metric-value">{analysis['stress_level']}</span>
-                    </div>
-                </div>
-                
-                <div class="analysis-details">
-                    <div class="detail-section">
-                        <h6>🔍 Key Symptoms:</h6>
-                        <ul>{''.join([f'<li>{symptom}</li>' for symptom in symptoms[:3]])}</ul>
-                    </div>
-                    
-                    <div class="detail-section">
-                        <h6>💡 Recommendations:</h6>
-                        <ul>{''.join([f'<li>{rec}</li>' for rec in recommendations[:3]])}</ul>
-                    </div>
-                    
-                    <div class="detail-section">
-                        <h6>💊 Treatment Plan:</h6>
-                        <ul>{''.join([f'<li>{cure}</li>' for cure in cure_suggestions[:2]])}</ul>
-                    </div>
-                </div>
-                
-                <div class="card-footer">
-                    <div class="footer-info">
-                        <span>📅 {analysis['created_at'].split()[0]}</span>
-                        <span>⏰ Recovery: {analysis['recovery_time']}</span>
-                        <span>🎯 Confidence: {analysis['confidence_score']}%</span>
-                    </div>
-                </div>
-            </div>
-        </div>
-        ''')
-    
-    history_template = f'''
+''')
+
+PLANT_HISTORY_TEMPLATE = templates.register('plant_history.html', '''
     <!DOCTYPE html>
     <html>
     <head>
         <title>📊 Plant Analysis History - Enhanced Tracking</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
                 background: linear-gradient(135deg, #f0fdf4 0%, #ecfdf5 100%); 
                 min-height: 100vh; 
                 color: #333;
-            }}
-            .container {{ max-width: 1400px; margin: 0 auto; padding: 20px; }}
-            .header {{ 
+            }
+            .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
+            .header { 
                 background: linear-gradient(135deg, #28a745 0%, #20c997 100%); 
                 color: white; 
                 text-align: center; 
@@ -3957,145 +3798,151 @@ def plant_history():
                 border-radius: 25px; 
                 margin-bottom: 40px;
                 box-shadow: 0 15px 35px rgba(40, 167, 69, 0.3);
-            }}
-            .header h1 {{ 
+            }
+            .header h1 { 
                 font-size: 3rem; 
                 margin-bottom: 15px; 
                 text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-            }}
-            .header p {{ 
+            }
+            .header p { 
                 font-size: 1.3rem; 
                 opacity: 0.95; 
-            }}
-            .stats-grid {{ 
+            }
+            .stats-grid { 
                 display: grid; 
                 grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); 
                 gap: 25px; 
                 margin-bottom: 40px; 
-            }}
-            .stat-card {{ 
+            }
+            .stat-card { 
                 background: white; 
                 padding: 30px; 
                 border-radius: 20px; 
                 text-align: center; 
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1);
                 transition: transform 0.3s ease;
-            }}
-            .stat-card:hover {{
+            }
+            .stat-card:hover {
                 transform: translateY(-5px);
-            }}
-            .stat-card h3 {{ 
+            }
+            .stat-card h3 { 
                 font-size: 2.5rem; 
                 margin-bottom: 10px; 
-            }}
-            .stat-card p {{ 
+            }
+            .stat-card p { 
                 color: #666; 
                 font-size: 1.1rem;
-            }}
-            .history-grid {{ 
+            }
+            .history-grid { 
                 display: grid; 
                 grid-template-columns: repeat(auto-fit, minmax(450px, 1fr)); 
                 gap: 25px; 
-            }}
-            .history-card {{ 
+            }
+            .history-card { 
                 background: white; 
                 border-radius: 20px; 
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1); 
                 overflow: hidden;
                 transition: transform 0.3s ease;
-            }}
-            .history-card:hover {{
+            }
+            .history-card:hover {
                 transform: translateY(-5px);
-            }}
-            .card-header {{ 
+            }
+            .plant-photo {
+                display: block;
+                width: 100%;
+                height: 220px;
+                object-fit: cover;
+            }
+            .card-header { 
                 padding: 25px; 
                 background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
                 display: flex; 
                 justify-content: space-between; 
                 align-items: center; 
-            }}
-            .plant-info h4 {{
+            }
+            .plant-info h4 {
                 font-size: 1.4rem;
                 color: #28a745;
                 margin-bottom: 5px;
-            }}
-            .plant-type {{
+            }
+            .plant-type {
                 color: #666;
                 font-size: 0.9rem;
-            }}
-            .card-body {{ 
+            }
+            .card-body { 
                 padding: 25px; 
-            }}
-            .card-footer {{ 
+            }
+            .card-footer { 
                 padding: 20px 25px; 
                 background: #f8f9fa; 
                 border-top: 1px solid #eee; 
-            }}
-            .badge {{ 
+            }
+            .badge { 
                 padding: 8px 15px; 
                 border-radius: 20px; 
                 color: white; 
                 font-size: 0.85rem; 
                 font-weight: bold;
-            }}
-            .metrics {{ 
+            }
+            .metrics { 
                 display: grid; 
                 grid-template-columns: repeat(3, 1fr); 
                 gap: 20px; 
                 margin-bottom: 25px; 
-            }}
-            .metric {{ 
+            }
+            .metric { 
                 text-align: center; 
                 padding: 15px;
                 background: #f8f9fa;
                 border-radius: 15px;
-            }}
-            .metric-label {{ 
+            }
+            .metric-label { 
                 display: block; 
                 font-size: 0.85rem; 
                 color: #666; 
                 margin-bottom: 5px;
-            }}
-            .metric-value {{ 
+            }
+            .metric-value { 
                 display: block; 
                 font-weight: bold; 
                 font-size: 1.1rem;
-            }}
-            .detail-section {{ 
+            }
+            .detail-section { 
                 margin-bottom: 20px; 
-            }}
-            .detail-section h6 {{ 
+            }
+            .detail-section h6 { 
                 color: #28a745; 
                 margin-bottom: 10px; 
                 font-size: 1rem;
-            }}
-            .detail-section ul {{ 
+            }
+            .detail-section ul { 
                 list-style: none; 
                 padding: 0; 
-            }}
-            .detail-section li {{ 
+            }
+            .detail-section li { 
                 padding: 5px 0; 
                 font-size: 0.9rem; 
                 color: #666;
                 border-bottom: 1px solid #f0f0f0;
-            }}
-            .detail-section li:last-child {{
+            }
+            .detail-section li:last-child {
                 border-bottom: none;
-            }}
-            .footer-info {{
+            }
+            .footer-info {
                 display: flex;
                 justify-content: space-between;
                 flex-wrap: wrap;
                 gap: 15px;
-            }}
-            .footer-info span {{
+            }
+            .footer-info span {
                 font-size: 0.85rem;
                 color: #666;
                 background: white;
                 padding: 5px 10px;
                 border-radius: 10px;
-            }}
-            .btn {{ 
+            }
+            .btn { 
                 background: linear-gradient(135deg, #28a745 0%, #20c997 100%); 
                 color: white; 
                 padding: 18px 35px; 
@@ -4107,28 +3954,28 @@ def plant_history():
                 font-size: 1.1rem;
                 transition: all 0.3s ease;
                 box-shadow: 0 8px 20px rgba(40, 167, 69, 0.3);
-            }}
-            .btn:hover {{ 
+            }
+            .btn:hover { 
                 transform: translateY(-3px); 
                 box-shadow: 0 12px 30px rgba(40, 167, 69, 0.4);
-            }}
-            .btn-secondary {{
+            }
+            .btn-secondary {
                 background: linear-gradient(135deg, #6c757d 0%, #495057 100%);
                 box-shadow: 0 8px 20px rgba(108, 117, 125, 0.3);
-            }}
-            .nav-section {{
+            }
+            .nav-section {
                 text-align: center;
                 margin-top: 50px;
                 padding: 40px;
                 background: white;
                 border-radius: 20px;
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1);
-            }}
-            .nav-section h3 {{
+            }
+            .nav-section h3 {
                 color: #28a745;
                 margin-bottom: 25px;
                 font-size: 2rem;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -4140,25 +3987,82 @@ def plant_history():
             
             <div class="stats-grid">
                 <div class="stat-card">
-                    <h3 style="color: #28a745;">{len(analyses)}</h3>
+                    <h3 style="color: #28a745;">{{ stats['total'] }}</h3>
                     <p>Total Analyses</p>
                 </div>
                 <div class="stat-card">
-                    <h3 style="color: #28a745;">{len([a for a in analyses if a['urgency_level'] == 'Low'])}</h3>
+                    <h3 style="color: #28a745;">{{ stats['low'] }}</h3>
                     <p>Healthy Plants</p>
                 </div>
                 <div class="stat-card">
-                    <h3 style="color: #ffc107;">{len([a for a in analyses if a['urgency_level'] == 'Medium'])}</h3>
+                    <h3 style="color: #ffc107;">{{ stats['medium'] }}</h3>
                     <p>Need Attention</p>
                 </div>
                 <div class="stat-card">
-                    <h3 style="color: #dc3545;">{len([a for a in analyses if a['urgency_level'] == 'High'])}</h3>
+                    <h3 style="color: #dc3545;">{{ stats['high'] }}</h3>
                     <p>Critical Care</p>
                 </div>
             </div>
             
             <div class="history-grid">
-                {''.join(history_cards)}
+                {% for analysis in analyses %}
+                {% set urgency_color = '#dc3545' if analysis['urgency_level'] == 'High' else '#ffc107' if analysis['urgency_level'] == 'Medium' else '#28a745' %}
+        <div class="history-card">
+            {% if analysis['image_hash'] %}
+            {% set srcset = image_srcset(analysis['image_hash']) %}
+            <img class="plant-photo" src="{{ analysis['image_url'] }}" loading="lazy" alt="{{ analysis['plant_name'] }}"
+                 {% if srcset %}srcset="{{ srcset }}" sizes="(max-width: 500px) 100vw, 450px"{% endif %}>
+            {% endif %}
+            <div class="card-header">
+                <div class="plant-info">
+                    <h4>{{ analysis['plant_name'] }}</h4>
+                    <span class="plant-type">{{ analysis['plant_type'] }}</span>
+                </div>
+                <span class="badge" style="background: {{ urgency_color }};">{{ analysis['urgency_level'] }} Priority</span>
+            </div>
+            <div class="card-body">
+                <div class="metrics">
+                    <div class="metric">
+                        <span class="metric-label">Health Score</span>
+                        <span class="metric-value" style="color: {{ urgency_color }};">{{ (analysis['overall_health_score'] * 100)|int }}%</span>
+                    </div>
+                    <div class="metric">
+                        <span class="metric-label">Hydration</span>
+                        <span class="metric-value">{{ analysis['dehydration_level'] }}</span>
+                    </div>
+                    <div class="metric">
+                        <span class="metric-label">Stress</span>
+                        <span class="metric-value">{{ analysis['stress_level'] }}</span>
+                    </div>
+                </div>
+                
+                <div class="analysis-details">
+                    <div class="detail-section">
+                        <h6>🔍 Key Symptoms:</h6>
+                        <ul>{% for symptom in analysis['symptoms'][:3] %}<li>{{ symptom }}</li>{% endfor %}</ul>
+                    </div>
+                    
+                    <div class="detail-section">
+                        <h6>💡 Recommendations:</h6>
+                        <ul>{% for rec in analysis['recommendations'][:3] %}<li>{{ rec }}</li>{% endfor %}</ul>
+                    </div>
+                    
+                    <div class="detail-section">
+                        <h6>💊 Treatment Plan:</h6>
+                        <ul>{% for cure in analysis['cure_suggestions'][:2] %}<li>{{ cure }}</li>{% endfor %}</ul>
+                    </div>
+                </div>
+                
+                <div class="card-footer">
+                    <div class="footer-info">
+                        <span>📅 {{ analysis['created_at'].split()[0] }}</span>
+                        <span>⏰ Recovery: {{ analysis['recovery_time'] }}</span>
+                        <span>🎯 Confidence: {{ analysis['confidence_score'] }}%</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+                {% endfor %}
             </div>
             
             <div class="nav-section">
@@ -4169,16 +4073,22 @@ def plant_history():
         </div>
     </body>
     </html>
-    '''
-    
-    return render_template_string(history_template)
+    ''')
 
-@app.route('/quiz')
-def quiz_home():
+@app.route('/plant-history')
+def plant_history():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    quiz_home_template = '''
+    user_id = session['user_id']
+    stats = get_plant_history_stats(user_id)
+    if not stats['total']:
+        return templates.render('plant_history_empty.html')
+    
+    # Cards render one row at a time as the response is sent
+    return templates.stream('plant_history.html', stats=stats, analyses=iter_plant_history(user_id))
+
+QUIZ_HOME_TEMPLATE = templates.register('quiz_home.html', '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -4369,8 +4279,21 @@ def quiz_home():
         </div>
     </body>
     </html>
-    '''
-    return render_template_string(quiz_home_template)
+''')
+
+@app.route('/quiz')
+def quiz_home():
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+    
+    return templates.render('quiz_home.html')
+
+# Page gradient per quiz level
+QUIZ_LEVEL_COLORS = {
+    'simple': {'primary': '#28a745', 'secondary': '#20c997'},
+    'hard': {'primary': '#ffc107', 'secondary': '#fd7e14'},
+    'hardest': {'primary': '#dc3545', 'secondary': '#c82333'}
+}
 
 @app.route('/quiz/<level>')
 def quiz_level(level):
@@ -4404,46 +4327,24 @@ def quiz_level(level):
     
     return redirect(url_for('quiz_question'))
 
-@app.route('/quiz-question')
-def quiz_question():
-    if 'user_id' not in session or 'quiz_questions' not in session:
-        return redirect(url_for('quiz_home'))
-    
-    current_q = session.get('current_question', 0)
-    questions = session['quiz_questions']
-    level = session['quiz_level']
-    
-    if current_q >= len(questions):
-        return redirect(url_for('quiz_results'))
-    
-    question = questions[current_q]
-    
-    level_colors = {
-        'simple': {'primary': '#28a745', 'secondary': '#20c997'},
-        'hard': {'primary': '#ffc107', 'secondary': '#fd7e14'},
-        'hardest': {'primary': '#dc3545', 'secondary': '#c82333'}
-    }
-    
-    colors = level_colors[level]
-    
-    quiz_template = f'''
+QUIZ_QUESTION_TEMPLATE = templates.register('quiz_question.html', '''
     <!DOCTYPE html>
     <html>
     <head>
-        <title>🧠 Quiz Question {current_q + 1}/{len(questions)}</title>
+        <title>🧠 Quiz Question {{ current_q + 1 }}/{{ total }}</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); 
+                background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%); 
                 min-height: 100vh; 
                 color: #333;
                 display: flex;
                 align-items: center;
                 justify-content: center;
-            }}
-            .quiz-container {{ 
+            }
+            .quiz-container { 
                 max-width: 800px; 
                 width: 100%;
                 margin: 20px;
@@ -4451,45 +4352,45 @@ def quiz_question():
                 border-radius: 25px; 
                 box-shadow: 0 20px 40px rgba(0,0,0,0.2); 
                 overflow: hidden;
-            }}
-            .quiz-header {{ 
-                background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); 
+            }
+            .quiz-header { 
+                background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%); 
                 color: white; 
                 padding: 30px; 
                 text-align: center; 
-            }}
-            .quiz-header h1 {{ 
+            }
+            .quiz-header h1 { 
                 font-size: 2rem; 
                 margin-bottom: 10px; 
-            }}
-            .progress-bar {{ 
+            }
+            .progress-bar { 
                 background: rgba(255,255,255,0.3); 
                 height: 8px; 
                 border-radius: 4px; 
                 overflow: hidden; 
                 margin-top: 20px;
-            }}
-            .progress-fill {{
+            }
+            .progress-fill {
                 background: white;
                 height: 100%;
-                width: {(current_q + 1) / len(questions) * 100}%;
+                width: {{ (current_q + 1) / total * 100 }}%;
                 transition: width 0.3s ease;
-            }}
-            .quiz-body {{ 
+            }
+            .quiz-body { 
                 padding: 50px; 
-            }}
-            .question {{ 
+            }
+            .question { 
                 font-size: 1.5rem; 
                 margin-bottom: 40px; 
                 line-height: 1.6;
                 color: #333;
                 text-align: center;
-            }}
-            .options {{ 
+            }
+            .options { 
                 display: grid; 
                 gap: 20px; 
-            }}
-            .option {{ 
+            }
+            .option { 
                 background: #f8f9fa; 
                 border: 3px solid #e9ecef; 
                 border-radius: 15px; 
@@ -4498,25 +4399,25 @@ def quiz_question():
                 transition: all 0.3s ease;
                 font-size: 1.1rem;
                 text-align: left;
-            }}
-            .option:hover {{ 
-                border-color: {colors['primary']}; 
+            }
+            .option:hover { 
+                border-color: {{ colors.primary }}; 
                 background: #f0f8ff;
                 transform: translateY(-2px);
-            }}
-            .option.selected {{ 
-                border-color: {colors['primary']}; 
-                background: linear-gradient(135deg, {colors['primary']}20, {colors['secondary']}20);
-            }}
-            .quiz-footer {{ 
+            }
+            .option.selected { 
+                border-color: {{ colors.primary }}; 
+                background: linear-gradient(135deg, {{ colors.primary }}20, {{ colors.secondary }}20);
+            }
+            .quiz-footer { 
                 padding: 30px 50px; 
                 background: #f8f9fa; 
                 display: flex; 
                 justify-content: space-between; 
                 align-items: center;
-            }}
-            .btn {{ 
-                background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); 
+            }
+            .btn { 
+                background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%); 
                 color: white; 
                 padding: 15px 30px; 
                 border: none; 
@@ -4525,25 +4426,25 @@ def quiz_question():
                 cursor: pointer; 
                 transition: all 0.3s ease;
                 box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-            }}
-            .btn:hover {{ 
+            }
+            .btn:hover { 
                 transform: translateY(-2px); 
                 box-shadow: 0 8px 25px rgba(0,0,0,0.3);
-            }}
-            .btn:disabled {{
+            }
+            .btn:disabled {
                 opacity: 0.5;
                 cursor: not-allowed;
                 transform: none;
-            }}
-            .score-display {{
+            }
+            .score-display {
                 font-size: 1.1rem;
                 color: #666;
-            }}
+            }
         </style>
         <script>
             let selectedOption = null;
 
-            function selectOption(index) {{
+            function selectOption(index) {
                 // Remove previous selection
                 document.querySelectorAll('.option').forEach(opt => opt.classList.remove('selected'));
 
@@ -4558,46 +4459,48 @@ def quiz_question():
                 document.getElementById('submitBtn').disabled = false;
 
                 console.log('Selected option:', index);
-            }}
+            }
 
-            function submitAnswer() {{
-                if (selectedOption !== null) {{
+            function submitAnswer() {
+                if (selectedOption !== null) {
                     console.log('Submitting answer:', selectedOption);
                     document.getElementById('answerForm').submit();
-                }} else {{
+                } else {
                     alert('Please select an answer first!');
-                }}
-            }}
+                }
+            }
         </script>
     </head>
     <body>
         <div class="quiz-container">
             <div class="quiz-header">
-                <h1>🧠 {level.title()} Level Quiz</h1>
-                <p>Question {current_q + 1} of {len(questions)}</p>
+                <h1>🧠 {{ level.title() }} Level Quiz</h1>
+                <p>Question {{ current_q + 1 }} of {{ total }}</p>
                 <div class="progress-bar">
                     <div class="progress-fill"></div>
                 </div>
             </div>
             
             <div class="quiz-body">
-                <div class="question">{question['question']}</div>
+                <div class="question">{{ question.question }}</div>
                 
                 <form id="answerForm" method="POST" action="/quiz-answer">
                     <div class="options">
-                        {chr(10).join([f'<div class="option" onclick="selectOption({i})"><strong>{chr(65 + i)}.</strong> {option}</div>' for i, option in enumerate(question['options'])])}
+                        {% for option in question.options %}
+                        <div class="option" onclick="selectOption({{ loop.index0 }})"><strong>{{ 'ABCDEFGH'[loop.index0] }}.</strong> {{ option }}</div>
+                        {% endfor %}
                     </div>
                     <input type="hidden" name="selected_option" id="selectedOption">
-                    <input type="hidden" name="correct_answer" value="{question['correct']}">
+                    <input type="hidden" name="correct_answer" value="{{ question.correct }}">
                 </form>
             </div>
             
             <div class="quiz-footer">
                 <div class="score-display">
-                    Score: {session.get('quiz_score', 0)}/{len(questions)}
+                    Score: {{ score }}/{{ total }}
                 </div>
                 <button id="submitBtn" class="btn" onclick="submitAnswer()" disabled>
-                    {('Next Question' if current_q < len(questions) - 1 else 'Finish Quiz')} →
+                    {{ 'Next Question' if current_q < total - 1 else 'Finish Quiz' }} →
                 </button>
             </div>
         </div>
@@ -4605,9 +4508,23 @@ def quiz_question():
 
     </body>
     </html>
-    '''
+''')
+
+@app.route('/quiz-question')
+def quiz_question():
+    if 'user_id' not in session or 'quiz_questions' not in session:
+        return redirect(url_for('quiz_home'))
+    
+    current_q = session.get('current_question', 0)
+    questions = session['quiz_questions']
+    level = session['quiz_level']
     
-    return render_template_string(quiz_template)
+    if current_q >= len(questions):
+        return redirect(url_for('quiz_results'))
+    
+    return templates.render('quiz_question.html', level=level, colors=QUIZ_LEVEL_COLORS[level],
+                            question=questions[current_q], current_q=current_q, total=len(questions),
+                            score=session.get('quiz_score', 0))
 
 @app.route('/quiz-answer', methods=['POST'])
 def quiz_answer():
@@ -4634,129 +4551,87 @@ def quiz_answer():
         print(f"🚨 Error processing quiz answer: {e}")
         return redirect(url_for('quiz_home'))
 
-@app.route('/quiz-results')
-def quiz_results():
-    if 'user_id' not in session or 'quiz_level' not in session:
-        return redirect(url_for('quiz_home'))
-    
-    score = session.get('quiz_score', 0)
-    level = session['quiz_level']
-    user_id = session['user_id']
-    
-    # Get total questions for this quiz
-    total_questions = len(session.get('quiz_questions', []))
-    if total_questions == 0:
-        total_questions = 10  # Default fallback
-
-    # Save quiz attempt
-    save_quiz_attempt(user_id, level, score, total_questions)
-
-    print(f"🏆 Quiz completed: {score}/{total_questions} in {level} level")
-    
-    # Check if user earned a reward (perfect score)
-    reward_earned = False
-    flower_title = ""
-    flower_image = ""
-
-    # Award flower title for perfect score
-    if score == total_questions and score > 0:
-        reward_earned = True
-        flower_data = random.choice(FLOWER_TITLES)
-        flower_title = flower_data['title']
-        flower_image = get_flower_image(flower_data['flower'])
-        
-        # Save achievement
-        save_achievement(user_id, flower_title, flower_image, level)
-    
-    level_colors = {
-        'simple': {'primary': '#28a745', 'secondary': '#20c997'},
-        'hard': {'primary': '#ffc107', 'secondary': '#fd7e14'},
-        'hardest': {'primary': '#dc3545', 'secondary': '#c82333'}
-    }
-    
-    colors = level_colors[level]
-    
-    results_template = f'''
+QUIZ_RESULTS_TEMPLATE = templates.register('quiz_results.html', '''
     <!DOCTYPE html>
     <html>
     <head>
-        <title>🏆 Quiz Results - {score}/{total_questions}</title>
+        <title>🏆 Quiz Results - {{ score }}/{{ total_questions }}</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); 
+                background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%); 
                 min-height: 100vh; 
                 color: #333;
-            }}
-            .container {{ max-width: 1000px; margin: 0 auto; padding: 20px; }}
-            .results-card {{ 
+            }
+            .container { max-width: 1000px; margin: 0 auto; padding: 20px; }
+            .results-card { 
                 background: white; 
                 border-radius: 25px; 
                 box-shadow: 0 20px 40px rgba(0,0,0,0.2); 
                 overflow: hidden;
                 margin-bottom: 30px;
-            }}
-            .results-header {{ 
-                background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); 
+            }
+            .results-header { 
+                background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%); 
                 color: white; 
                 padding: 50px; 
                 text-align: center; 
-            }}
-            .results-header h1 {{ 
+            }
+            .results-header h1 { 
                 font-size: 3rem; 
                 margin-bottom: 20px; 
-            }}
-            .score-display {{ 
+            }
+            .score-display { 
                 font-size: 4rem; 
                 font-weight: bold; 
                 margin: 20px 0;
                 text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            }}
-            .results-body {{ 
+            }
+            .results-body { 
                 padding: 50px; 
                 text-align: center; 
-            }}
-            .performance-message {{ 
+            }
+            .performance-message { 
                 font-size: 1.5rem; 
                 margin-bottom: 30px; 
                 color: #333;
-            }}
-            .reward-section {{ 
+            }
+            .reward-section { 
                 background: linear-gradient(135deg, #ffd700 0%, #ffed4e 100%); 
                 border-radius: 20px; 
                 padding: 40px; 
                 margin: 30px 0;
                 border: 3px solid #f39c12;
-            }}
-            .reward-section h2 {{ 
+            }
+            .reward-section h2 { 
                 color: #d35400; 
                 font-size: 2.5rem; 
                 margin-bottom: 20px;
                 animation: bounce 2s infinite;
-            }}
-            @keyframes bounce {{
-                0%, 20%, 50%, 80%, 100% {{ transform: translateY(0); }}
-                40% {{ transform: translateY(-10px); }}
-                60% {{ transform: translateY(-5px); }}
-            }}
-            .flower-image {{ 
+            }
+            @keyframes bounce {
+                0%, 20%, 50%, 80%, 100% { transform: translateY(0); }
+                40% { transform: translateY(-10px); }
+                60% { transform: translateY(-5px); }
+            }
+            .flower-image { 
                 width: 300px; 
                 height: 300px; 
                 border-radius: 20px; 
                 object-fit: cover; 
                 margin: 20px 0;
                 box-shadow: 0 15px 30px rgba(0,0,0,0.3);
-            }}
-            .flower-title {{ 
+            }
+            .flower-title { 
                 font-size: 2rem; 
                 color: #d35400; 
                 font-weight: bold; 
                 margin-top: 20px;
-            }}
-            .btn {{ 
-                background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); 
+            }
+            .btn { 
+                background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%); 
                 color: white; 
                 padding: 18px 35px; 
                 text-decoration: none; 
@@ -4767,18 +4642,18 @@ def quiz_results():
                 font-size: 1.1rem;
                 transition: all 0.3s ease;
                 box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-            }}
-            .btn:hover {{ 
+            }
+            .btn:hover { 
                 transform: translateY(-3px); 
                 box-shadow: 0 12px 30px rgba(0,0,0,0.4);
-            }}
-            .btn-secondary {{
+            }
+            .btn-secondary {
                 background: linear-gradient(135deg, #6c757d 0%, #495057 100%);
-            }}
-            .btn-gold {{
+            }
+            .btn-gold {
                 background: linear-gradient(135deg, #ffd700 0%, #ffed4e 100%);
                 color: #d35400;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -4786,42 +4661,42 @@ def quiz_results():
             <div class="results-card">
                 <div class="results-header">
                     <h1>🏆 Quiz Complete!</h1>
-                    <div class="score-display">{score}/{total_questions}</div>
-                    <p>{level.title()} Level</p>
+                    <div class="score-display">{{ score }}/{{ total_questions }}</div>
+                    <p>{{ level.title() }} Level</p>
                 </div>
                 
                 <div class="results-body">
                     <div class="performance-message">
-                        {f"🎉 Perfect Score! Outstanding knowledge!" if score == total_questions else
-                         f"🌟 Excellent work! Great plant knowledge!" if score >= total_questions * 0.8 else
-                         f"👍 Good job! Keep learning about plants!" if score >= total_questions * 0.6 else
-                         f"📚 Keep studying! You're on the right track!" if score >= total_questions * 0.4 else
-                         f"🌱 Don't give up! Every expert was once a beginner!"}
+                        {% if score == total_questions %}🎉 Perfect Score! Outstanding knowledge!
+                        {% elif score >= total_questions * 0.8 %}🌟 Excellent work! Great plant knowledge!
+                        {% elif score >= total_questions * 0.6 %}👍 Good job! Keep learning about plants!
+                        {% elif score >= total_questions * 0.4 %}📚 Keep studying! You're on the right track!
+                        {% else %}🌱 Don't give up! Every expert was once a beginner!{% endif %}
                     </div>
                     
-                    {f'''
+                    {% if reward_earned %}
                     <div class="reward-section">
                         <h2>🎊 CONGRATULATIONS! 🎊</h2>
                         <p style="font-size: 1.3rem; color: #d35400; margin-bottom: 20px;">
                             You've earned a new flower title!
                         </p>
-                        <img src="{flower_image}" alt="{flower_title}" class="flower-image">
-                        <div class="flower-title">🌸 {flower_title} 🌸</div>
+                        <img src="{{ flower_image }}" alt="{{ flower_title }}" class="flower-image">
+                        <div class="flower-title">🌸 {{ flower_title }} 🌸</div>
                         <p style="margin-top: 20px; font-size: 1.1rem; color: #d35400;">
                             This beautiful title has been added to your achievements!
                         </p>
                     </div>
-                    ''' if reward_earned else f'''
+                    {% else %}
                     <div style="background: #f8f9fa; padding: 30px; border-radius: 15px; margin: 20px 0;">
-                        <h3 style="color: {colors['primary']}; margin-bottom: 15px;">💡 Want to earn a flower title?</h3>
+                        <h3 style="color: {{ colors.primary }}; margin-bottom: 15px;">💡 Want to earn a flower title?</h3>
                         <p style="font-size: 1.1rem; color: #666;">
-                            Get a perfect score ({total_questions}/{total_questions}) to unlock a beautiful flower title and image!
+                            Get a perfect score ({{ total_questions }}/{{ total_questions }}) to unlock a beautiful flower title and image!
                         </p>
                     </div>
-                    '''}
+                    {% endif %}
                     
                     <div style="margin-top: 40px;">
-                        <a href="/quiz/{level}" class="btn">🔄 Try Again</a>
+                        <a href="/quiz/{{ level }}" class="btn">🔄 Try Again</a>
                         <a href="/quiz" class="btn btn-secondary">📚 Choose Different Level</a>
                         <a href="/achievements" class="btn btn-gold">🏆 View Achievements</a>
                         <a href="/" class="btn btn-secondary">🏠 Home</a>
@@ -4831,34 +4706,51 @@ def quiz_results():
         </div>
     </body>
     </html>
-    '''
+''')
+
+@app.route('/quiz-results')
+def quiz_results():
+    if 'user_id' not in session or 'quiz_level' not in session:
+        return redirect(url_for('quiz_home'))
     
-    # Clear quiz session data
-    for key in ['quiz_questions', 'quiz_level', 'quiz_score', 'current_question']:
-        session.pop(key, None)
+    score = session.get('quiz_score', 0)
+    level = session['quiz_level']
+    user_id = session['user_id']
     
-    return render_template_string(results_template)
+    # Get total questions for this quiz
+    total_questions = len(session.get('quiz_questions', []))
+    if total_questions == 0:
+        total_questions = 10  # Default fallback
 
-@app.route('/achievements')
-def achievements():
-    if 'user_id' not in session:
-        return redirect(url_for('login'))
+    # Save quiz attempt
+    save_quiz_attempt(user_id, level, score, total_questions)
+
+    print(f"🏆 Quiz completed: {score}/{total_questions} in {level} level")
     
-    user_achievements = get_user_achievements(session['user_id'])
+    # Check if user earned a reward (perfect score)
+    reward_earned = False
+    flower_title = ""
+    flower_image = ""
+
+    # Award flower title for perfect score
+    if score == total_questions and score > 0:
+        reward_earned = True
+        flower_data = random.choice(FLOWER_TITLES)
+        flower_title = flower_data['title']
+        flower_image = get_flower_image(flower_data['flower'])
+        
+        # Save achievement
+        save_achievement(user_id, flower_title, flower_image, level)
     
-    # Get quiz statistics
-    conn = sqlite3.connect('green_world.db')
-    conn.row_factory = sqlite3.Row
-    quiz_stats = conn.execute('''
-        SELECT level, COUNT(*) as attempts, AVG(score) as avg_score, MAX(score) as best_score
-        FROM quiz_attempts 
-        WHERE user_id = ? 
-        GROUP BY level
-    ''', (session['user_id'],)).fetchall()
-    conn.close()
+    # Clear quiz session data
+    for key in ['quiz_questions', 'quiz_level', 'quiz_score', 'current_question']:
+        session.pop(key, None)
     
-    if not user_achievements and not quiz_stats:
-        empty_template = '''
+    return templates.render('quiz_results.html', level=level, colors=QUIZ_LEVEL_COLORS[level], score=score,
+                            total_questions=total_questions, reward_earned=reward_earned,
+                            flower_title=flower_title, flower_image=flower_image)
+
+ACHIEVEMENTS_EMPTY_TEMPLATE = templates.register('achievements_empty.html', '''
         <!DOCTYPE html>
         <html>
         <head>
@@ -4923,71 +4815,24 @@ def achievements():
             </div>
         </body>
         </html>
-        '''
-        return render_template_string(empty_template)
-    
-    # Generate achievement cards
-    achievement_cards = []
-    for achievement in user_achievements:
-        achievement_cards.append(f'''
-        <div class="achievement-card">
-            <div class="achievement-image">
-                <img src="{achievement['flower_image_url']}" alt="{achievement['flower_title']}">
-            </div>
-            <div class="achievement-content">
-                <h3 class="achievement-title">🌸 {achievement['flower_title']} 🌸</h3>
-                <p class="achievement-level">Earned from {achievement['level'].title()} Level Quiz</p>
-                <p class="achievement-date">📅 {achievement['earned_at'].split()[0]}</p>
-            </div>
-        </div>
-        ''')
-    
-    # Generate stats cards
-    stats_cards = []
-    for stat in quiz_stats:
-        level_colors = {
-            'simple': '#28a745',
-            'hard': '#ffc107', 
-            'hardest': '#dc3545'
-        }
-        color = level_colors.get(stat['level'], '#6c757d')
-        
-        stats_cards.append(f'''
-        <div class="stat-card" style="border-left: 5px solid {color};">
-            <h4 style="color: {color};">{stat['level'].title()} Level</h4>
-            <div class="stat-grid">
-                <div class="stat-item">
-                    <span class="stat-number">{stat['attempts']}</span>
-                    <span class="stat-label">Attempts</span>
-                </div>
-                <div class="stat-item">
-                    <span class="stat-number">{int(stat['avg_score'])}</span>
-                    <span class="stat-label">Avg Score</span>
-                </div>
-                <div class="stat-item">
-                    <span class="stat-number">{stat['best_score']}</span>
-                    <span class="stat-label">Best Score</span>
-                </div>
-            </div>
-        </div>
-        ''')
-    
-    achievements_template = f'''
+''')
+
+ACHIEVEMENTS_TEMPLATE = templates.register('achievements.html', '''
     <!DOCTYPE html>
     <html>
     <head>
         <title>🏆 My Achievements - Flower Collection</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
                 background: linear-gradient(135deg, #6f42c1 0%, #e83e8c 100%); 
                 min-height: 100vh; 
                 color: #333;
-            }}
-            .container {{ max-width: 1400px; margin: 0 auto; padding: 20px; }}
-            .header {{ 
+            }
+            .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
+            .header { 
                 text-align: center; 
                 color: white; 
                 margin-bottom: 50px; 
@@ -4995,109 +4840,109 @@ def achievements():
                 background: rgba(255,255,255,0.1);
                 border-radius: 25px;
                 backdrop-filter: blur(10px);
-            }}
-            .header h1 {{ 
+            }
+            .header h1 { 
                 font-size: 3.5rem; 
                 margin-bottom: 20px; 
                 text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            }}
-            .header p {{ 
+            }
+            .header p { 
                 font-size: 1.3rem; 
                 opacity: 0.9; 
-            }}
-            .section {{ 
+            }
+            .section { 
                 margin-bottom: 50px; 
-            }}
-            .section h2 {{ 
+            }
+            .section h2 { 
                 color: white; 
                 font-size: 2.5rem; 
                 margin-bottom: 30px; 
                 text-align: center;
                 text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            }}
-            .achievements-grid {{ 
+            }
+            .achievements-grid { 
                 display: grid; 
                 grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); 
                 gap: 30px; 
-            }}
-            .achievement-card {{ 
+            }
+            .achievement-card { 
                 background: white; 
                 border-radius: 25px; 
                 overflow: hidden; 
                 box-shadow: 0 15px 35px rgba(0,0,0,0.2); 
                 transition: transform 0.3s ease;
-            }}
-            .achievement-card:hover {{ 
+            }
+            .achievement-card:hover { 
                 transform: translateY(-10px); 
-            }}
-            .achievement-image {{ 
+            }
+            .achievement-image { 
                 height: 250px; 
                 overflow: hidden; 
-            }}
-            .achievement-image img {{ 
+            }
+            .achievement-image img { 
                 width: 100%; 
                 height: 100%; 
                 object-fit: cover; 
-            }}
-            .achievement-content {{ 
+            }
+            .achievement-content { 
                 padding: 30px; 
                 text-align: center; 
-            }}
-            .achievement-title {{ 
+            }
+            .achievement-title { 
                 font-size: 1.8rem; 
                 color: #6f42c1; 
                 margin-bottom: 15px; 
                 font-weight: bold;
-            }}
-            .achievement-level {{ 
+            }
+            .achievement-level { 
                 color: #666; 
                 margin-bottom: 10px; 
                 font-size: 1.1rem;
-            }}
-            .achievement-date {{ 
+            }
+            .achievement-date { 
                 color: #999; 
                 font-size: 0.9rem; 
-            }}
-            .stats-grid {{ 
+            }
+            .stats-grid { 
                 display: grid; 
                 grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); 
                 gap: 25px; 
-            }}
-            .stat-card {{ 
+            }
+            .stat-card { 
                 background: white; 
                 border-radius: 20px; 
                 padding: 30px; 
                 box-shadow: 0 10px 25px rgba(0,0,0,0.1);
                 transition: transform 0.3s ease;
-            }}
-            .stat-card:hover {{
+            }
+            .stat-card:hover {
                 transform: translateY(-5px);
-            }}
-            .stat-card h4 {{ 
+            }
+            .stat-card h4 { 
                 font-size: 1.5rem; 
                 margin-bottom: 20px; 
-            }}
-            .stat-grid {{ 
+            }
+            .stat-grid { 
                 display: grid; 
                 grid-template-columns: repeat(3, 1fr); 
                 gap: 20px; 
-            }}
-            .stat-item {{ 
+            }
+            .stat-item { 
                 text-align: center; 
-            }}
-            .stat-number {{ 
+            }
+            .stat-number { 
                 display: block; 
                 font-size: 2rem; 
                 font-weight: bold; 
                 color: #333;
-            }}
-            .stat-label {{ 
+            }
+            .stat-label { 
                 display: block; 
                 font-size: 0.9rem; 
                 color: #666; 
                 margin-top: 5px;
-            }}
-            .btn {{ 
+            }
+            .btn { 
                 background: linear-gradient(135deg, #6f42c1 0%, #e83e8c 100%); 
                 color: white; 
                 padding: 18px 35px; 
@@ -5109,18 +4954,18 @@ def achievements():
                 font-size: 1.1rem;
                 transition: all 0.3s ease;
                 box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-            }}
-            .btn:hover {{ 
+            }
+            .btn:hover { 
                 transform: translateY(-3px); 
                 box-shadow: 0 12px 30px rgba(0,0,0,0.4);
-            }}
-            .btn-secondary {{
+            }
+            .btn-secondary {
                 background: linear-gradient(135deg, #6c757d 0%, #495057 100%);
-            }}
-            .nav-section {{
+            }
+            .nav-section {
                 text-align: center;
                 margin-top: 50px;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -5130,23 +4975,53 @@ def achievements():
                 <p>Your beautiful flower collection and quiz statistics</p>
             </div>
             
-            {f'''
+            {% if has_achievements %}
             <div class="section">
                 <h2>🌸 Flower Titles Collection</h2>
                 <div class="achievements-grid">
-                    {''.join(achievement_cards)}
+                    {% for achievement in user_achievements %}
+        <div class="achievement-card">
+            <div class="achievement-image">
+                <img src="{{ achievement['flower_image_url'] }}" alt="{{ achievement['flower_title'] }}">
+            </div>
+            <div class="achievement-content">
+                <h3 class="achievement-title">🌸 {{ achievement['flower_title'] }} 🌸</h3>
+                <p class="achievement-level">Earned from {{ achievement['level'].title() }} Level Quiz</p>
+                <p class="achievement-date">📅 {{ achievement['earned_at'].split()[0] }}</p>
+            </div>
+        </div>
+                    {% endfor %}
                 </div>
             </div>
-            ''' if achievement_cards else ''}
+            {% endif %}
             
-            {f'''
+            {% if quiz_stats %}
             <div class="section">
                 <h2>📊 Quiz Statistics</h2>
                 <div class="stats-grid">
-                    {''.join(stats_cards)}
+                    {% for stat in quiz_stats %}
+                    {% set color = {'simple': '#28a745', 'hard': '#ffc107', 'hardest': '#dc3545'}.get(stat['level'], '#6c757d') %}
+        <div class="stat-card" style="border-left: 5px solid {{ color }};">
+            <h4 style="color: {{ color }};">{{ stat['level'].title() }} Level</h4>
+            <div class="stat-grid">
+                <div class="stat-item">
+                    <span class="stat-number">{{ stat['attempts'] }}</span>
+                    <span class="stat-label">Attempts</span>
+                </div>
+                <div class="stat-item">
+                    <span class="stat-number">{{ stat['avg_score']|int }}</span>
+                    <span class="stat-label">Avg Score</span>
+                </div>
+                <div class="stat-item">
+                    <span class="stat-number">{{ stat['best_score'] }}</span>
+                    <span class="stat-label">Best Score</span>
+                </div>
+            </div>
+        </div>
+                    {% endfor %}
                 </div>
             </div>
-            ''' if stats_cards else ''}
+            {% endif %}
             
             <div class="nav-section">
                 <a href="/quiz" class="btn">🧠 Take More Quizzes</a>
@@ -5155,33 +5030,40 @@ def achievements():
         </div>
     </body>
     </html>
-    '''
-    
-    return render_template_string(achievements_template)
+    ''')
 
-# Social Media Routes
-@app.route('/social-feed')
-def social_feed():
+@app.route('/achievements')
+def achievements():
     if 'user_id' not in session:
         return redirect(url_for('login'))
+    
+    user_id = session['user_id']
+    conn = get_db()
+    has_achievements = conn.execute('''
+        SELECT 1 FROM user_achievements WHERE user_id = ? LIMIT 1
+    ''', (user_id,)).fetchone() is not None
+    
+    # Get quiz statistics
+    quiz_stats = conn.execute('''
+        SELECT level, COUNT(*) as attempts, AVG(score) as avg_score, MAX(score) as best_score
+        FROM quiz_attempts 
+        WHERE user_id = ? 
+        GROUP BY level
+    ''', (user_id,)).fetchall()
+    
+    if not has_achievements and not quiz_stats:
+        return templates.render('achievements_empty.html')
+    
+    return templates.stream('achievements.html', has_achievements=has_achievements, quiz_stats=quiz_stats,
+                            user_achievements=iter_user_achievements(user_id))
 
-    # Create sample data if it doesn't exist
-    create_sample_data()
-
-    posts = get_social_feed(session['user_id'])
-    print(f"🔍 DEBUG: Found {len(posts)} posts for social feed")
-    for post in posts:
-        print(f"📝 Post: {post['title'] if post['title'] else 'No title'} by {post['first_name'] if post['first_name'] else 'Unknown'}")
-
-    social_template = '''
+# Social Media Routes
+SOCIAL_FEED_TEMPLATE = templates.register('social_feed.html', '''
     <!DOCTYPE html>
     <html>
     <head>
         <title>🌱 Green World Social Feed - Modern Professional UI</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-        <meta http-equiv="Pragma" content="no-cache">
-        <meta http-equiv="Expires" content="0">
         <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
         <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js"></script>
         <style>
@@ -6081,7 +5963,7 @@ def social_feed():
                 <!-- Posts Feed -->
                 <div id="postsContainer">
                     {% for post in posts %}
-                    <div class="post-card">
+                    <div class="post-card" data-post-id="{{ post.id }}">
                         <!-- Post Header -->
                         <div class="post-header">
                             <div class="user-avatar">{{ post.first_name[0] if post.first_name else 'U' }}{{ post.last_name[0] if post.last_name else '' }}</div>
@@ -6116,7 +5998,7 @@ def social_feed():
                                 <span style="color: #1877f2;">👍</span>
                                 <span style="color: #e41e3f;">❤️</span>
                                 <span style="color: #f7b928;">😮</span>
-                                {{ post.likes_count or 0 }}
+                                <span class="like-count">{{ post.likes_count or 0 }}</span>
                             </div>
                             <div>
                                 {{ post.comments_count or 0 }} comments • {{ (post.likes_count or 0) + 5 }} shares
@@ -6151,6 +6033,12 @@ def social_feed():
                     </div>
                     {% endfor %}
                 </div>
+
+                {% if next_cursor %}
+                <div style="text-align: center; margin: 20px 0;">
+                    <button id="loadMoreBtn" data-cursor="{{ next_cursor }}" onclick="loadMorePosts()" style="background: #1877f2; color: white; border: none; padding: 10px 28px; border-radius: 6px; font-weight: 600; cursor: pointer;">Load more posts</button>
+                </div>
+                {% endif %}
             </div>
 
             <!-- Right Sidebar -->
@@ -6255,8 +6143,9 @@ def social_feed():
         <script>
             const socket = io();
 
-            // Join social feed room
+            // Join social feed room, and the rooms of the posts on screen
             socket.emit('join_feed');
+            socket.emit('watch_posts', Array.from(document.querySelectorAll('.post-card[data-post-id]'), card => card.dataset.postId));
 
             // Real-time Environmental Data for Faridabad
             function updateEnvironmentalData() {
@@ -6410,6 +6299,59 @@ def social_feed():
                 location.reload();
             }
 
+            function escapeHtml(text) {
+                const div = document.createElement('div');
+                div.textContent = text == null ? '' : String(text);
+                return div.innerHTML;
+            }
+
+            // Append the next cursor page from /api/feed below the current posts
+            function loadMorePosts() {
+                const btn = document.getElementById('loadMoreBtn');
+                if (!btn || !btn.dataset.cursor) return;
+                btn.disabled = true;
+                fetch('/api/feed?cursor=' + encodeURIComponent(btn.dataset.cursor))
+                    .then(response => response.json())
+                    .then(data => {
+                        if (!data.success) return;
+                        const container = document.getElementById('postsContainer');
+                        data.posts.forEach(post => {
+                            const initials = (post.first_name || 'U')[0] + (post.last_name || '').slice(0, 1);
+                            container.insertAdjacentHTML('beforeend', `
+                                <div class="post-card" data-post-id="${escapeHtml(post.id)}">
+                                    <div class="post-header">
+                                        <div class="user-avatar">${escapeHtml(initials)}</div>
+                                        <div class="user-info">
+                                            <div class="user-name">${escapeHtml(post.first_name || 'User')} ${escapeHtml(post.last_name || '')}</div>
+                                            <div class="post-time">${escapeHtml(post.created_at)} • 🌍 Public</div>
+                                        </div>
+                                    </div>
+                                    <div class="post-content-area">
+                                        ${post.title ? `<div class="post-title">${escapeHtml(post.title)}</div>` : ''}
+                                        <div class="post-content">${escapeHtml(post.content)}</div>
+                                        ${post.tags ? `<div class="post-tags">${escapeHtml(post.tags)}</div>` : ''}
+                                    </div>
+                                    ${post.image_url ? `<img src="${escapeHtml(post.image_url)}" alt="Plant photo" class="post-image">` : ''}
+                                    <div class="post-stats">
+                                        <div>👍 ❤️ <span class="like-count">${post.likes_count || 0}</span></div>
+                                        <div>${post.comments_count || 0} comments</div>
+                                    </div>
+                                    <div class="post-actions">
+                                        <button class="action-btn" onclick="likePost('${escapeHtml(post.id)}')"><span style="font-size: 18px;">👍</span> Like</button>
+                                    </div>
+                                </div>`);
+                        });
+                        socket.emit('watch_posts', data.posts.map(post => post.id));
+                        if (data.next_cursor) {
+                            btn.dataset.cursor = data.next_cursor;
+                            btn.disabled = false;
+                        } else {
+                            btn.parentElement.remove();
+                        }
+                    })
+                    .catch(() => { btn.disabled = false; });
+            }
+
             function updateLikeCount(postId, count) {
                 const likeBtn = document.querySelector(`[data-post-id="${postId}"] .like-count`);
                 if (likeBtn) {
@@ -6651,9 +6593,15 @@ def social_feed():
         </script>
     </body>
     </html>
-    '''
+''')
+
+@app.route('/social-feed')
+def social_feed():
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
 
-    return render_template_string(social_template)
+    posts, next_cursor = get_social_feed(session['user_id'])
+    return templates.render('social_feed.html', posts=posts, next_cursor=next_cursor)
 
 @app.route('/plant-search', methods=['GET', 'POST'])
 def plant_search():
@@ -6674,18 +6622,18 @@ def plant_search():
                         except Exception as e:
                             print(f"⚠️ Error saving search: {e}")
 
-                    return render_template_string(PLANT_SEARCH_RESULTS_TEMPLATE, plant=plant_info, query=plant_name)
+                    return templates.render('plant_search_results.html', plant=plant_info, query=plant_name)
                 else:
                     print(f"❌ No plant info found for: {plant_name}")
-                    return render_template_string(PLANT_SEARCH_RESULTS_TEMPLATE, plant=None, query=plant_name)
+                    return templates.render('plant_search_results.html', plant=None, query=plant_name)
             else:
                 print("⚠️ Empty plant name provided")
-                return render_template_string(PLANT_SEARCH_TEMPLATE)
+                return templates.render('plant_search.html')
 
-        return render_template_string(PLANT_SEARCH_TEMPLATE)
+        return templates.render('plant_search.html')
     except Exception as e:
         print(f"🚨 Error in plant search: {e}")
-        return render_template_string(PLANT_SEARCH_TEMPLATE)
+        return templates.render('plant_search.html')
 
 @app.route('/profile', methods=['GET', 'POST'])
 def profile():
@@ -6701,13 +6649,12 @@ def profile():
         website = request.form.get('website')
         phone = request.form.get('phone')
 
-        conn = sqlite3.connect('green_world.db')
+        conn = get_db()
         conn.execute('''
             UPDATE users SET first_name = ?, last_name = ?, bio = ?, location = ?, website = ?, phone = ?
             WHERE id = ?
         ''', (first_name, last_name, bio, location, website, phone, session['user_id']))
         conn.commit()
-        conn.close()
 
         # Update session
         session['first_name'] = first_name
@@ -6715,12 +6662,10 @@ def profile():
         return redirect(url_for('profile'))
 
     # Get current user data
-    conn = sqlite3.connect('green_world.db')
-    conn.row_factory = sqlite3.Row
+    conn = get_db()
     user = conn.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],)).fetchone()
-    conn.close()
 
-    return render_template_string(PROFILE_TEMPLATE, user=dict(user))
+    return templates.render('profile.html', user=dict(user))
 
 @app.route('/feed')
 def feed():
@@ -6732,6 +6677,51 @@ def api_weather():
     """API endpoint for real-time weather updates"""
     return jsonify(get_haryana_weather())
 
+@app.route('/api/plants/suggest')
+def api_plant_suggest():
+    """Plant name completions for the search box, most searched first; cheap enough for every keystroke"""
+    try:
+        limit = int(request.args.get('limit', plant_suggest.DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid limit'}), 400
+
+    query = request.args.get('q', '')
+    response = jsonify({'success': True, 'query': query, 'suggestions': plant_suggestions.suggest(query, limit)})
+    # The same for every user until the next re-rank, so browsers may reuse it briefly
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+@app.route('/api/db/stats')
+def api_db_stats():
+    """Pool, feed cache, like buffer, real-time dispatcher, asset, compression, upload, blob store, thumbnail, analysis job, analysis cache, plant suggestion and search rollup statistics for monitoring"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'})
+    
+    return jsonify({'success': True, 'pool': pool_stats(), 'feed_cache': feed_cache.stats(),
+                    'likes': engagement.likes.stats(),
+                    'realtime': events.stats(), 'assets': assets.stats(),
+                    'compression': compression.stats(), 'uploads': image_uploads.stats(),
+                    'blobs': blobs.stats(), 'thumbnails': thumbnails.stats(),
+                    'analysis_jobs': analysis_queue.stats(), 'analysis_cache': analysis_cache.stats(),
+                    'plant_suggest': plant_suggestions.stats(), 'search_rollups': search_analytics.stats()})
+
+@app.route('/api/feed')
+def api_feed():
+    """Cursor-paginated feed: pass back next_cursor to get the following page"""
+    cursor = request.args.get('cursor') or None
+    try:
+        limit = int(request.args.get('limit', FEED_PAGE_SIZE))
+        posts, next_cursor = get_social_feed(session.get('user_id'), limit=limit, cursor=cursor)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor or limit'}), 400
+
+    return jsonify({
+        'success': True,
+        'posts': [dict(post) for post in posts],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    })
+
 @app.route('/api/create-post', methods=['POST'])
 def api_create_post():
     if 'user_id' not in session:
@@ -6777,6 +6767,24 @@ def api_add_comment():
     comment_id = add_comment(session['user_id'], post_id, content)
     return jsonify({'success': True, 'comment_id': comment_id})
 
+@app.route('/api/follow', methods=['POST'])
+def api_follow():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'})
+
+    data = request.get_json()
+    user_id = data.get('user_id')
+
+    if not user_id or user_id == session['user_id']:
+        return jsonify({'success': False, 'error': 'A different user ID is required'})
+
+    if data.get('action') == 'unfollow':
+        changed = unfollow_user(session['user_id'], user_id)
+        return jsonify({'success': True, 'following': False, 'changed': changed})
+
+    changed = follow_user(session['user_id'], user_id)
+    return jsonify({'success': True, 'following': True, 'changed': changed})
+
 # Quiz API Routes
 @app.route('/api/quiz/start', methods=['POST'])
 def api_start_quiz():
@@ -6876,8 +6884,7 @@ def api_submit_quiz():
 
 @app.route('/api/quiz/leaderboard')
 def api_quiz_leaderboard():
-    conn = sqlite3.connect('green_world.db')
-    conn.row_factory = sqlite3.Row
+    conn = get_db()
 
     leaderboard = conn.execute('''
         SELECT u.username, u.first_name, u.last_name,
@@ -6890,8 +6897,6 @@ def api_quiz_leaderboard():
         LIMIT 50
     ''').fetchall()
 
-    conn.close()
-
     return jsonify({
         'success': True,
         'leaderboard': [dict(row) for row in leaderboard]
@@ -6900,38 +6905,152 @@ def api_quiz_leaderboard():
 # Enhanced Plant Analysis API
 @app.route('/api/plant/analyze', methods=['POST'])
 def api_analyze_plant():
+    """Queue an analysis (optionally of a multipart plant_image) and return 202 with its status URL"""
     if 'user_id' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'})
 
-    # For demo purposes, we'll simulate the analysis
-    # In production, this would process the uploaded image
-    analysis_data = generate_plant_analysis()
+    digest = None
+    if request.mimetype == 'multipart/form-data':
+        try:
+            _, upload = image_uploads.stream_upload(request, 'plant_image', app.config['UPLOAD_FOLDER'],
+                                                    max_bytes=app.config['MAX_CONTENT_LENGTH'])
+        except HTTPException as e:
+            return jsonify({'success': False, 'error': e.description}), e.code
+        if upload is not None:
+            digest = blobs.put_file(upload.path, upload.sha256)
+            thumbnails.submit(digest)
+
+    image_url = url_for('blob', digest=digest) if digest else 'demo_image.jpg'
+    try:
+        analysis_id = enqueue_plant_analysis(session['user_id'], image_url, digest)
+    except QueueFull as e:
+        response = jsonify({'success': False, 'error': 'Analysis queue is full', 'retry_after': e.retry_after})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+
+    # Results arrive via the status URL or an 'analysis_complete' event in the user's room
+    return jsonify({
+        'success': True,
+        'analysis_id': analysis_id,
+        'status': 'queued',
+        'status_url': url_for('api_analysis_status', analysis_id=analysis_id)
+    }), 202
+
+@app.route('/api/plant/analyze/<analysis_id>')
+def api_analysis_status(analysis_id):
+    """Status of a queued analysis, its per-stage timings, and the analysis once completed"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'})
 
-    # Save analysis to database
-    analysis_id = save_plant_analysis(session['user_id'], 'demo_image.jpg', analysis_data)
+    row = get_user_analysis(analysis_id, session['user_id'])
+    if row is None:
+        return jsonify({'success': False, 'error': 'Analysis not found'}), 404
+
+    result = {'success': True, 'analysis_id': analysis_id, 'status': row['analysis_status']}
+    job = analysis_queue.get(analysis_id)
+    if job is not None:
+        result['timings_ms'] = job.to_dict()['timings_ms']
+    if row['analysis_status'] == 'completed':
+        result['analysis'] = load_analysis_lists(dict(row))
+    return jsonify(result)
+
+@app.route('/api/plant/analyze/batch', methods=['POST'])
+def api_analyze_plant_batch():
+    """Analyze every plant_images file of one multipart request: per-image results plus a summary"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'})
 
-    # Create notification for urgent cases
-    if analysis_data['urgency_level'] == 'High':
+    started = time.perf_counter()
+    limit = app.config['ANALYSIS_BATCH_SIZE']
+    try:
+        # One file past the limit is enough to know the batch is too big
+        _, uploads = image_uploads.stream_uploads(request, 'plant_images', app.config['UPLOAD_FOLDER'],
+                                                  max_bytes=app.config['MAX_CONTENT_LENGTH'],
+                                                  max_files=limit + 1)
+    except HTTPException as e:
+        return jsonify({'success': False, 'error': e.description}), e.code
+    if not uploads:
+        return jsonify({'success': False, 'error': 'No plant_images uploaded'}), 400
+    if len(uploads) > limit:
+        for upload in uploads:
+            os.remove(upload.path)
+        return jsonify({'success': False, 'error': f'At most {limit} images per batch'}), 413
+
+    digests = [blobs.put_file(upload.path, upload.sha256) for upload in uploads]
+    for digest in set(digests):
+        thumbnails.submit(digest)
+    uploaded = time.perf_counter()
+
+    # Photos scored before come from the cache; the rest (each distinct photo
+    # once) are spread over the analysis worker processes
+    conn = get_db()
+    measured = {digest: analysis_cache.get(conn, digest) for digest in dict.fromkeys(digests)}
+    cached = {digest for digest, result in measured.items() if result is not None}
+    pending = [digest for digest, result in measured.items() if result is None]
+    if pending and plant_health.available():
+        try:
+            results = analysis_queue.run_batch(plant_health.analyze_image,
+                                               [(blobs.path(digest),) for digest in pending])
+        except QueueFull as e:
+            response = jsonify({'success': False, 'error': 'Analysis queue is full', 'retry_after': e.retry_after})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
+        for digest, (result, error) in zip(pending, results):
+            if error is not None:
+                print(f"⚠️ Image analysis failed, using simulated scores: {error}")
+            else:
+                analysis_cache.put(conn, digest, result)
+                measured[digest] = result
+    analyses = [generate_plant_analysis(seed=digest, measured=measured[digest]) for digest in digests]
+    analyzed = time.perf_counter()
+
+    # Every row in a single transaction
+    image_urls = [url_for('blob', digest=digest) for digest in digests]
+    analysis_ids = save_plant_analyses(session['user_id'], list(zip(image_urls, analyses)))
+    saved = time.perf_counter()
+
+    # One notification for the whole batch rather than one per urgent plant
+    urgent_ids = [analysis_id for analysis_id, analysis in zip(analysis_ids, analyses)
+                  if analysis['urgency_level'] == 'High']
+    if urgent_ids:
         create_notification(
             session['user_id'],
             'plant_alert',
-            '🚨 Plant Needs Attention!',
-            f'Your {analysis_data["plant_name"]} requires immediate care.',
-            {'analysis_id': analysis_id, 'urgency': 'high'}
+            '🚨 Plants Need Attention!',
+            f'{len(urgent_ids)} of the {len(analyses)} plants you analyzed require immediate care.',
+            {'analysis_ids': urgent_ids, 'urgency': 'high'}
         )
 
+    count = len(analyses)
+    total = saved - started
     return jsonify({
         'success': True,
-        'analysis': analysis_data,
-        'analysis_id': analysis_id
+        'results': [{'analysis_id': analysis_id, 'image_url': image_url, 'cached': digest in cached,
+                     'analysis': analysis}
+                    for analysis_id, image_url, digest, analysis in zip(analysis_ids, image_urls, digests, analyses)],
+        'summary': {
+            'images': count,
+            'cached': sum(digest in cached for digest in digests),
+            'urgency': {level: sum(analysis['urgency_level'] == level for analysis in analyses)
+                        for level in ('Low', 'Medium', 'High')},
+            'average_health_score': round(sum(a['overall_health_score'] for a in analyses) / count, 3),
+            'average_dehydration_score': round(sum(a['dehydration_score'] for a in analyses) / count, 3),
+            'average_stress_score': round(sum(a['stress_score'] for a in analyses) / count, 3),
+            'average_sunlight_score': round(sum(a['sunlight_score'] for a in analyses) / count, 3),
+        },
+        'timings_ms': {
+            'upload': round((uploaded - started) * 1000, 2),
+            'analyze': round((analyzed - uploaded) * 1000, 2),
+            'save': round((saved - analyzed) * 1000, 2),
+            'total': round(total * 1000, 2),
+        },
+        'images_per_second': round(count / total, 1) if total else None
     })
 
 # Authentication Routes
-@app.route('/')
-def home():
-    if 'user_id' in session:
-        return redirect(url_for('dashboard'))
-    return render_template_string('''
+LANDING_TEMPLATE = templates.register('landing.html', '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -7093,32 +7212,15 @@ def home():
         </div>
     </body>
     </html>
-    ''')
-
-@app.route('/login', methods=['GET', 'POST'])
-def login():
-    if request.method == 'POST':
-        email = request.form.get('email')
-        password = request.form.get('password')
-
-        if not email or not password:
-            flash('Please fill in all fields')
-            return redirect(url_for('login'))
+''')
 
-        conn = sqlite3.connect('green_world.db')
-        conn.row_factory = sqlite3.Row
-        user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
-        conn.close()
-
-        if user and check_password_hash(user['password_hash'], password):
-            session['user_id'] = user['id']
-            session['username'] = user['username']
-            session['first_name'] = user['first_name']
-            return redirect(url_for('social_feed'))
-        else:
-            flash('Invalid email or password')
+@app.route('/')
+def home():
+    if 'user_id' in session:
+        return redirect(url_for('dashboard'))
+    return templates.render('landing.html')
 
-    return render_template_string('''
+LOGIN_TEMPLATE = templates.register('login.html', '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -7372,60 +7474,32 @@ def login():
         </script>
     </body>
     </html>
-    ''')
+''')
 
-@app.route('/signup', methods=['GET', 'POST'])
-def signup():
+@app.route('/login', methods=['GET', 'POST'])
+def login():
     if request.method == 'POST':
         email = request.form.get('email')
-        username = request.form.get('username')
-        first_name = request.form.get('first_name')
-        last_name = request.form.get('last_name')
         password = request.form.get('password')
-        confirm_password = request.form.get('confirm_password')
 
-        if not all([email, username, first_name, last_name, password, confirm_password]):
+        if not email or not password:
             flash('Please fill in all fields')
-            return redirect(url_for('signup'))
-
-        if password != confirm_password:
-            flash('Passwords do not match')
-            return redirect(url_for('signup'))
-
-        if len(password) < 6:
-            flash('Password must be at least 6 characters long')
-            return redirect(url_for('signup'))
-
-        conn = sqlite3.connect('green_world.db')
-
-        # Check if email or username already exists
-        existing_user = conn.execute('SELECT * FROM users WHERE email = ? OR username = ?', (email, username)).fetchone()
-        if existing_user:
-            flash('Email or username already exists')
-            conn.close()
-            return redirect(url_for('signup'))
-
-        # Create new user
-        user_id = str(uuid.uuid4())
-        password_hash = generate_password_hash(password)
-
-        conn.execute('''
-            INSERT INTO users (id, email, username, first_name, last_name, password_hash)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (user_id, email, username, first_name, last_name, password_hash))
+            return redirect(url_for('login'))
 
-        conn.commit()
-        conn.close()
+        conn = get_db()
+        user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
 
-        # Auto login after signup
-        session['user_id'] = user_id
-        session['username'] = username
-        session['first_name'] = first_name
+        if user and check_password_hash(user['password_hash'], password):
+            session['user_id'] = user['id']
+            session['username'] = user['username']
+            session['first_name'] = user['first_name']
+            return redirect(url_for('social_feed'))
+        else:
+            flash('Invalid email or password')
 
-        flash('Account created successfully! Welcome to Green World!')
-        return redirect(url_for('social_feed'))
+    return templates.render('login.html')
 
-    return render_template_string('''
+SIGNUP_TEMPLATE = templates.register('signup.html', '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -7592,7 +7666,58 @@ def signup():
         </div>
     </body>
     </html>
-    ''')
+''')
+
+@app.route('/signup', methods=['GET', 'POST'])
+def signup():
+    if request.method == 'POST':
+        email = request.form.get('email')
+        username = request.form.get('username')
+        first_name = request.form.get('first_name')
+        last_name = request.form.get('last_name')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+
+        if not all([email, username, first_name, last_name, password, confirm_password]):
+            flash('Please fill in all fields')
+            return redirect(url_for('signup'))
+
+        if password != confirm_password:
+            flash('Passwords do not match')
+            return redirect(url_for('signup'))
+
+        if len(password) < 6:
+            flash('Password must be at least 6 characters long')
+            return redirect(url_for('signup'))
+
+        conn = get_db()
+
+        # Check if email or username already exists
+        existing_user = conn.execute('SELECT * FROM users WHERE email = ? OR username = ?', (email, username)).fetchone()
+        if existing_user:
+            flash('Email or username already exists')
+            return redirect(url_for('signup'))
+
+        # Create new user
+        user_id = str(uuid.uuid4())
+        password_hash = generate_password_hash(password)
+
+        conn.execute('''
+            INSERT INTO users (id, email, username, first_name, last_name, password_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (user_id, email, username, first_name, last_name, password_hash))
+
+        conn.commit()
+
+        # Auto login after signup
+        session['user_id'] = user_id
+        session['username'] = username
+        session['first_name'] = first_name
+
+        flash('Account created successfully! Welcome to Green World!')
+        return redirect(url_for('social_feed'))
+
+    return templates.render('signup.html')
 
 @app.route('/logout')
 def logout():
@@ -7600,12 +7725,7 @@ def logout():
     flash('You have been logged out successfully')
     return redirect(url_for('home'))
 
-@app.route('/dashboard')
-def dashboard():
-    if 'user_id' not in session:
-        return redirect(url_for('login'))
-
-    return render_template_string('''
+DASHBOARD_TEMPLATE = templates.register('dashboard.html', '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -7898,8 +8018,8 @@ def dashboard():
             // Initialize Socket.IO
             const socket = io();
 
-            // Join user room for notifications
-            socket.emit('join_room', '{{ session.user_id }}');
+            // Notifications arrive on the user room joined at connect; new posts on the feed room
+            socket.emit('join_feed');
 
             // Handle real-time posts
             socket.on('new_post', function(data) {
@@ -7908,7 +8028,7 @@ def dashboard():
             });
 
             // Handle notifications
-            socket.on('notification', function(data) {
+            socket.on('new_notification', function(data) {
                 showNotification(data.message);
             });
 
@@ -7983,15 +8103,21 @@ def dashboard():
         </script>
     </body>
     </html>
-    ''', session=session)
+''')
+
+@app.route('/dashboard')
+def dashboard():
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+
+    return templates.render('dashboard.html', session=session)
 
 if __name__ == '__main__':
     print("🌍 Starting GREEN WORLD - Real Social Media Platform!")
     print("🌱 YOUR ORIGINAL new_app.py IS NOW A COMPLETE SOCIAL MEDIA APP!")
     print("=" * 80)
-    init_db()
-    init_quiz_db()
-    create_sample_data()
+    bootstrap()
+    templates.warm()
     print("✅ Green World Social Database ready!")
     print("🚀 Starting real social media server...")
     print("=" * 80)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+🎨 GREEN WORLD - Static Asset Pipeline
+- Inline <style> and <script> blocks of registered templates become static files
+- File names carry a content hash, so a changed asset always gets a new URL
+- Assets are served with an immutable one-year Cache-Control and an ETag
+- Blocks containing Jinja syntax stay inline since they differ per request
+- Run directly to build every asset ahead of time: python assets.py
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+from flask import send_from_directory
+
+# Safe because a file name never points at different content
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+HASH_LENGTH = 12
+
+INLINE_BLOCK = re.compile(r'<(style|script)>(.*?)</\1>', re.DOTALL)
+JINJA_MARKERS = ('{{', '{%', '{#')
+EXTENSIONS = {'style': 'css', 'script': 'js'}
+
+
+class AssetPipeline:
+    """Moves static inline CSS/JS out of templates into fingerprinted files.
+
+    ``extract`` is applied to a template's source when it is first loaded,
+    so the HTML carries only a ``<link>`` or ``<script src>`` tag and the
+    browser keeps the asset itself cached across pages and visits.
+    Identical blocks in different templates share one file.
+    """
+
+    def __init__(self, app=None, output_dir=None, url_path='/assets'):
+        self.output_dir = output_dir
+        self.url_path = url_path
+        self.manifest = {}
+        self._files = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if self.output_dir is None:
+            self.output_dir = os.path.join(app.root_path, 'static', 'assets')
+        app.add_url_rule(f'{self.url_path}/<path:filename>', 'asset', self.serve)
+
+    def extract(self, name, source):
+        """Template source with its static inline blocks replaced by asset tags"""
+        stem = os.path.splitext(name)[0]
+        counts = {'style': 0, 'script': 0}
+
+        def replace(match):
+            kind, body = match.group(1), match.group(2)
+            if not body.strip() or any(marker in body for marker in JINJA_MARKERS):
+                return match.group(0)
+            counts[kind] += 1
+            suffix = f'-{counts[kind]}' if counts[kind] > 1 else ''
+            url = f'{self.url_path}/{self.write(stem + suffix, EXTENSIONS[kind], body)}'
+            if kind == 'style':
+                return f'<link rel="stylesheet" href="{url}">'
+            return f'<script src="{url}"></script>'
+
+        return INLINE_BLOCK.sub(replace, source)
+
+    def write(self, stem, extension, body):
+        """Store an asset under a content-hashed name and return that name"""
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        with self._lock:
+            filename = self._files.get((digest, extension))
+            if filename is not None:
+                return filename
+            filename = f'{stem}.{digest}.{extension}'
+            path = os.path.join(self.output_dir, filename)
+            if not os.path.exists(path):
+                os.makedirs(self.output_dir, exist_ok=True)
+                # Write then rename so a concurrent reader never sees half a file
+                temp_path = f'{path}.{os.getpid()}.tmp'
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            self._files[(digest, extension)] = filename
+            self.manifest[filename] = len(data)
+            return filename
+
+    def serve(self, filename):
+        response = send_from_directory(self.output_dir, filename, max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {'files': len(self.manifest), 'bytes': sum(self.manifest.values())}
+
+
+if __name__ == '__main__':
+    from app import assets, templates
+
+    templates.warm()
+    for filename, size in sorted(assets.manifest.items()):
+        print(f"   {filename:<44} {size:8d} bytes")
+    print(f"✅ {len(assets.manifest)} assets written to {assets.output_dir}")
@@ -0,0 +1,1178 @@
+#!/usr/bin/env python3
+"""
+⏱️ GREEN WORLD - Performance Benchmarks
+Self-contained micro-benchmarks for the hot paths; each one builds its own
+temporary database so nothing touches green_world.db.
+
+Usage:
+    python benchmarks.py            # run every benchmark
+    python benchmarks.py seeding    # run selected benchmarks
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from migrations import migrate
+from schema import MIGRATIONS, get_meta
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def measure(fn, repeat=200, warmup=10):
+    """Call fn repeatedly and return per-call timings in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'mean': statistics.fmean(samples),
+        'p50': samples[len(samples) // 2],
+        'p95': samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def report(label, timings):
+    print(f"   {label:<44} mean {timings['mean']:8.3f} ms   p50 {timings['p50']:8.3f} ms   p95 {timings['p95']:8.3f} ms")
+
+
+def temp_database(name='bench.db'):
+    """Fresh database with every schema migration applied"""
+    path = os.path.join(tempfile.mkdtemp(prefix='green_world_bench_'), name)
+    conn = sqlite3.connect(path)
+    migrate(conn, MIGRATIONS)
+    conn.close()
+    return path
+
+
+def insert_users(conn, count):
+    conn.executemany('''
+        INSERT INTO users (id, email, username, first_name, last_name, password_hash)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(str(uuid.uuid4()), f'user{i}@example.com', f'user{i}', 'Bench', f'User{i}', 'x') for i in range(count)])
+    conn.commit()
+
+
+@benchmark('seeding')
+def bench_seeding(users=20000):
+    """Per-request cost the old create_sample_data() call added to /social-feed"""
+    path = temp_database()
+    conn = sqlite3.connect(path)
+    insert_users(conn, users)
+    conn.close()
+
+    def legacy_check():
+        # What every /social-feed request used to do before rendering
+        conn = sqlite3.connect(path)
+        conn.execute('SELECT COUNT(*) FROM users WHERE email LIKE "%sample%"').fetchone()
+        conn.close()
+
+    marker_conn = sqlite3.connect(path)
+
+    def marker_check():
+        # What the one-shot bootstrap does instead, once per process start
+        get_meta(marker_conn, 'sample_data_seeded')
+
+    print(f"🌱 Seeding check with {users} users")
+    legacy = measure(legacy_check)
+    report('legacy per-request LIKE scan + connect', legacy)
+    report('bootstrap marker lookup (once at startup)', measure(marker_check))
+    print(f"   ➜ /social-feed now does no seeding work: saves ~{legacy['mean']:.3f} ms per request")
+    marker_conn.close()
+
+
+def insert_posts(conn, user_ids, count, start='2025-01-01 00:00:00'):
+    """Posts spread one minute apart, newest last, round-robin over user_ids"""
+    rows = []
+    for i in range(count):
+        rows.append((str(uuid.uuid4()), user_ids[i % len(user_ids)], f'Post {i}', f'Benchmark post {i}', i))
+    conn.executemany(f'''
+        INSERT INTO posts (id, user_id, title, content, created_at)
+        VALUES (?, ?, ?, ?, datetime('{start}', '+' || ? || ' minutes'))
+    ''', rows)
+    conn.commit()
+
+
+@benchmark('feed_pagination')
+def bench_feed_pagination(posts=100000, page_size=20):
+    """Keyset (cursor) paging vs OFFSET paging at increasing scroll depth"""
+    path = temp_database()
+    conn = sqlite3.connect(path)
+    insert_users(conn, 200)
+    user_ids = [row[0] for row in conn.execute('SELECT id FROM users')]
+    insert_posts(conn, user_ids, posts)
+
+    select = '''
+        SELECT p.*, u.username, u.first_name, u.last_name, u.profile_image, u.bio, u.location
+        FROM posts p
+        JOIN users u ON p.user_id = u.id
+    '''
+    print(f"📜 Feed paging over {posts} posts, {page_size} per page")
+    for depth in (0, 100, 1000, 4000):
+        offset = depth * page_size
+        boundary = conn.execute(
+            'SELECT created_at, id FROM posts ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?',
+            (max(offset - 1, 0),)).fetchone()
+
+        def offset_page():
+            conn.execute(select + ' ORDER BY p.created_at DESC, p.id DESC LIMIT ? OFFSET ?',
+                         (page_size, offset)).fetchall()
+
+        def keyset_page():
+            if depth == 0:
+                conn.execute(select + ' ORDER BY p.created_at DESC, p.id DESC LIMIT ?', (page_size,)).fetchall()
+            else:
+                conn.execute(select + ' WHERE (p.created_at, p.id) < (?, ?) ORDER BY p.created_at DESC, p.id DESC LIMIT ?',
+                             (boundary[0], boundary[1], page_size)).fetchall()
+
+        report(f'page {depth:>5}  OFFSET', measure(offset_page, repeat=50, warmup=3))
+        report(f'page {depth:>5}  cursor', measure(keyset_page, repeat=50, warmup=3))
+    conn.close()
+
+
+@benchmark('timeline')
+def bench_timeline(users=2000, followees=300, posts=100000, page_size=20):
+    """Followed-users feed: IN (followees) fan-out-on-read vs the materialized timeline"""
+    import timeline
+
+    path = temp_database()
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    insert_users(conn, users)
+    user_ids = [row[0] for row in conn.execute('SELECT id FROM users')]
+    reader = user_ids[0]
+    conn.executemany('INSERT INTO follows (id, follower_id, following_id) VALUES (?, ?, ?)',
+                     [(str(uuid.uuid4()), reader, followee) for followee in user_ids[1:followees + 1]])
+    insert_posts(conn, user_ids, posts)
+    timeline.rebuild(conn)
+    conn.commit()
+
+    def fan_out_on_read():
+        conn.execute(f'''
+            SELECT {timeline.FEED_COLUMNS}
+            FROM posts p
+            JOIN users u ON p.user_id = u.id
+            WHERE p.user_id = ? OR p.user_id IN (
+                SELECT following_id FROM follows WHERE follower_id = ?
+            )
+            ORDER BY p.created_at DESC, p.id DESC
+            LIMIT ?
+        ''', (reader, reader, page_size)).fetchall()
+
+    def timeline_read():
+        timeline.read_page(conn, reader, page_size)
+
+    print(f"📰 Home feed for a user following {followees} of {users} users, {posts} posts")
+    report('fan-out-on-read (IN subquery + sort)', measure(fan_out_on_read, repeat=50, warmup=3))
+    report('materialized timeline range scan', measure(timeline_read, repeat=50, warmup=3))
+
+    author = user_ids[1]
+    conn.executemany('INSERT INTO follows (id, follower_id, following_id) VALUES (?, ?, ?)',
+                     [(str(uuid.uuid4()), follower, author) for follower in user_ids[2:]])
+    conn.commit()
+
+    def write_post():
+        post_id = str(uuid.uuid4())
+        conn.execute('INSERT INTO posts (id, user_id, content) VALUES (?, ?, ?)', (post_id, author, 'x'))
+        timeline.fan_out_post(conn, post_id)
+        conn.commit()
+
+    report(f'create_post fan-out to {users - 2} followers', measure(write_post, repeat=20, warmup=2))
+    conn.close()
+
+
+@benchmark('feed_cache')
+def bench_feed_cache(posts=20000, page_size=20):
+    """Public/discovery first page: SQL every view vs a read-through cache hit"""
+    from feed_cache import FeedCache
+    from timeline import FEED_COLUMNS
+
+    path = temp_database()
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    insert_users(conn, 200)
+    user_ids = [row[0] for row in conn.execute('SELECT id FROM users')]
+    insert_posts(conn, user_ids, posts)
+
+    def load():
+        rows = conn.execute(f'''
+            SELECT {FEED_COLUMNS}
+            FROM posts p
+            JOIN users u ON p.user_id = u.id
+            ORDER BY p.created_at DESC, p.id DESC
+            LIMIT ?
+        ''', (page_size + 1,)).fetchall()
+        return [dict(row) for row in rows[:page_size]], None
+
+    cache = FeedCache()
+
+    def cached():
+        cache.get_or_load(('public', None, page_size), load)
+
+    print(f"🧊 Public feed first page over {posts} posts")
+    report('query per view', measure(load))
+    report('feed cache hit', measure(cached))
+    print(f"   ➜ {cache.stats()}")
+    conn.close()
+
+
+@benchmark('likes')
+def bench_likes(taps=5000, users=1000, posts=20, flush_every=250):
+    """like_post throughput: one transaction per tap vs the write-behind aggregator"""
+    import random
+
+    import database
+    from engagement import LikeAggregator
+
+    path = temp_database()
+    pool = database.configure(path)
+    pool.apply_storage_profile()
+    conn = pool.acquire()
+    insert_users(conn, users)
+    user_ids = [row[0] for row in conn.execute('SELECT id FROM users')]
+    insert_posts(conn, user_ids, posts)
+    post_ids = [row[0] for row in conn.execute('SELECT id FROM posts')]
+    rng = random.Random(7)
+    events = [(rng.choice(user_ids[:200]), rng.choice(post_ids)) for _ in range(taps)]
+
+    def legacy_like(user_id, post_id):
+        # What like_post did per tap before the aggregator
+        existing = conn.execute('SELECT id FROM likes WHERE user_id = ? AND post_id = ?', (user_id, post_id)).fetchone()
+        if existing:
+            conn.execute('DELETE FROM likes WHERE user_id = ? AND post_id = ?', (user_id, post_id))
+            conn.execute('UPDATE posts SET likes_count = likes_count - 1 WHERE id = ?', (post_id,))
+        else:
+            conn.execute('INSERT INTO likes (id, user_id, post_id) VALUES (?, ?, ?)', (str(uuid.uuid4()), user_id, post_id))
+            conn.execute('UPDATE posts SET likes_count = likes_count + 1 WHERE id = ?', (post_id,))
+        conn.commit()
+        return conn.execute('SELECT likes_count FROM posts WHERE id = ?', (post_id,)).fetchone()[0]
+
+    def total_likes():
+        return conn.execute('SELECT SUM(likes_count), (SELECT COUNT(*) FROM likes) FROM posts').fetchone()
+
+    print(f"💚 {taps} like taps from 200 users on {posts} posts")
+    started = time.perf_counter()
+    for user_id, post_id in events:
+        legacy_like(user_id, post_id)
+    legacy_s = time.perf_counter() - started
+    legacy_totals = total_likes()
+    print(f"   {'one transaction per tap':<44} {taps / legacy_s:10.0f} taps/s")
+
+    # Undo, then replay the same taps through the aggregator
+    conn.execute('DELETE FROM likes')
+    conn.execute('UPDATE posts SET likes_count = 0')
+    conn.commit()
+    aggregator = LikeAggregator(max_pending=10 ** 9)
+    started = time.perf_counter()
+    for i, (user_id, post_id) in enumerate(events, 1):
+        aggregator.toggle(conn, user_id, post_id)
+        if i % flush_every == 0:
+            aggregator.flush()
+    aggregator.flush()
+    buffered_s = time.perf_counter() - started
+    stats = aggregator.stats()
+    print(f"   {f'write-behind, flush every {flush_every} taps':<44} {taps / buffered_s:10.0f} taps/s")
+    print(f"   ➜ {stats['flushes']} flushes, {stats['deduped']} toggles cancelled in-window, "
+          f"{stats['rows_written']} rows written, last flush {stats['last_flush_ms']} ms")
+    print(f"   ➜ final (likes_count sum, likes rows): legacy {tuple(legacy_totals)} buffered {tuple(total_likes())}")
+    pool.release(conn)
+    pool.close_all()
+
+
+@benchmark('realtime')
+def bench_realtime(clients=500, watchers=10, burst=50):
+    """Socket.IO fan-out: emit to every client vs the post room, plus like-burst coalescing"""
+    from flask import Flask
+    from flask_socketio import SocketIO, join_room
+
+    from realtime import EventDispatcher, post_room
+
+    app = Flask(__name__)
+    socketio = SocketIO(app, async_mode='threading')
+
+    @socketio.on('watch')
+    def watch(post_id):
+        join_room(post_room(post_id))
+
+    connected = [socketio.test_client(app) for _ in range(clients)]
+    for client in connected[:watchers]:
+        client.emit('watch', 'p1')
+    payload = {'post_id': 'p1', 'likes_count': 1}
+
+    def drain():
+        for client in connected:
+            client.get_received()
+
+    def to_everyone():
+        socketio.emit('post_liked', payload)
+        drain()
+
+    def to_room():
+        socketio.emit('post_liked', payload, to=post_room('p1'))
+        drain()
+
+    print(f"📡 {clients} connected clients, {watchers} showing the liked post")
+    report('emit to all clients (old broadcast=True)', measure(to_everyone, repeat=20, warmup=2))
+    report('emit to the post room', measure(to_room, repeat=20, warmup=2))
+
+    # Flushed by hand below instead of by the background loop
+    dispatcher = EventDispatcher(socketio, autostart=False)
+
+    def like_burst():
+        for count in range(burst):
+            dispatcher.publish('post_liked', dict(payload, likes_count=count), post_room('p1'), coalesce='p1')
+        dispatcher.flush()
+        drain()
+
+    report(f'{burst} likes in one window, coalesced', measure(like_burst, repeat=20, warmup=2))
+    print(f"   ➜ {dispatcher.stats()}")
+    for client in connected:
+        client.disconnect()
+
+
+@benchmark('templates')
+def bench_templates():
+    """Page render: render_template_string per request vs the template registry"""
+    from flask import render_template_string
+    from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    import app as green_world
+
+    green_world.bootstrap()
+    app, templates = green_world.app, green_world.templates
+    cases = {
+        '/social-feed': 'social_feed.html',
+        '/dashboard': 'dashboard.html',
+    }
+
+    with app.test_request_context():
+        green_world.session['user_id'] = '1'
+        posts, next_cursor = green_world.get_social_feed('1')
+        context = {'posts': posts, 'next_cursor': next_cursor}
+        print("🧩 Render latency per page")
+        for url, name in cases.items():
+            source = templates.sources[name]
+            report(f'{url} render_template_string', measure(lambda: render_template_string(source, **context), repeat=50))
+            report(f'{url} registry (compiled once)', measure(lambda: templates.render(name, **context), repeat=50))
+
+    # Cold start: compiling in a fresh process vs loading the on-disk bytecode
+    cache_dir = tempfile.mkdtemp(prefix='green_world_jinja_')
+    sources = dict(templates.sources)
+
+    def fresh_compile(bytecode_cache=None):
+        env = Environment(loader=DictLoader(sources), bytecode_cache=bytecode_cache)
+        for name in sources:
+            env.get_template(name)
+
+    report(f'compile all {len(sources)} templates, no bytecode cache', measure(fresh_compile, repeat=5, warmup=1))
+    disk_cache = FileSystemBytecodeCache(cache_dir)
+    report(f'load all {len(sources)} templates from bytecode cache',
+           measure(lambda: fresh_compile(disk_cache), repeat=5, warmup=1))
+
+
+@benchmark('streaming')
+def bench_streaming(analyses=5000):
+    """Plant history page: fully buffered render vs a streamed response"""
+    import contextlib
+    import io
+    import tracemalloc
+
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    import app as green_world
+
+    green_world.bootstrap()
+    app, templates = green_world.app, green_world.templates
+    with app.app_context():
+        user_id = green_world.get_db().execute('SELECT id FROM users LIMIT 1').fetchone()[0]
+        analysis = green_world.generate_plant_analysis()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(analyses):
+                green_world.save_plant_analysis(user_id, 'bench.png', analysis)
+
+    def buffered():
+        with app.test_request_context('/plant-history'):
+            history = list(green_world.iter_plant_history(user_id))
+            stats = green_world.get_plant_history_stats(user_id)
+            # Nothing reaches the client until the whole page is rendered
+            return len(templates.render('plant_history.html', stats=stats, analyses=history)), None
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+
+    def streamed():
+        started = time.perf_counter()
+        response = client.get('/plant-history', buffered=False)
+        chunks = iter(response.response)
+        size = len(next(chunks))
+        first_chunk = (time.perf_counter() - started) * 1000
+        for chunk in chunks:
+            size += len(chunk)
+        response.close()
+        return size, first_chunk
+
+    print(f"🌊 /plant-history with {analyses} analyses")
+    for label, render in (('buffered render', buffered), ('streamed response', streamed)):
+        render()
+        tracemalloc.start()
+        started = time.perf_counter()
+        size, first_chunk = render()
+        total = (time.perf_counter() - started) * 1000
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if first_chunk is None:
+            first_chunk = total
+        print(f"   {label:<20} {size / 1e6:5.1f} MB   first byte {first_chunk:8.1f} ms   "
+              f"total {total:8.1f} ms   peak memory {peak / 1e6:6.2f} MB")
+
+
+@benchmark('assets')
+def bench_assets():
+    """Repeat page views: inline CSS/JS vs fingerprinted, browser-cached assets"""
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    os.environ['GREEN_WORLD_ASSET_DIR'] = tempfile.mkdtemp(prefix='green_world_assets_')
+    import app as green_world
+
+    green_world.bootstrap()
+    app, templates = green_world.app, green_world.templates
+    pipeline = templates.assets
+    client = app.test_client()
+    client.post('/login', data={'email': 'test@example.com', 'password': 'test'})
+    pages = ['/social-feed', '/dashboard', '/plant-analyzer', '/quiz']
+
+    print("🎨 HTML per repeat view (assets already in the browser cache)")
+    for label, assets in (('inline', None), ('fingerprinted', pipeline)):
+        templates.assets = assets
+        app.jinja_env.cache.clear()
+        for url in pages:
+            size = len(client.get(url).data)
+            report(f'{url} {label} ({size / 1024:.1f} KB)', measure(lambda: client.get(url).data, repeat=50))
+    templates.assets = pipeline
+    app.jinja_env.cache.clear()
+
+
+@benchmark('compression')
+def bench_compression():
+    """Bytes on the wire per response: identity vs gzip vs a 304 revalidation"""
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    import app as green_world
+
+    green_world.bootstrap()
+    green_world.get_haryana_weather = lambda: {'temperature': 30, 'humidity': 60, 'description': 'clear sky'}
+    client = green_world.app.test_client()
+    client.post('/login', data={'email': 'test@example.com', 'password': 'test'})
+    gzip_only = {'Accept-Encoding': 'gzip'}
+
+    print("🗜️ Response bytes (identity → gzip → If-None-Match)")
+    for url in ['/', '/social-feed', '/dashboard', '/api/feed', '/api/quiz/leaderboard', '/api/weather']:
+        identity = client.get(url)
+        encoded = client.get(url, headers=gzip_only)
+        revalidated = client.get(url, headers={**gzip_only, 'If-None-Match': encoded.headers.get('ETag', '')})
+        saved = 1 - len(encoded.data) / len(identity.data)
+        assert len(encoded.data) <= len(identity.data), f'{url}: gzip body is larger than identity'
+        assert revalidated.status_code == 304 and not revalidated.data, f'{url}: If-None-Match got {revalidated.status}'
+        print(f"   {url:<24} {len(identity.data):8d} B → {len(encoded.data):7d} B ({saved:4.0%} saved)"
+              f" → {revalidated.status_code} {len(revalidated.data)} B")
+    report('/social-feed identity', measure(lambda: client.get('/social-feed').data, repeat=30))
+    report('/social-feed gzip', measure(lambda: client.get('/social-feed', headers=gzip_only).data, repeat=30))
+
+
+@benchmark('uploads')
+def bench_uploads(megabytes=12):
+    """Image upload: request.files + base64 vs streaming to disk in chunks"""
+    import base64
+    import io
+    import struct
+    import tracemalloc
+
+    from flask import Flask, request
+    from werkzeug.test import EnvironBuilder
+
+    from image_uploads import stream_upload
+
+    upload_dir = tempfile.mkdtemp(prefix='green_world_uploads_')
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+
+    @app.post('/buffered')
+    def buffered():
+        file = request.files['image']
+        return str(len(base64.b64encode(file.read()).decode('utf-8')))
+
+    @app.post('/streamed')
+    def streamed():
+        _, upload = stream_upload(request, 'image', upload_dir)
+        os.remove(upload.path)
+        return str(upload.size)
+
+    header = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>IIBBBBB', 2000, 1500, 8, 2, 0, 0, 0)
+    image = header + os.urandom(megabytes * 1024 * 1024)
+    client = app.test_client()
+
+    print(f"📤 {megabytes} MB image upload")
+    for url in ('/buffered', '/streamed'):
+        # Encode the multipart body up front so only the server side is measured
+        environ = EnvironBuilder(url, method='POST', data={'image': (io.BytesIO(image), 'leaf.png')}).get_environ()
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = client.open(environ)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert response.status_code == 200, response.status
+        print(f"   {url:<12} {elapsed * 1000:8.1f} ms   {len(image) / elapsed / 1e6:7.1f} MB/s   "
+              f"peak memory {peak / 1e6:6.1f} MB")
+
+
+@benchmark('blobs')
+def bench_blobs(posts=600, images=20, image_kb=150, page_size=20):
+    """Feed query with base64 images inline in posts vs image hashes + a deduplicating blob store"""
+    import base64
+    import random
+
+    from blob_store import BlobStore
+
+    workdir = tempfile.mkdtemp(prefix='green_world_blobs_')
+    path = os.path.join(workdir, 'social.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE users (id TEXT PRIMARY KEY, username TEXT, first_name TEXT, last_name TEXT,
+                            profile_image TEXT DEFAULT '');
+        CREATE TABLE posts (id TEXT PRIMARY KEY, user_id TEXT NOT NULL, content TEXT NOT NULL,
+                            image_url TEXT DEFAULT '', image_data TEXT DEFAULT '', image_hash TEXT DEFAULT '',
+                            location TEXT DEFAULT '', hashtags TEXT DEFAULT '',
+                            likes_count INTEGER DEFAULT 0, comments_count INTEGER DEFAULT 0,
+                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE INDEX idx_posts_created ON posts (created_at);
+    ''')
+    conn.execute("INSERT INTO users (id, username, first_name, last_name) VALUES ('u', 'grower', 'Asha', 'Rao')")
+    # A few popular photos shared many times over, as in the real feed
+    pool = [base64.b64encode(os.urandom(image_kb * 1024)).decode() for _ in range(images)]
+    rng = random.Random(16)
+    conn.executemany('INSERT INTO posts (id, user_id, content, image_data, created_at) VALUES (?, ?, ?, ?, ?)', [
+        (str(uuid.uuid4()), 'u', f'Post {i}', rng.choice(pool) if i % 2 else '',
+         f'2025-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}')
+        for i in range(posts)
+    ])
+    conn.commit()
+
+    wide = '''
+        SELECT p.*, u.first_name, u.last_name, u.username, u.profile_image
+        FROM posts p JOIN users u ON p.user_id = u.id
+        ORDER BY p.created_at DESC LIMIT ?
+    '''
+    narrow = '''
+        SELECT p.id, p.user_id, p.content, p.image_url, p.image_hash, p.location, p.hashtags,
+               p.likes_count, p.comments_count, p.created_at,
+               u.first_name, u.last_name, u.username, u.profile_image
+        FROM posts p JOIN users u ON p.user_id = u.id
+        ORDER BY p.created_at DESC LIMIT ?
+    '''
+
+    def page_bytes(sql):
+        return sum(len(str(value)) for row in conn.execute(sql, (page_size,)) for value in row)
+
+    print(f"🗃️ {posts} posts, half with one of {images} distinct {image_kb} KB images")
+    before_size = os.path.getsize(path)
+    before_bytes = page_bytes(wide)
+    report('feed page, p.* with base64 image_data', measure(lambda: conn.execute(wide, (page_size,)).fetchall(), repeat=50))
+
+    store = BlobStore(os.path.join(workdir, 'blobs'))
+    started = time.perf_counter()
+    for post_id, image_data in conn.execute("SELECT id, image_data FROM posts WHERE image_data != ''").fetchall():
+        digest = store.put_bytes(base64.b64decode(image_data))
+        conn.execute("UPDATE posts SET image_hash = ?, image_data = '' WHERE id = ?", (digest, post_id))
+    conn.commit()
+    moved = time.perf_counter() - started
+    conn.execute('VACUUM')
+    report('feed page, narrow columns + image_hash', measure(lambda: conn.execute(narrow, (page_size,)).fetchall(), repeat=50))
+
+    stats = store.stats()
+    print(f"   moved in {moved * 1000:.0f} ms: {stats['stored']} blobs stored ({stats['bytes_stored'] / 1e6:.1f} MB), "
+          f"{stats['deduplicated']} duplicates dropped ({stats['bytes_deduplicated'] / 1e6:.1f} MB)")
+    print(f"   database {before_size / 1e6:7.1f} MB → {os.path.getsize(path) / 1e6:7.1f} MB")
+    print(f"   feed page {before_bytes / 1e3:7.1f} KB → {page_bytes(narrow) / 1e3:7.1f} KB read from SQLite")
+
+
+@benchmark('thumbnails')
+def bench_thumbnails(images=12, size=(3000, 2000), card_width=640):
+    """Feed card image: full-resolution upload vs the WebP thumbnail srcset picks"""
+    import io
+
+    from blob_store import BlobStore
+    from thumbnails import ThumbnailPipeline, variant_name
+
+    try:
+        from PIL import Image
+    except ImportError:
+        print("⏭️ thumbnails: Pillow is not installed")
+        return
+
+    store = BlobStore(os.path.join(tempfile.mkdtemp(prefix='green_world_thumbs_'), 'blobs'))
+    pipeline = ThumbnailPipeline(store, workers=os.cpu_count() or 2)
+    digests = []
+    for i in range(images):
+        # Fractal detail with light sensor noise, roughly like a phone photo of foliage
+        image = Image.effect_mandelbrot(size, (-2 + i * 0.01, -1, 1, 1), 80 + i).convert('RGB')
+        noisy = Image.blend(image, Image.effect_noise(size, 20).convert('RGB'), 0.08)
+        buffer = io.BytesIO()
+        noisy.save(buffer, 'JPEG', quality=88)
+        digests.append(store.put_bytes(buffer.getvalue()))
+
+    started = time.perf_counter()
+    for future in [pipeline.submit(digest) for digest in digests]:
+        future.result()
+    elapsed = time.perf_counter() - started
+    stats = pipeline.stats()
+    print(f"🖼️ {images} {size[0]}x{size[1]} JPEG uploads → {stats['thumbnails']} thumbnails in "
+          f"{elapsed * 1000:.0f} ms wall ({stats['ms_per_image']:.0f} ms per image per worker)")
+
+    def decode(path):
+        with Image.open(path) as image:
+            image.load()
+
+    originals = [store.path(digest) for digest in digests]
+    thumbs = [store.path(digest, variant_name(card_width)) for digest in digests]
+    original_bytes = sum(map(os.path.getsize, originals))
+    thumb_bytes = sum(map(os.path.getsize, thumbs))
+    print(f"   feed of {images} cards: {original_bytes / 1e6:.2f} MB originals → "
+          f"{thumb_bytes / 1e6:.2f} MB at {card_width}w ({original_bytes / thumb_bytes:.0f}x smaller)")
+    report('decode original', measure(lambda: decode(originals[0]), repeat=20, warmup=2))
+    report(f'decode {card_width}w WebP', measure(lambda: decode(thumbs[0]), repeat=20, warmup=2))
+
+
+@benchmark('plant_health')
+def bench_plant_health():
+    """Image-based health scoring over the sample images, and its latency on a large upload"""
+    import glob
+
+    import plant_health
+
+    if not plant_health.available():
+        print("⏭️ plant_health: NumPy and Pillow are not installed")
+        return
+    from PIL import Image
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    samples = [os.path.join(root, name) for name in ('healthy-plant.jpg', 'dehydrated-plant.jpg')]
+    samples += sorted(glob.glob(os.path.join(root, '*.webp')))
+
+    print(f"🔬 {len(samples)} sample images (scores are deterministic)")
+    dehydration = {}
+    for path in samples:
+        result = plant_health.analyze_image(path)
+        stats = result['stats']
+        dehydration[os.path.basename(path).split('_', 1)[-1]] = result['dehydration_score']
+        timings = measure(lambda: plant_health.analyze_image(path), repeat=20, warmup=2)
+        print(f"   {os.path.basename(path)[-28:]:<28} dehydration {result['dehydration_score']:.2f}  "
+              f"stress {result['stress_score']:.2f}  sunlight {result['sunlight_score']:.2f}  "
+              f"foliage {stats['coverage']:4.0%}  confidence {result['confidence_score']:2d}%  "
+              f"{timings['mean']:6.2f} ms")
+    # The dehydrated samples have to score clearly drier than the healthy ones
+    for healthy, dehydrated in (('healthy-plant.jpg', 'dehydrated-plant.jpg'),
+                                ('little_tomato.webp', 'dehydrated_plant.webp')):
+        if healthy in dehydration and dehydrated in dehydration:
+            margin = dehydration[dehydrated] - dehydration[healthy]
+            assert margin >= 0.1, f'{dehydrated} only scores {margin:+.2f} dehydration over {healthy}'
+            print(f"   ✅ {dehydrated} scores {margin:+.2f} dehydration over {healthy}")
+
+    # Latency stays bounded by the 256 px working copy, not the upload size
+    large = os.path.join(tempfile.mkdtemp(prefix='green_world_health_'), 'large.jpg')
+    with Image.open(samples[0]) as image:
+        image.convert('RGB').resize((4000, 3000)).save(large, 'JPEG', quality=90)
+    report('analyze 4000x3000 JPEG upload', measure(lambda: plant_health.analyze_image(large), repeat=20, warmup=2))
+    pixels = plant_health.load_pixels(large)
+    report(f'measure() on the {pixels.shape[1]}x{pixels.shape[0]} copy',
+           measure(lambda: plant_health.measure(pixels), repeat=50, warmup=5))
+
+
+@benchmark('analysis_jobs')
+def bench_analysis_jobs(burst=40, size=(4000, 3000)):
+    """Plant analyzer request latency: analysis inline vs queued, then a burst against the bounded queue"""
+    import contextlib
+    import io
+
+    import plant_health
+
+    if not plant_health.available():
+        print("⏭️ analysis_jobs: NumPy and Pillow are not installed (jobs have no worker stage)")
+        return
+    from PIL import Image
+
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    import app as green_world
+
+    green_world.bootstrap()
+    app, queue = green_world.app, green_world.analysis_queue
+    root = os.path.dirname(os.path.abspath(__file__))
+    photo = os.path.join(tempfile.mkdtemp(prefix='green_world_jobs_'), 'photo.jpg')
+    with Image.open(os.path.join(root, 'healthy-plant.jpg')) as image:
+        image.convert('RGB').resize(size).save(photo, 'JPEG', quality=90)
+    original = open(photo, 'rb').read()
+    digest = green_world.blobs.put_bytes(original)
+    # The analysis cache answers a photo it has scored before without a job, so every
+    # queued request gets its own copy: bytes after the JPEG end marker change the digest only
+    fresh = [green_world.blobs.put_bytes(original + uuid.uuid4().bytes) for _ in range(burst + 21)]
+    with app.app_context():
+        user_id = green_world.get_db().execute('SELECT id FROM users LIMIT 1').fetchone()[0]
+
+    def wait_idle():
+        while queue.stats()['pending']:
+            time.sleep(0.01)
+
+    def inline():
+        with app.test_request_context('/plant-analyzer'), contextlib.redirect_stdout(io.StringIO()):
+            analysis = green_world.generate_plant_analysis(green_world.blobs.path(digest), seed=digest)
+            green_world.save_plant_analysis(user_id, '/blobs/' + digest, analysis)
+
+    def queued():
+        photo_digest = fresh.pop()
+        with app.test_request_context('/plant-analyzer'):
+            green_world.enqueue_plant_analysis(user_id, '/blobs/' + photo_digest, photo_digest)
+
+    # Start the worker processes before timing anything
+    queued()
+    wait_idle()
+
+    print(f"⚙️ Plant analysis of a {size[0]}x{size[1]} JPEG, {queue.workers} workers")
+    report('inline: request waits for the analysis', measure(inline, repeat=20, warmup=2))
+    timings = []
+    for _ in range(20):
+        started = time.perf_counter()
+        queued()
+        timings.append((time.perf_counter() - started) * 1000)
+        wait_idle()
+    timings.sort()
+    report('queued: request returns after the insert',
+           {'mean': statistics.fmean(timings), 'p50': timings[10], 'p95': timings[18]})
+
+    # A burst larger than the queue: the overflow is rejected at once instead of piling up
+    before = queue.stats()
+    accepted = rejected = 0
+    started = time.perf_counter()
+    for _ in range(burst):
+        try:
+            queued()
+            accepted += 1
+        except green_world.QueueFull as e:
+            rejected += 1
+            retry_after = e.retry_after
+    submit_ms = (time.perf_counter() - started) * 1000
+    wait_idle()
+    drained_ms = (time.perf_counter() - started) * 1000
+    print(f"   burst of {burst} (max_pending {queue.max_pending}): {accepted} accepted, {rejected} rejected "
+          f"(Retry-After {retry_after if rejected else '-'} s); submitted in {submit_ms:.1f} ms, drained in {drained_ms:.0f} ms")
+    stats = queue.stats()
+    assert stats['completed'] - before['completed'] == accepted and stats['failed'] == 0
+    for stage, values in stats['stages_ms'].items():
+        print(f"   stage {stage:<11} mean {values['mean']:8.2f} ms   max {values['max']:8.2f} ms")
+    queue.shutdown()
+
+
+@benchmark('analysis_batch')
+def bench_analysis_batch(images=16, size=(1600, 1200), rounds=5):
+    """Images per second: one multipart batch request vs one queued request per image"""
+    import contextlib
+    import glob
+    import io
+
+    import plant_health
+
+    if not plant_health.available():
+        print("⏭️ analysis_batch: NumPy and Pillow are not installed")
+        return
+    from PIL import Image
+
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    import app as green_world
+
+    green_world.bootstrap()
+    app, queue = green_world.app, green_world.analysis_queue
+    root = os.path.dirname(os.path.abspath(__file__))
+    sources = [os.path.join(root, 'healthy-plant.jpg'), os.path.join(root, 'dehydrated-plant.jpg')]
+    sources += sorted(glob.glob(os.path.join(root, '*.webp')))
+    photos = []
+    for index in range(images):
+        with Image.open(sources[index % len(sources)]) as image:
+            buffer = io.BytesIO()
+            # Distinct sizes so every photo is its own blob
+            image.convert('RGB').resize((size[0] - index, size[1])).save(buffer, 'JPEG', quality=85)
+        photos.append(buffer.getvalue())
+    # Scores are cached by photo hash, so each request (warmup and rounds, both paths) gets copies
+    # never uploaded before: bytes after the JPEG end marker change the digest only
+    fresh = [[photo + uuid.uuid4().bytes for photo in photos] for _ in range(2 * (rounds + 1) + 1)]
+
+    client = app.test_client()
+    with app.app_context():
+        user_id = green_world.get_db().execute('SELECT id FROM users LIMIT 1').fetchone()[0]
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+
+    def single():
+        for photo in fresh.pop():
+            response = client.post('/api/plant/analyze', data={'plant_image': (io.BytesIO(photo), 'plant.jpg')})
+            assert response.status_code == 202
+        while queue.stats()['pending']:
+            time.sleep(0.002)
+
+    def batch():
+        response = client.post('/api/plant/analyze/batch', data={
+            'plant_images': [(io.BytesIO(photo), f'plant{index}.jpg') for index, photo in enumerate(fresh.pop())]})
+        assert response.status_code == 200
+        return response.get_json()
+
+    cache_before = green_world.analysis_cache.stats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [(label, measure(run, repeat=rounds, warmup=1))
+                   for label, run in (('one request per image', single), ('one batch request', batch))]
+        stages = batch()['timings_ms']
+    cache = green_world.analysis_cache.stats()
+    cache_hits = sum(cache[key] - cache_before[key] for key in ('memory_hits', 'db_hits'))
+    print(f"📦 {images} photos of {size[0]}x{size[1]} JPEG, {queue.workers} analysis workers")
+    for label, timings in results:
+        print(f"   {label:<24} {timings['mean']:8.1f} ms per {images} images   "
+              f"{images * 1000 / timings['mean']:6.1f} images/s")
+    print(f"   batch stages: upload {stages['upload']:.1f} ms   analyze {stages['analyze']:.1f} ms   "
+          f"save (one executemany) {stages['save']:.1f} ms")
+    print(f"   analysis cache hits during the runs: {cache_hits}")
+    assert cache_hits == 0, f'{cache_hits} photos were served from the analysis cache, not analyzed'
+    queue.shutdown()
+
+
+@benchmark('analysis_cache')
+def bench_analysis_cache(photos=200, size=(1600, 1200)):
+    """Repeat uploads: cached scores (memory and SQLite) vs scoring the photo again"""
+    import contextlib
+    import io
+
+    import plant_health
+    from analysis_cache import AnalysisCache
+
+    if not plant_health.available():
+        print("⏭️ analysis_cache: NumPy and Pillow are not installed (there are no scores to cache)")
+        return
+    from PIL import Image
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    photo = os.path.join(tempfile.mkdtemp(prefix='green_world_cache_'), 'photo.jpg')
+    with Image.open(os.path.join(root, 'healthy-plant.jpg')) as image:
+        image.convert('RGB').resize(size).save(photo, 'JPEG', quality=85)
+    result = plant_health.analyze_image(photo)
+
+    conn = sqlite3.connect(temp_database())
+    cache = AnalysisCache(plant_health.SCORING_VERSION, max_entries=photos)
+    hashes = [uuid.uuid4().hex + uuid.uuid4().hex for _ in range(photos)]
+    for image_hash in hashes:
+        cache.put(conn, image_hash, result)
+
+    print(f"🗃️ {photos} cached results, {size[0]}x{size[1]} JPEG photo")
+    report('miss: analyze_image()', measure(lambda: plant_health.analyze_image(photo), repeat=20, warmup=2))
+
+    def db_hit():
+        cache.clear()
+        return cache.get(conn, hashes[0])
+    report('hit from SQLite', measure(db_hit, repeat=500, warmup=20))
+    report('hit from the in-memory LRU', measure(lambda: cache.get(conn, hashes[1]), repeat=5000, warmup=100))
+
+    # Whole plant-analyzer request for a repeat photo: no job, the row is completed at once
+    os.environ['GREEN_WORLD_DB'] = temp_database()
+    import app as green_world
+
+    green_world.bootstrap()
+    app = green_world.app
+    digest = green_world.blobs.put_bytes(open(photo, 'rb').read())
+    with app.app_context():
+        user_id = green_world.get_db().execute('SELECT id FROM users LIMIT 1').fetchone()[0]
+
+    def wait_idle():
+        while green_world.analysis_queue.stats()['pending']:
+            time.sleep(0.002)
+
+    def uncached():
+        green_world.analysis_cache.clear()
+        with app.test_request_context('/plant-analyzer'):
+            green_world.get_db().execute('DELETE FROM plant_analysis_cache')
+            green_world.enqueue_plant_analysis(user_id, '/blobs/' + digest, digest)
+        wait_idle()
+
+    def repeat():
+        with app.test_request_context('/plant-analyzer'):
+            green_world.enqueue_plant_analysis(user_id, '/blobs/' + digest, digest)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = measure(uncached, repeat=10, warmup=2)
+        again = measure(repeat, repeat=200, warmup=10)
+    report('analysis completed, first upload (queued)', first)
+    report('analysis completed, repeat upload (cached)', again)
+    print(f"   {green_world.analysis_cache.stats()}")
+    green_world.analysis_queue.shutdown()
+
+
+def synthetic_species(count, seed=7):
+    """Catalog records with made-up but plausible names, for scaling the plant catalog"""
+    import random
+
+    rng = random.Random(seed)
+    syllables = ['ba', 'chi', 'do', 'fe', 'gla', 'hor', 'ki', 'lo', 'mon', 'ne', 'pha', 'qui', 'ro',
+                 'sa', 'tri', 'ul', 'va', 'xe', 'yu', 'zo', 'ster', 'phyl', 'lum', 'ca', 'dra']
+    families = ['Araceae', 'Moraceae', 'Asparagaceae', 'Rosaceae', 'Lamiaceae', 'Meliaceae', 'Asteraceae',
+                'Cactaceae', 'Orchidaceae', 'Fabaceae', 'Poaceae', 'Solanaceae']
+    types = ['Tropical Houseplant', 'Succulent', 'Indoor Tree', 'Flowering Houseplant', 'Herb', 'Fern',
+             'Flowering Shrub', 'Climber', 'Cactus', 'Groundcover']
+    benefits = ['Air purification', 'Low maintenance', 'Drought tolerant', 'Medicinal uses', 'Pest deterrent',
+                'Decorative foliage', 'Edible leaves', 'Fragrance', 'Attracts pollinators', 'Shade tolerant']
+    suffixes = ['Plant', 'Fern', 'Lily', 'Palm', 'Vine', 'Ivy', 'Fig', 'Orchid', 'Bush', 'Grass']
+
+    def word(parts):
+        return ''.join(rng.choice(syllables) for _ in range(parts))
+
+    species = []
+    for number in range(1, count + 1):
+        genus = word(rng.randint(2, 3)).capitalize()
+        species.append({
+            'id': number,
+            'common_name': f'{word(2).capitalize()} {rng.choice(suffixes)}',
+            'aliases': [],
+            'scientific_name': f'{genus} {word(rng.randint(2, 4))}',
+            'family': rng.choice(families),
+            'type': rng.choice(types),
+            'benefits': rng.sample(benefits, 3),
+        })
+    return species
+
+
+@benchmark('plant_catalog')
+def bench_plant_catalog(sizes=(1000, 10000, 50000)):
+    """Plant search and name lookup: indexed catalog vs the previous linear scans"""
+    import plant_catalog
+
+    def scan_search(records, query):
+        query_lower = query.lower()
+        return [plant for plant in records
+                if query_lower in plant['common_name'].lower() or
+                query_lower in plant['scientific_name'].lower() or
+                query_lower in plant['family'].lower() or
+                query_lower in plant['type'].lower() or
+                any(query_lower in benefit.lower() for benefit in plant['benefits'])]
+
+    def scan_lookup(names, name):
+        plant_key = name.lower().strip()
+        for key, data in names.items():
+            if key in plant_key or plant_key in key:
+                return data
+
+    for size in sizes:
+        records = synthetic_species(size)
+        started = time.perf_counter()
+        catalog = plant_catalog.PlantCatalog(records)
+        build_ms = (time.perf_counter() - started) * 1000
+        names = {record['common_name'].lower(): record for record in records}
+        rare = records[size // 2]['scientific_name'].split()[1]
+        known = records[size // 3]['common_name']
+        # The index matches whole words and word prefixes; the scan also matches inside words
+        indexed = {r['id'] for r in catalog.search(rare)}
+        assert records[size // 2]['id'] in indexed and indexed <= {r['id'] for r in scan_search(records, rare)}
+        assert catalog.lookup(known)['common_name'] == scan_lookup(names, known)['common_name'] == known
+
+        print(f"🌿 {size} species: index built in {build_ms:.0f} ms, {catalog.stats()['terms']} terms")
+        report(f'search {rare!r}: linear scan', measure(lambda: scan_search(records, rare), repeat=20, warmup=2))
+        report(f'search {rare!r}: inverted index', measure(lambda: catalog.search(rare), repeat=500, warmup=20))
+        report(f'lookup {known!r}: linear scan', measure(lambda: scan_lookup(names, known), repeat=20, warmup=2))
+        report(f'lookup {known!r}: name index', measure(lambda: catalog.lookup(known), repeat=500, warmup=20))
+
+
+@benchmark('plant_search')
+def bench_plant_search(sizes=(10000, 100000), budget_ms=10.0):
+    """Typo-tolerant ranked search latency at catalog scale, per query and per keystroke"""
+    import random
+
+    import plant_catalog
+
+    for size in sizes:
+        records = synthetic_species(size)
+        catalog = plant_catalog.PlantCatalog(records)
+        rng = random.Random(size)
+        target = records[size // 2]
+        name = target['common_name'].lower()
+        genus = target['scientific_name'].split()[0].lower()
+
+        def typo(word):
+            # One dropped letter in words long enough to allow a typo
+            if len(word) <= 3:
+                return word
+            at = rng.randrange(1, len(word) - 1)
+            return word[:at] + word[at + 1:]
+
+        queries = {
+            'exact name': name,
+            'misspelt genus': typo(genus),
+            'misspelt name': ' '.join(typo(word) for word in name.split()),
+            'benefit words': 'air purification',
+        }
+        stats = catalog.stats()
+        print(f"🔎 {size} species: {stats['terms']} terms, {stats['trigrams']} trigrams, built in {stats['build_ms'] / 1000:.1f} s")
+        for label, query in queries.items():
+            ranked = catalog.rank(query, limit=10)
+            found = next((number for number, (record, _) in enumerate(ranked, 1) if record['id'] == target['id']), None)
+            note = f'target #{found}' if found else 'target not in top 10'
+            report(f'{label} {query!r} ({note})', measure(lambda: catalog.rank(query, limit=10), repeat=50, warmup=5))
+
+        # Every prefix of a misspelt query, as a search box would send it
+        typed = queries['misspelt name']
+        keystrokes = [typed[:end] for end in range(1, len(typed) + 1)]
+        samples = []
+        for _ in range(10):
+            for prefix in keystrokes:
+                started = time.perf_counter()
+                catalog.rank(prefix, limit=10)
+                samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"   per keystroke over {typed!r}: mean {statistics.fmean(samples):.3f} ms   p95 {p95:.3f} ms   "
+              f"max {samples[-1]:.3f} ms   ({'within' if p95 <= budget_ms else 'over'} the {budget_ms:.0f} ms budget)")
+
+
+@benchmark('plant_suggest')
+def bench_plant_suggest(sizes=(10000, 100000)):
+    """Autocomplete per keystroke: bisect + precomputed top-k vs scanning every name"""
+    import random
+
+    import plant_catalog
+    import plant_suggest
+
+    for size in sizes:
+        catalog = plant_catalog.PlantCatalog(synthetic_species(size))
+        rng = random.Random(size)
+        popularity = {record['id']: rng.randrange(1, 500) for record in rng.sample(catalog.records, size // 10)}
+        started = time.perf_counter()
+        suggester = plant_suggest.PlantSuggester(catalog, popularity)
+        build = time.perf_counter() - started
+        started = time.perf_counter()
+        suggester.reweight(popularity)
+        reweight = time.perf_counter() - started
+        print(f"🔤 {size} species: {suggester.stats()['keys']} keys, built in {build * 1000:.0f} ms, "
+              f"re-ranked in {reweight * 1000:.0f} ms, {suggester.stats()['precomputed_prefixes']} precomputed prefixes")
+
+        def scan(prefix, limit=plant_suggest.DEFAULT_LIMIT):
+            prefix = prefix.lower()
+            matches = [record for record in catalog.records
+                       if record['common_name'].lower().startswith(prefix)
+                       or record['scientific_name'].lower().startswith(prefix)]
+            matches.sort(key=lambda record: -popularity.get(record['id'], 0))
+            return matches[:limit]
+
+        typed = catalog.records[size // 3]['common_name']
+        keystrokes = [typed[:end] for end in range(1, len(typed) + 1)]
+        report(f'type {typed!r}: scan every name', measure(lambda: [scan(prefix) for prefix in keystrokes],
+                                                              repeat=5, warmup=1))
+        timings = measure(lambda: [suggester.suggest(prefix) for prefix in keystrokes], repeat=200)
+        report(f'type {typed!r}: suggester ({len(keystrokes)} keystrokes)', timings)
+        print(f"   per keystroke: {timings['mean'] * 1000 / len(keystrokes):.1f} µs mean")
+        report("one keystroke 's' (crowded prefix)", measure(lambda: suggester.suggest('s'), repeat=500))
+        report(f"one keystroke {typed[:4]!r}", measure(lambda: suggester.suggest(typed[:4]), repeat=500))
+
+
+@benchmark('search_rollups')
+def bench_search_rollups(rows=100000, new_rows=1000, days=60):
+    """Search analytics: incremental fold past the high-water mark vs re-aggregating plant_searches"""
+    import json
+    import random
+
+    import plant_catalog
+    from search_rollups import SearchRollups
+
+    rng = random.Random(5)
+    plants = plant_catalog.catalog.records
+    payloads = {plant['common_name']: json.dumps(plant_catalog.to_dict(plant)) for plant in plants}
+    conn = sqlite3.connect(temp_database())
+
+    def add_searches(count, age_days, min_age_days=0):
+        batch = []
+        # Oldest first, as searches really arrive
+        for age in sorted((rng.uniform(min_age_days, age_days) for _ in range(count)), reverse=True):
+            plant = rng.choice(plants)
+            query = rng.choice([plant['common_name'], plant['common_name'].lower(), plant['scientific_name']])
+            batch.append((str(uuid.uuid4()), 'u1', query, payloads[plant['common_name']], f'-{age:.4f} days'))
+        conn.executemany('''
+            INSERT INTO plant_searches (id, user_id, search_query, plant_data, created_at)
+            VALUES (?, ?, ?, ?, datetime('now', ?))
+        ''', batch)
+        conn.commit()
+
+    def kept_payloads():
+        return conn.execute("SELECT COUNT(*) FROM plant_searches WHERE plant_data != '{}'").fetchone()[0]
+
+    add_searches(rows, days)
+    rollups = SearchRollups(plant_catalog.catalog)
+    print(f"📈 {rows} plant searches over {days} days")
+
+    started = time.perf_counter()
+    rollups.fold(conn)
+    print(f"   first fold (every row)                       {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    def regroup():
+        return conn.execute('''
+            SELECT json_extract(plant_data, '$.name'), COUNT(*) FROM plant_searches GROUP BY 1
+        ''').fetchall()
+    report(f're-aggregate all {rows} rows', measure(regroup, repeat=5, warmup=1))
+
+    def incremental():
+        add_searches(new_rows, 0)
+        started = time.perf_counter()
+        rollups.fold(conn)
+        return (time.perf_counter() - started) * 1000
+    samples = sorted(incremental() for _ in range(10))
+    print(f"   fold {new_rows} new rows past the mark             mean {statistics.fmean(samples):8.3f} ms   "
+          f"p95 {samples[-1]:8.3f} ms")
+    report('fold with nothing new', measure(lambda: rollups.fold(conn), repeat=50))
+
+    folded = conn.execute('SELECT SUM(searches) FROM plant_search_daily_counts').fetchone()[0]
+    assert folded == rows + 10 * new_rows, folded
+    started = time.perf_counter()
+    dropped = rollups.drop_payloads(conn)
+    print(f"   drop payloads older than {rollups.payload_days} days: {dropped} rows in "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms, {kept_payloads()} payloads kept")
+    report('drop payloads with nothing new', measure(lambda: rollups.drop_payloads(conn), repeat=10))
+
+    # Searches written late with old timestamps land after young ones; they are trimmed all the same
+    kept = kept_payloads()
+    add_searches(new_rows, days, min_age_days=rollups.payload_days + 1)
+    rollups.fold(conn)
+    late = rollups.drop_payloads(conn)
+    assert late == new_rows and kept_payloads() == kept, (late, kept_payloads(), kept)
+    print(f"   {new_rows} backdated searches after young ones: {late} payloads dropped")
+    report('species popularity from the rollups', measure(lambda: rollups.searches_by_species(conn), repeat=50))
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+        return 1
+    for name in names:
+        print('=' * 60)
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+🗃️ GREEN WORLD - Content-Addressed Blob Store
+- Files are stored once under <root>/<aa>/<sha256>, named by the SHA-256 of their bytes
+- Storing the same image twice keeps one copy: rows reference the hash, not the path
+- Blobs never change once written, so they are served with immutable caching
+- Derived files (e.g. thumbnails) sit next to their blob as <sha256>.<variant>
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+from flask import abort, send_file
+
+from image_uploads import CHUNK_SIZE, image_kind
+
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+VARIANT_PATTERN = re.compile(r'^[a-z0-9]+\.[a-z]+$')
+MAX_AGE = 365 * 24 * 3600
+MIMETYPES = {'jpeg': 'image/jpeg', 'png': 'image/png', 'gif': 'image/gif', 'webp': 'image/webp'}
+
+
+def file_digest(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """Deduplicating file store keyed by SHA-256"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+        self._stats = {'stored': 0, 'deduplicated': 0, 'bytes_stored': 0, 'bytes_deduplicated': 0}
+
+    def path(self, digest, variant=None):
+        if not DIGEST_PATTERN.match(digest or ''):
+            raise ValueError(f'Not a SHA-256 hex digest: {digest!r}')
+        if variant is None:
+            return os.path.join(self.root, digest[:2], digest)
+        if not VARIANT_PATTERN.match(variant):
+            raise ValueError(f'Not a blob variant name: {variant!r}')
+        return os.path.join(self.root, digest[:2], f'{digest}.{variant}')
+
+    def digests(self):
+        """Every stored blob's digest (variants excluded)"""
+        if not os.path.isdir(self.root):
+            return
+        for shard in sorted(os.listdir(self.root)):
+            shard_dir = os.path.join(self.root, shard)
+            if os.path.isdir(shard_dir):
+                for name in sorted(os.listdir(shard_dir)):
+                    if DIGEST_PATTERN.match(name):
+                        yield name
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put_file(self, source, digest=None):
+        """Move the file at source into the store and return its digest.
+
+        digest may be passed when the caller already hashed the bytes while
+        receiving them. When the blob is already stored the source is deleted.
+        """
+        digest = digest or file_digest(source)
+        path = self.path(digest)
+        size = os.path.getsize(source)
+        if os.path.exists(path):
+            os.remove(source)
+            self._count(deduplicated=1, bytes_deduplicated=size)
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source, path)
+        self._count(stored=1, bytes_stored=size)
+        return digest
+
+    def put_bytes(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            self._count(deduplicated=1, bytes_deduplicated=len(data))
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # mkstemp creates the file private to its owner
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._count(stored=1, bytes_stored=len(data))
+        return digest
+
+    def send(self, digest, variant=None):
+        """Flask response for a stored blob or one of its variants, 404 when unknown"""
+        try:
+            path = self.path(digest, variant)
+        except ValueError:
+            abort(404)
+        if not os.path.exists(path):
+            abort(404)
+        if variant is None:
+            with open(path, 'rb') as f:
+                kind = image_kind(f.read(12))
+        else:
+            kind = variant.rsplit('.', 1)[1]
+        response = send_file(path, mimetype=MIMETYPES.get(kind, 'application/octet-stream'),
+                             max_age=MAX_AGE, etag=f'{digest}.{variant}' if variant else digest,
+                             conditional=True)
+        response.cache_control.immutable = True
+        response.cache_control.public = True
+        return response
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
@@ -29,11 +29,16 @@ import base64
 import requests
 import time
 
+from compression import CompressionMiddleware
+
 app = Flask(__name__)
 app.secret_key = 'complete-green-world-ultimate-2025'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+# gzip/brotli and ETag/304 for pages and APIs
+app.wsgi_app = CompressionMiddleware(app.wsgi_app)
+
 # Initialize SocketIO for real-time features
 socketio = SocketIO(app, cors_allowed_origins="*")
 
@@ -783,7 +788,9 @@ def get_posts(user_id=None, limit=50):
     conn.row_factory = sqlite3.Row
 
     posts = conn.execute('''
-        SELECT p.*, u.first_name, u.last_name, u.username, u.profile_image
+        SELECT p.id, p.user_id, p.content, p.images, p.location, p.hashtags,
+               p.likes_count, p.comments_count, p.shares_count, p.created_at,
+               u.first_name, u.last_name, u.username, u.profile_image
         FROM posts p
         JOIN users u ON p.user_id = u.id
         ORDER BY p.created_at DESC
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+🗜️ GREEN WORLD - Response Compression & Conditional GET Middleware
+- gzip (or brotli, when the brotli package is installed) negotiated from Accept-Encoding
+- Responses under a size threshold or of binary types are passed through untouched
+- Weak ETags from a fast hash of the body; If-None-Match is answered with 304
+- Streamed (chunked) responses are compressed incrementally so they still stream
+- Per-route overrides by path prefix, e.g. {'/api/weather': {'etag': False}}
+"""
+
+import gzip
+import hashlib
+import itertools
+import threading
+import zlib
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag, unquote_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+
+def negotiate(accept_encoding):
+    """Best supported Content-Encoding for an Accept-Encoding header, or None"""
+    accepted = parse_accept_header(accept_encoding)
+    for encoding in ('br', 'gzip'):
+        if encoding == 'br' and brotli is None:
+            continue
+        if accepted.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output, and so any cached copy, byte-identical across calls
+    return gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+
+def body_etag(body):
+    return quote_etag(hashlib.blake2b(body, digest_size=8).hexdigest(), weak=True)
+
+
+class _StreamEncoder:
+    """Incremental compressor that flushes after every chunk it is given"""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.encoding = encoding
+
+    def chunk(self, data):
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """WSGI middleware adding content encoding and validators to GET responses.
+
+    ``rules`` maps a path prefix to overrides of ``compress``, ``etag`` and
+    ``min_size``; the longest matching prefix wins. Responses that already
+    carry an ETag keep it (weakened once re-encoded), so file responses still
+    revalidate against their own validator.
+    """
+
+    def __init__(self, app, min_size=DEFAULT_MIN_SIZE, rules=None):
+        self.app = app
+        self.min_size = min_size
+        self.rules = sorted((rules or {}).items(), key=lambda rule: len(rule[0]), reverse=True)
+        self._lock = threading.Lock()
+        self._stats = {'responses': 0, 'compressed': 0, 'streamed': 0, 'not_modified': 0,
+                       'bytes_in': 0, 'bytes_out': 0}
+
+    def options(self, path):
+        options = {'compress': True, 'etag': True, 'min_size': self.min_size}
+        for prefix, overrides in self.rules:
+            if path.startswith(prefix):
+                options.update(overrides)
+                break
+        return options
+
+    def __call__(self, environ, start_response):
+        options = self.options(environ.get('PATH_INFO', ''))
+        if environ.get('REQUEST_METHOD') != 'GET' or not (options['compress'] or options['etag']):
+            return self.app(environ, start_response)
+
+        captured = {}
+        written = []
+
+        def capture(status, headers, exc_info=None):
+            if captured.get('passthrough'):
+                return start_response(status, headers, exc_info)
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            return written.append
+
+        app_iter = self.app(environ, capture)
+        if 'status' not in captured:
+            # start_response deferred to the first chunk: nothing to rewrite
+            captured['passthrough'] = True
+            return app_iter
+        if written:
+            app_iter = itertools.chain(written, app_iter)
+        status, headers = captured['status'], Headers(captured['headers'])
+        content_type = headers.get('Content-Type', '')
+        if (not status.startswith('200') or 'Content-Encoding' in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)):
+            start_response(status, captured['headers'], captured['exc_info'])
+            return app_iter
+
+        if 'no-transform' in headers.get('Cache-Control', ''):
+            options['compress'] = False
+        encoding = None
+        if options['compress']:
+            encoding = negotiate(environ.get('HTTP_ACCEPT_ENCODING'))
+            vary = headers.get('Vary')
+            if not vary:
+                headers['Vary'] = 'Accept-Encoding'
+            elif 'accept-encoding' not in vary.lower():
+                headers['Vary'] = f'{vary}, Accept-Encoding'
+
+        if 'Content-Length' not in headers:
+            return self._stream(app_iter, status, headers, encoding, start_response)
+        return self._buffered(environ, app_iter, status, headers, encoding, options, start_response)
+
+    def _buffered(self, environ, app_iter, status, headers, encoding, options, start_response):
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        etag = headers.get('ETag')
+        if etag is None and options['etag']:
+            etag = body_etag(body)
+        if etag is not None:
+            if_none_match = parse_etags(environ.get('HTTP_IF_NONE_MATCH'))
+            if if_none_match.contains_weak(unquote_etag(etag)[0]):
+                for name in ('Content-Length', 'Content-Type'):
+                    headers.pop(name, None)
+                headers['ETag'] = etag
+                self._count(not_modified=1, bytes_in=len(body))
+                start_response('304 NOT MODIFIED', headers.to_wsgi_list())
+                return []
+
+        if encoding is not None and len(body) >= options['min_size']:
+            encoded = compress(body, encoding)
+            if len(encoded) < len(body):
+                self._count(compressed=1, bytes_in=len(body), bytes_out=len(encoded))
+                body = encoded
+                headers['Content-Encoding'] = encoding
+                headers['Content-Length'] = str(len(body))
+                if etag is not None:
+                    # Same validator for every encoding of the content: it must be weak
+                    etag = quote_etag(unquote_etag(etag)[0], weak=True)
+            else:
+                self._count(bytes_in=len(body), bytes_out=len(body))
+        else:
+            self._count(bytes_in=len(body), bytes_out=len(body))
+        if etag is not None:
+            headers['ETag'] = etag
+        start_response(status, headers.to_wsgi_list())
+        return [body]
+
+    def _stream(self, app_iter, status, headers, encoding, start_response):
+        if encoding is None:
+            start_response(status, headers.to_wsgi_list())
+            return app_iter
+        headers['Content-Encoding'] = encoding
+        headers.pop('ETag', None)
+        start_response(status, headers.to_wsgi_list())
+        return self._encode_stream(app_iter, _StreamEncoder(encoding))
+
+    def _encode_stream(self, app_iter, encoder):
+        bytes_in = bytes_out = 0
+        try:
+            for chunk in app_iter:
+                if not chunk:
+                    continue
+                data = encoder.chunk(chunk)
+                bytes_in += len(chunk)
+                bytes_out += len(data)
+                yield data
+            data = encoder.finish()
+            bytes_out += len(data)
+            yield data
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+            self._count(streamed=1, bytes_in=bytes_in, bytes_out=bytes_out)
+
+    def _count(self, **deltas):
+        with self._lock:
+            self._stats['responses'] += 1
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['encodings'] = ['br', 'gzip'] if brotli is not None else ['gzip']
+        stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+        return stats
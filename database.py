@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+🗄️ GREEN WORLD - Shared Data-Access Layer
+- Bounded SQLite connection pool (thread and eventlet safe)
+- One pooled connection per request, reused through Flask's `g`
+- Configurable database path (app.config['DATABASE'] or GREEN_WORLD_DB)
+- Pool statistics for monitoring (checkouts, wait time, high-water mark)
+- WAL storage profile, SQLITE_BUSY retry/backoff and periodic checkpoints
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_app_context
+
+DEFAULT_DB_PATH = os.environ.get('GREEN_WORLD_DB', 'green_world.db')
+DEFAULT_POOL_SIZE = int(os.environ.get('GREEN_WORLD_DB_POOL_SIZE', '8'))
+DEFAULT_CHECKOUT_TIMEOUT = 10.0
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+# Storage profile applied at startup. journal_mode is persistent in the
+# database file; the rest are per-connection and set on every new connection.
+STORAGE_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -16000,              # negative = KiB, so ~16 MB page cache
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+CONNECTION_PRAGMAS = ('synchronous', 'busy_timeout', 'cache_size', 'mmap_size', 'temp_store')
+
+# SQLITE_BUSY retry policy: exponential backoff with jitter
+BUSY_RETRY_ATTEMPTS = 5
+BUSY_RETRY_BASE_DELAY = 0.02
+BUSY_RETRY_MAX_DELAY = 0.5
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes free within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections.
+
+    Connections are opened lazily up to ``max_size`` and handed out LIFO so the
+    warmest connection (and its page cache) is reused first. Waiting is done on a
+    ``threading.Condition``, which eventlet's monkey patching turns into a green
+    wait, so the same pool works under threads and under eventlet.
+    """
+
+    def __init__(self, db_path, max_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_CHECKOUT_TIMEOUT, profile=None):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.profile = STORAGE_PROFILE if profile is None else profile
+        self._idle = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'connections_opened': 0,
+            'wait_time_total_ms': 0.0,
+            'wait_time_max_ms': 0.0,
+            'in_use': 0,
+            'high_water': 0,
+        }
+
+    def _connect(self):
+        # Connections move between request threads/greenlets, so sqlite's
+        # same-thread check has to be off; the pool guarantees exclusive use.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name in CONNECTION_PRAGMAS:
+            if name in self.profile:
+                conn.execute(f'PRAGMA {name} = {self.profile[name]}')
+        return conn
+
+    def apply_storage_profile(self):
+        """Switch the database file to the profile's journal mode (persistent)"""
+        mode = self.profile.get('journal_mode')
+        if not mode:
+            return None
+        conn = self.acquire()
+        try:
+            return conn.execute(f'PRAGMA journal_mode = {mode}').fetchone()[0]
+        finally:
+            self.release(conn)
+
+    def acquire(self):
+        """Check a connection out of the pool, opening one if below max_size"""
+        started = time.perf_counter()
+        waited = False
+        conn = None
+
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                waited = True
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(f'No database connection free after {self.timeout}s')
+                self._cond.wait(remaining)
+
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                # Reserve the slot now, open the connection outside the lock
+                self._size += 1
+
+        opened = conn is None
+        if opened:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+
+        wait_ms = (time.perf_counter() - started) * 1000
+        with self._cond:
+            stats = self._stats
+            stats['checkouts'] += 1
+            stats['in_use'] += 1
+            stats['high_water'] = max(stats['high_water'], stats['in_use'])
+            if waited:
+                stats['waits'] += 1
+                stats['wait_time_total_ms'] += wait_ms
+                stats['wait_time_max_ms'] = max(stats['wait_time_max_ms'], wait_ms)
+            if opened:
+                stats['connections_opened'] += 1
+
+        return conn
+
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted"""
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            self._stats['in_use'] -= 1
+            if healthy:
+                self._idle.append(conn)
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+        if not healthy:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on release)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pool_size'] = self._size
+            stats['idle'] = len(self._idle)
+        stats['max_size'] = self.max_size
+        stats['db_path'] = self.db_path
+        stats['avg_wait_ms'] = round(stats['wait_time_total_ms'] / stats['waits'], 3) if stats['waits'] else 0.0
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(db_path=None, pool_size=None, timeout=None, profile=None):
+    """(Re)create the process-wide pool, closing the previous one"""
+    global _pool
+    with _pool_lock:
+        old = _pool
+        _pool = ConnectionPool(
+            db_path or DEFAULT_DB_PATH,
+            max_size=pool_size or DEFAULT_POOL_SIZE,
+            timeout=timeout or DEFAULT_CHECKOUT_TIMEOUT,
+            profile=profile,
+        )
+    if old is not None:
+        old.close_all()
+    return _pool
+
+
+def get_pool():
+    if _pool is None:
+        return configure()
+    return _pool
+
+
+@contextmanager
+def connection():
+    """Pooled connection for code running outside a request (startup, CLI, workers)"""
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def get_db():
+    """Connection bound to the current app context, checked out on first use"""
+    if not has_app_context():
+        raise RuntimeError('get_db() needs an app context; use database.connection() instead')
+    if '_db_conn' not in g:
+        pool = get_pool()
+        g._db_conn = pool.acquire()
+        g._db_pool = pool
+    return g._db_conn
+
+
+def _release_request_connection(exc=None):
+    conn = g.pop('_db_conn', None)
+    pool = g.pop('_db_pool', None)
+    if conn is not None:
+        pool.release(conn)
+
+
+_busy_stats = {'retries': 0, 'gave_up': 0}
+_checkpoint_stats = {'runs': 0, 'errors': 0, 'last_run': None, 'last_log_frames': 0, 'last_checkpointed': 0}
+_stats_lock = threading.Lock()
+
+
+def is_busy_error(exc):
+    message = str(exc).lower()
+    return isinstance(exc, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+def retry_on_busy(func=None, attempts=BUSY_RETRY_ATTEMPTS, base_delay=BUSY_RETRY_BASE_DELAY,
+                  max_delay=BUSY_RETRY_MAX_DELAY):
+    """Retry a write transaction that hit SQLITE_BUSY / "database is locked".
+
+    busy_timeout already makes sqlite wait inside a statement; this covers the
+    cases it cannot (a deferred transaction upgrading to a write lock). The
+    request connection is rolled back before each retry so the wrapped
+    function always starts from a clean transaction.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except sqlite3.OperationalError as e:
+                    if not is_busy_error(e) or attempt == attempts - 1:
+                        if is_busy_error(e):
+                            with _stats_lock:
+                                _busy_stats['gave_up'] += 1
+                        raise
+                    if has_app_context() and '_db_conn' in g and g._db_conn.in_transaction:
+                        g._db_conn.rollback()
+                    with _stats_lock:
+                        _busy_stats['retries'] += 1
+                    delay = min(max_delay, base_delay * (2 ** attempt))
+                    time.sleep(delay * random.uniform(0.5, 1.0))
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def checkpoint(mode='PASSIVE'):
+    """Run a WAL checkpoint; PASSIVE never blocks readers or writers"""
+    with connection() as conn:
+        busy, log_frames, checkpointed = conn.execute(f'PRAGMA wal_checkpoint({mode})').fetchone()
+    with _stats_lock:
+        _checkpoint_stats['runs'] += 1
+        _checkpoint_stats['last_run'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        _checkpoint_stats['last_log_frames'] = log_frames
+        _checkpoint_stats['last_checkpointed'] = checkpointed
+    return busy, log_frames, checkpointed
+
+
+def start_checkpoint_task(socketio=None, interval=DEFAULT_CHECKPOINT_INTERVAL):
+    """Checkpoint the WAL every `interval` seconds in the background.
+
+    With Flask-SocketIO the loop runs as a server background task (a greenlet
+    under eventlet); otherwise it falls back to a daemon thread.
+    """
+    sleep = socketio.sleep if socketio is not None else time.sleep
+
+    def checkpoint_loop():
+        while True:
+            sleep(interval)
+            try:
+                checkpoint()
+            except sqlite3.Error as e:
+                with _stats_lock:
+                    _checkpoint_stats['errors'] += 1
+                print(f"⚠️ WAL checkpoint failed: {e}")
+
+    if socketio is not None:
+        return socketio.start_background_task(checkpoint_loop)
+    thread = threading.Thread(target=checkpoint_loop, name='wal-checkpoint', daemon=True)
+    thread.start()
+    return thread
+
+
+def pool_stats():
+    stats = get_pool().stats()
+    with _stats_lock:
+        stats['busy'] = dict(_busy_stats)
+        stats['checkpoint'] = dict(_checkpoint_stats)
+    return stats
+
+
+def init_app(app):
+    """Configure the pool and storage profile from app.config and return connections at teardown"""
+    app.config.setdefault('DATABASE', DEFAULT_DB_PATH)
+    app.config.setdefault('DATABASE_POOL_SIZE', DEFAULT_POOL_SIZE)
+    app.config.setdefault('DATABASE_STORAGE_PROFILE', STORAGE_PROFILE)
+    pool = configure(app.config['DATABASE'], app.config['DATABASE_POOL_SIZE'],
+                     profile=app.config['DATABASE_STORAGE_PROFILE'])
+    journal_mode = pool.apply_storage_profile()
+    if journal_mode:
+        print(f"✅ Database storage profile applied (journal_mode={journal_mode})")
+    app.teardown_appcontext(_release_request_connection)
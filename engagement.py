@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+💚 GREEN WORLD - Write-Behind Like Aggregator
+- Like/unlike taps are buffered in memory instead of one write transaction each
+- Toggles that cancel out within a flush window are dropped
+- Buffered likes and likes_count deltas are applied in one batched transaction
+- Callers get an immediately consistent count from memory
+- Flushed on an interval, when the buffer fills and at interpreter exit
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from database import connection
+
+DEFAULT_FLUSH_INTERVAL = float(os.environ.get('GREEN_WORLD_LIKE_FLUSH_INTERVAL', '1.0'))
+DEFAULT_MAX_PENDING = 500
+
+
+class LikeAggregator:
+    """Buffers like state per (user, post) and flushes it in batches.
+
+    Three maps describe a (user, post) pair: ``_persisted`` is its state in the
+    database when first touched, ``_inflight`` is what a running flush is
+    writing and ``_pending`` is what the next flush will write. ``_counts``
+    holds the in-memory likes_count of every post with buffered likes.
+    """
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pending = {}
+        self._inflight = {}
+        self._persisted = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats = {
+            'events': 0,
+            'deduped': 0,
+            'flushes': 0,
+            'flush_errors': 0,
+            'rows_written': 0,
+            'last_flush_ms': 0.0,
+            'last_flush_size': 0,
+        }
+
+    def toggle(self, conn, user_id, post_id):
+        """Record a like tap; returns (action, likes_count) as the user now sees it"""
+        key = (user_id, post_id)
+        with self._lock:
+            if key not in self._persisted:
+                self._persisted[key] = conn.execute(
+                    'SELECT 1 FROM likes WHERE user_id = ? AND post_id = ?', key).fetchone() is not None
+            if post_id not in self._counts:
+                row = conn.execute('SELECT likes_count FROM posts WHERE id = ?', (post_id,)).fetchone()
+                self._counts[post_id] = row[0] if row else 0
+
+            baseline = self._inflight.get(key, self._persisted[key])
+            liked = not self._pending.get(key, baseline)
+            if liked == baseline:
+                # Toggled back within the window: nothing left to write
+                self._pending.pop(key, None)
+                self._stats['deduped'] += 1
+            else:
+                self._pending[key] = liked
+            self._counts[post_id] += 1 if liked else -1
+            self._stats['events'] += 1
+            likes_count = self._counts[post_id]
+            full = len(self._pending) >= self.max_pending
+
+        if full:
+            self.flush()
+        return ('liked' if liked else 'unliked'), likes_count
+
+    def likes_count(self, post_id):
+        """In-memory count for a post with buffered likes, else None"""
+        with self._lock:
+            return self._counts.get(post_id)
+
+    def overlay(self, posts):
+        """Feed rows as dicts, with likes_count taken from memory where buffered"""
+        with self._lock:
+            counts = dict(self._counts)
+        posts = [dict(post) for post in posts]
+        for post in posts:
+            if post['id'] in counts:
+                post['likes_count'] = counts[post['id']]
+        return posts
+
+    def flush(self):
+        """Write every buffered like in one transaction; returns rows changed"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    # Only cancelled toggles left: forget them so the next tap re-reads
+                    self._persisted.clear()
+                    self._counts.clear()
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._inflight = dict(batch)
+
+            started = time.perf_counter()
+            try:
+                written = self._write(batch)
+            except sqlite3.Error as e:
+                with self._lock:
+                    # Newer taps already in _pending win over the failed batch
+                    for key, liked in batch.items():
+                        self._pending.setdefault(key, liked)
+                    self._inflight = {}
+                    self._stats['flush_errors'] += 1
+                print(f"⚠️ Like flush failed, {len(batch)} change(s) kept for retry: {e}")
+                return 0
+
+            with self._lock:
+                self._inflight = {}
+                # Keep state only for taps made during the flush; everything
+                # else is re-read on the next tap, picking up other writers
+                self._persisted = {key: batch.get(key, self._persisted[key]) for key in self._pending}
+                busy_posts = {post_id for _, post_id in self._pending}
+                self._counts = {post_id: count for post_id, count in self._counts.items() if post_id in busy_posts}
+                self._stats['flushes'] += 1
+                self._stats['rows_written'] += written
+                self._stats['last_flush_ms'] = round((time.perf_counter() - started) * 1000, 3)
+                self._stats['last_flush_size'] = len(batch)
+            return written
+
+    def _write(self, batch):
+        deltas = defaultdict(int)
+        written = 0
+        with connection() as conn:
+            for (user_id, post_id), liked in batch.items():
+                if liked:
+                    changed = conn.execute('''
+                        INSERT OR IGNORE INTO likes (id, user_id, post_id) VALUES (?, ?, ?)
+                    ''', (str(uuid.uuid4()), user_id, post_id)).rowcount
+                else:
+                    changed = conn.execute('''
+                        DELETE FROM likes WHERE user_id = ? AND post_id = ?
+                    ''', (user_id, post_id)).rowcount
+                # Deltas come from rows actually changed, so a like another
+                # process already wrote is never counted twice
+                deltas[post_id] += changed if liked else -changed
+                written += changed
+            conn.executemany('UPDATE posts SET likes_count = likes_count + ? WHERE id = ?',
+                             [(delta, post_id) for post_id, delta in deltas.items() if delta])
+            conn.commit()
+        return written
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['inflight'] = len(self._inflight)
+        stats['max_pending'] = self.max_pending
+        return stats
+
+
+likes = LikeAggregator()
+atexit.register(likes.flush)
+
+
+def start_flush_task(socketio=None, interval=DEFAULT_FLUSH_INTERVAL):
+    """Flush buffered likes every `interval` seconds in the background"""
+    sleep = socketio.sleep if socketio is not None else time.sleep
+
+    def flush_loop():
+        while True:
+            sleep(interval)
+            likes.flush()
+
+    if socketio is not None:
+        return socketio.start_background_task(flush_loop)
+    thread = threading.Thread(target=flush_loop, name='like-flush', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+🧊 GREEN WORLD - Read-Through Feed Cache
+- In-process LRU + TTL cache for public/discovery feed pages
+- Keyed by (feed kind, cursor, page size)
+- New posts drop only first pages; likes and comments patch counts in place
+- Entry and byte caps, hit/miss/eviction counters for monitoring
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = float(os.environ.get('GREEN_WORLD_FEED_CACHE_TTL', '30'))
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = int(os.environ.get('GREEN_WORLD_FEED_CACHE_BYTES', str(8 * 1024 * 1024)))
+
+
+def approx_size(posts):
+    """Rough in-memory footprint of a page, measured once when it is stored"""
+    return sum(len(json.dumps(post, default=str)) for post in posts) * 2
+
+
+class FeedCache:
+    """LRU of feed pages with a TTL and a memory cap.
+
+    Pages are stored as lists of plain dicts and handed out as copies, so
+    patching a cached post never races with a request that is rendering it.
+    A reverse index (post id -> keys) lets a like or comment update every
+    cached page that shows the post without touching the database.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, size, posts, next_cursor)
+        self._by_post = {}              # post id -> set of keys
+        self._bytes = 0
+        # Bumped by every invalidation/patch; a load that started before one
+        # is not stored, so an in-flight query can't resurrect stale data
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'patches': 0,
+        }
+
+    def get_or_load(self, key, loader):
+        """Return (posts, next_cursor) for key, calling loader() on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return [dict(post) for post in entry[2]], entry[3]
+            if entry is not None:
+                self._stats['expirations'] += 1
+                self._remove(key)
+            self._stats['misses'] += 1
+            generation = self._generation
+
+        # Load outside the lock so a slow query never blocks cache hits
+        posts, next_cursor = loader()
+        posts = [dict(post) for post in posts]
+        self._store(key, posts, next_cursor, generation)
+        return [dict(post) for post in posts], next_cursor
+
+    def _store(self, key, posts, next_cursor, generation):
+        size = approx_size(posts)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, posts, next_cursor)
+            self._bytes += size
+            for post in posts:
+                self._by_post.setdefault(post['id'], set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def _remove(self, key):
+        _, size, posts, _ = self._entries.pop(key)
+        self._bytes -= size
+        for post in posts:
+            keys = self._by_post.get(post['id'])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_post[post['id']]
+
+    def invalidate(self, predicate=None):
+        """Drop every entry whose key matches predicate (all entries if None)"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self._remove(key)
+            self._generation += 1
+            self._stats['invalidations'] += len(keys)
+        return len(keys)
+
+    def patch_post(self, post_id, **fields):
+        """Update fields of a post on every cached page that shows it"""
+        with self._lock:
+            keys = self._by_post.get(post_id, ())
+            for key in keys:
+                for post in self._entries[key][2]:
+                    if post['id'] == post_id:
+                        post.update(fields)
+            self._generation += 1
+            self._stats['patches'] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        return self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        stats['ttl'] = self.ttl
+        return stats
+
+
+cache = FeedCache()
+
+
+def get_page(key, loader):
+    return cache.get_or_load(key, loader)
+
+
+def stats():
+    return cache.stats()
+
+
+def on_post_created():
+    """A new post is the newest row, so only first pages (no cursor) change.
+
+    Keyset pages further down are bounded by their cursor and stay valid.
+    """
+    return cache.invalidate(lambda key: key[1] is None)
+
+
+def on_post_liked(post_id, likes_count):
+    return cache.patch_post(post_id, likes_count=likes_count)
+
+
+def on_comment_added(post_id, comments_count):
+    return cache.patch_post(post_id, comments_count=comments_count)
@@ -8,6 +8,7 @@ FINAL VERSION - Modern Social Network
 from flask import Flask, render_template_string, request, redirect, url_for, session, flash, jsonify
 from flask_socketio import SocketIO, emit
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 import sqlite3
 import os
@@ -16,10 +17,14 @@ from datetime import datetime
 import json
 import random
 import base64
+from migrations import Migration, migrate, add_column
+from image_uploads import stream_upload
+from blob_store import BlobStore
+from thumbnails import ThumbnailPipeline
 
 app = Flask(__name__)
 app.secret_key = 'green-world-social-secret-key-2025'
-app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
 # Initialize SocketIO for real-time features
@@ -28,132 +33,183 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Post images are stored once per distinct content; posts keep only the SHA-256.
+# Feed cards load WebP thumbnails made in the background (srcset)
+blobs = BlobStore(os.path.join(app.config['UPLOAD_FOLDER'], 'blobs'))
+thumbnails = ThumbnailPipeline(blobs, app)
+
+# Users table - Real Social Media
+USERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        email TEXT UNIQUE NOT NULL,
+        username TEXT UNIQUE NOT NULL,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        bio TEXT DEFAULT '',
+        profile_image TEXT DEFAULT '',
+        location TEXT DEFAULT '',
+        website TEXT DEFAULT '',
+        followers_count INTEGER DEFAULT 0,
+        following_count INTEGER DEFAULT 0,
+        posts_count INTEGER DEFAULT 0,
+        is_verified BOOLEAN DEFAULT FALSE,
+        is_private BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Posts table - Real Social Media Posts
+POSTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS posts (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        image_url TEXT DEFAULT '',
+        image_data TEXT DEFAULT '',
+        likes_count INTEGER DEFAULT 0,
+        comments_count INTEGER DEFAULT 0,
+        shares_count INTEGER DEFAULT 0,
+        location TEXT DEFAULT '',
+        hashtags TEXT DEFAULT '',
+        is_featured BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Social media interaction tables
+FOLLOWS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS follows (
+        id TEXT PRIMARY KEY,
+        follower_id TEXT NOT NULL,
+        following_id TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (follower_id) REFERENCES users (id),
+        FOREIGN KEY (following_id) REFERENCES users (id),
+        UNIQUE(follower_id, following_id)
+    )
+'''
+
+LIKES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS likes (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        post_id TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (post_id) REFERENCES posts (id),
+        UNIQUE(user_id, post_id)
+    )
+'''
+
+COMMENTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS comments (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        post_id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (post_id) REFERENCES posts (id)
+    )
+'''
+
+MESSAGES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS messages (
+        id TEXT PRIMARY KEY,
+        sender_id TEXT NOT NULL,
+        receiver_id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        read_status BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (sender_id) REFERENCES users (id),
+        FOREIGN KEY (receiver_id) REFERENCES users (id)
+    )
+'''
+
+# Real-time notifications table
+NOTIFICATIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS notifications (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        title TEXT NOT NULL,
+        message TEXT NOT NULL,
+        data TEXT,
+        read_status BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Schema history for green_world_social.db (see migrations.py); append, never edit
+MIGRATIONS = [
+    Migration(1, 'social media tables', [
+        USERS_TABLE, POSTS_TABLE, FOLLOWS_TABLE, LIKES_TABLE, COMMENTS_TABLE, MESSAGES_TABLE, NOTIFICATIONS_TABLE,
+    ]),
+    # Databases created before hashtags/location were added to posts
+    Migration(2, 'posts.hashtags and posts.location', [
+        add_column('posts', 'hashtags', "TEXT DEFAULT ''"),
+        add_column('posts', 'location', "TEXT DEFAULT ''"),
+    ]),
+    # Images move out of the posts table (base64 in image_data, or a file
+    # under /uploads/) into the blob store, referenced by hash
+    Migration(3, 'posts.image_hash; post images moved to the blob store', [
+        add_column('posts', 'image_hash', "TEXT DEFAULT ''"),
+        lambda conn: move_post_images(conn),
+    ]),
+]
+
+def move_post_images(conn):
+    """One-shot move of inline and uploaded post images into the blob store.
+
+    A post whose image_data does not decode is logged and left as it is,
+    rather than failing the migration and with it app start.
+    """
+    moved = skipped = 0
+    rows = conn.execute('''
+        SELECT id FROM posts WHERE image_data != '' OR image_url LIKE '/uploads/%'
+    ''').fetchall()
+    for (post_id,) in rows:
+        # One row at a time: image_data values can be megabytes each
+        image_data, image_url = conn.execute(
+            'SELECT image_data, image_url FROM posts WHERE id = ?', (post_id,)).fetchone()
+        if image_data:
+            try:
+                # Accept data: URLs as well as bare base64
+                data = base64.b64decode(image_data.split(',', 1)[-1])
+            except ValueError as e:
+                # binascii.Error (bad padding or length) is a ValueError, as is non-ASCII input
+                print(f"⚠️ Post {post_id}: image_data is not valid base64, left unmigrated ({e})")
+                skipped += 1
+                continue
+            digest = blobs.put_bytes(data)
+        else:
+            path = os.path.join(app.config['UPLOAD_FOLDER'], image_url[len('/uploads/'):])
+            if not os.path.isfile(path):
+                continue
+            digest = blobs.put_file(path)
+            image_url = ''
+        conn.execute('''
+            UPDATE posts SET image_hash = ?, image_data = '', image_url = ? WHERE id = ?
+        ''', (digest, image_url, post_id))
+        thumbnails.submit(digest)
+        moved += 1
+    if moved or skipped:
+        stats = blobs.stats()
+        print(f"🗃️ Moved {moved} post images to the blob store "
+              f"({stats['stored']} stored, {stats['deduplicated']} duplicates, {skipped} undecodable)")
+
 def init_db():
-    """Initialize Green World Social Media Database"""
+    """Bring the Green World Social database up to the current schema version"""
     conn = sqlite3.connect('green_world_social.db')
-    cursor = conn.cursor()
-    
-    # Users table - Real Social Media
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id TEXT PRIMARY KEY,
-            email TEXT UNIQUE NOT NULL,
-            username TEXT UNIQUE NOT NULL,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            password_hash TEXT NOT NULL,
-            bio TEXT DEFAULT '',
-            profile_image TEXT DEFAULT '',
-            location TEXT DEFAULT '',
-            website TEXT DEFAULT '',
-            followers_count INTEGER DEFAULT 0,
-            following_count INTEGER DEFAULT 0,
-            posts_count INTEGER DEFAULT 0,
-            is_verified BOOLEAN DEFAULT FALSE,
-            is_private BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Posts table - Real Social Media Posts
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS posts (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            content TEXT NOT NULL,
-            image_url TEXT DEFAULT '',
-            image_data TEXT DEFAULT '',
-            likes_count INTEGER DEFAULT 0,
-            comments_count INTEGER DEFAULT 0,
-            shares_count INTEGER DEFAULT 0,
-            location TEXT DEFAULT '',
-            hashtags TEXT DEFAULT '',
-            is_featured BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-
-    # Add missing columns if they don't exist
-    try:
-        cursor.execute('ALTER TABLE posts ADD COLUMN hashtags TEXT DEFAULT ""')
-    except:
-        pass
-    try:
-        cursor.execute('ALTER TABLE posts ADD COLUMN location TEXT DEFAULT ""')
-    except:
-        pass
-
-    # Social media interaction tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS follows (
-            id TEXT PRIMARY KEY,
-            follower_id TEXT NOT NULL,
-            following_id TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (follower_id) REFERENCES users (id),
-            FOREIGN KEY (following_id) REFERENCES users (id),
-            UNIQUE(follower_id, following_id)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS likes (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            post_id TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (post_id) REFERENCES posts (id),
-            UNIQUE(user_id, post_id)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS comments (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            post_id TEXT NOT NULL,
-            content TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (post_id) REFERENCES posts (id)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id TEXT PRIMARY KEY,
-            sender_id TEXT NOT NULL,
-            receiver_id TEXT NOT NULL,
-            content TEXT NOT NULL,
-            read_status BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (sender_id) REFERENCES users (id),
-            FOREIGN KEY (receiver_id) REFERENCES users (id)
-        )
-    ''')
-
-    # Real-time notifications table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            type TEXT NOT NULL,
-            title TEXT NOT NULL,
-            message TEXT NOT NULL,
-            data TEXT,
-            read_status BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    conn.commit()
+    version = migrate(conn, MIGRATIONS)
     conn.close()
-    print("✅ Green World Social Database initialized!")
+    print(f"✅ Green World Social Database initialized! (schema v{version})")
 
 def create_sample_users():
     """Create sample users for the social platform"""
@@ -315,7 +371,9 @@ def get_posts(user_id=None, limit=20):
     conn.row_factory = sqlite3.Row
 
     posts = conn.execute('''
-        SELECT p.*, u.first_name, u.last_name, u.username, u.profile_image
+        SELECT p.id, p.user_id, p.content, p.image_url, p.image_hash, p.location, p.hashtags,
+               p.likes_count, p.comments_count, p.created_at,
+               u.first_name, u.last_name, u.username, u.profile_image
         FROM posts p
         JOIN users u ON p.user_id = u.id
         ORDER BY p.created_at DESC
@@ -325,15 +383,15 @@ def get_posts(user_id=None, limit=20):
     conn.close()
     return [dict(post) for post in posts]
 
-def create_post(user_id, content, image_data=None, location='', hashtags=''):
-    """Create a new post"""
+def create_post(user_id, content, image_hash='', location='', hashtags='', image_url=''):
+    """Create a new post; image_hash refers to an image already in the blob store"""
     post_id = str(uuid.uuid4())
 
     conn = sqlite3.connect('green_world_social.db')
     conn.execute('''
-        INSERT INTO posts (id, user_id, content, image_data, location, hashtags)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (post_id, user_id, content, image_data or '', location, hashtags))
+        INSERT INTO posts (id, user_id, content, image_url, image_hash, location, hashtags)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (post_id, user_id, content, image_url, image_hash, location, hashtags))
 
     # Update user's post count
     conn.execute('''
@@ -1076,7 +1134,11 @@ def feed():
 
                     <div class="post-content">{{ post.content }}</div>
 
-                    {% if post.image_url %}
+                    {% if post.image_hash %}
+                    {% set srcset = image_srcset(post.image_hash) %}
+                    <img src="{{ url_for('blob', digest=post.image_hash) }}" alt="Post image" class="post-image" loading="lazy"
+                         {% if srcset %}srcset="{{ srcset }}" sizes="(max-width: 800px) 100vw, 720px"{% endif %}>
+                    {% elif post.image_url %}
                     <img src="{{ post.image_url }}" alt="Post image" class="post-image">
                     {% endif %}
 
@@ -1277,25 +1339,39 @@ def api_create_post():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
 
-    content = request.form.get('content')
-    location = request.form.get('location', '')
-    hashtags = request.form.get('hashtags', '')
+    # Multipart posts stream their image to disk while the form is parsed;
+    # request.form must not be read first or it would consume the body
+    upload = None
+    if request.mimetype == 'multipart/form-data':
+        try:
+            form, upload = stream_upload(request, 'image', app.config['UPLOAD_FOLDER'],
+                                         max_bytes=app.config['MAX_CONTENT_LENGTH'])
+        except HTTPException as e:
+            return jsonify({'error': e.description}), e.code
+    else:
+        form = request.form
+
+    content = form.get('content')
+    location = form.get('location', '')
+    hashtags = form.get('hashtags', '')
 
     if not content:
+        if upload is not None:
+            os.remove(upload.path)
         return jsonify({'error': 'Content required'}), 400
 
-    # Handle image upload
-    image_data = ''
-    if 'image' in request.files:
-        file = request.files['image']
-        if file and file.filename:
-            # Convert to base64 for demo
-            image_data = base64.b64encode(file.read()).decode('utf-8')
-
-    post_id = create_post(session['user_id'], content, image_data, location, hashtags)
+    image_hash = ''
+    if upload is not None:
+        image_hash = blobs.put_file(upload.path, upload.sha256)
+        thumbnails.submit(image_hash)
+    post_id = create_post(session['user_id'], content, image_hash=image_hash, location=location, hashtags=hashtags)
 
     return jsonify({'success': True, 'post_id': post_id})
 
+@app.route('/blobs/<digest>')
+def blob(digest):
+    return blobs.send(digest)
+
 @app.route('/api/like-post', methods=['POST'])
 def api_like_post():
     if 'user_id' not in session:
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+📤 GREEN WORLD - Streaming Image Uploads
+- multipart/form-data is parsed straight off the request stream, never buffered whole
+- File parts are written to disk in fixed-size chunks as they arrive
+- Magic bytes and image dimensions are checked from the first chunks, before the rest is read
+- Oversize bodies, oversize images and non-images abort immediately and leave no file behind
+- Per-upload size, duration and throughput are logged and counted
+- stream_uploads takes many images in one field, for batch requests
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.http import parse_options_header
+from werkzeug.utils import secure_filename
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+# Decoded size guard: 40 MP is ~160 MB as RGBA once something opens the image
+MAX_PIXELS = 40_000_000
+# JPEG dimensions sit after the EXIF/ICC segments; give up if they aren't found by here
+SNIFF_LIMIT = 256 * 1024
+MAX_FORM_FIELD_BYTES = 64 * 1024
+MAX_PART_HEADER_BYTES = 16 * 1024
+
+IMAGE_TYPES = {
+    'jpeg': ('image/jpeg', 'jpg'),
+    'png': ('image/png', 'png'),
+    'gif': ('image/gif', 'gif'),
+    'webp': ('image/webp', 'webp'),
+}
+# Start-of-frame markers carry the dimensions; C4, C8 and CC are other segments
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_stats_lock = threading.Lock()
+_stats = {'uploads': 0, 'bytes': 0, 'rejected': 0, 'seconds': 0.0}
+
+
+class Upload:
+    """An image stored on disk by stream_upload"""
+
+    def __init__(self, field, filename, path, size, kind, width, height, sha256, seconds):
+        self.field = field
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.kind = kind
+        self.mimetype = IMAGE_TYPES[kind][0]
+        self.width = width
+        self.height = height
+        self.sha256 = sha256
+        self.seconds = seconds
+
+    @property
+    def throughput(self):
+        """Bytes per second received for this upload"""
+        return self.size / self.seconds if self.seconds else 0.0
+
+
+def image_kind(header):
+    """'jpeg', 'png', 'gif' or 'webp' from the first 12 bytes of a file, else None"""
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    if header[:3] == b'\xff\xd8\xff':
+        return 'jpeg'
+    return None
+
+
+def sniff_image(header):
+    """(kind, width, height) from the leading bytes of an image.
+
+    Returns None while more bytes are needed; raises UnsupportedMediaType
+    when the bytes cannot be a supported image.
+    """
+    if len(header) < 12:
+        return None
+    kind = image_kind(header)
+    if kind == 'png':
+        if len(header) < 24:
+            return None
+        if header[12:16] != b'IHDR':
+            raise UnsupportedMediaType('Malformed PNG header')
+        return 'png', int.from_bytes(header[16:20], 'big'), int.from_bytes(header[20:24], 'big')
+    if kind == 'gif':
+        return 'gif', int.from_bytes(header[6:8], 'little'), int.from_bytes(header[8:10], 'little')
+    if kind == 'webp':
+        return _sniff_webp(header)
+    if kind == 'jpeg':
+        return _sniff_jpeg(header)
+    raise UnsupportedMediaType('Only JPEG, PNG, GIF and WebP images can be uploaded')
+
+
+def _sniff_webp(header):
+    if len(header) < 30:
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width = int.from_bytes(header[26:28], 'little') & 0x3FFF
+        height = int.from_bytes(header[28:30], 'little') & 0x3FFF
+    elif chunk == b'VP8L':
+        bits = int.from_bytes(header[21:25], 'little')
+        width, height = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+    else:
+        raise UnsupportedMediaType('Malformed WebP header')
+    return 'webp', width, height
+
+
+def _sniff_jpeg(header):
+    i = 2
+    while i + 4 <= len(header):
+        if header[i] != 0xFF:
+            raise UnsupportedMediaType('Malformed JPEG header')
+        marker = header[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            if i + 9 > len(header):
+                return None
+            return 'jpeg', int.from_bytes(header[i + 7:i + 9], 'big'), int.from_bytes(header[i + 5:i + 7], 'big')
+        i += 2 + int.from_bytes(header[i + 2:i + 4], 'big')
+    return None
+
+
+def stream_upload(request, field, dest_dir, max_bytes=DEFAULT_MAX_BYTES, max_pixels=MAX_PIXELS,
+                  chunk_size=CHUNK_SIZE):
+    """Parse a multipart request, streaming the image in `field` into dest_dir.
+
+    Returns (form, upload): the text fields as a dict and an Upload, or None
+    when the field is missing or empty. Raises RequestEntityTooLarge,
+    UnsupportedMediaType or BadRequest as soon as the input shows it, with
+    the partial file removed. request.form and request.files must not have
+    been touched, since this consumes the request body.
+    """
+    form, uploads = stream_uploads(request, field, dest_dir, max_bytes, max_pixels, max_files=1,
+                                   chunk_size=chunk_size)
+    return form, (uploads[0] if uploads else None)
+
+
+def stream_uploads(request, field, dest_dir, max_bytes=DEFAULT_MAX_BYTES, max_pixels=MAX_PIXELS,
+                   max_files=None, chunk_size=CHUNK_SIZE):
+    """Like stream_upload, but stores every image sent in `field` (up to max_files).
+
+    Returns (form, uploads) with the uploads in request order. Further files
+    beyond max_files are skipped. If any part is rejected, the files already
+    stored for this request are removed too.
+    """
+    mimetype, options = parse_options_header(request.headers.get('Content-Type', ''))
+    boundary = options.get('boundary', '').encode('latin-1')
+    if mimetype != 'multipart/form-data' or not boundary:
+        raise BadRequest('Expected a multipart/form-data upload')
+    if request.content_length is not None and request.content_length > max_bytes:
+        _record_rejection()
+        raise RequestEntityTooLarge()
+
+    received = 0
+
+    def read(size):
+        nonlocal received
+        data = request.stream.read(size)
+        received += len(data)
+        if received > max_bytes:
+            raise RequestEntityTooLarge()
+        return data
+
+    form, field_parts, uploads = {}, [], []
+    writer = None
+    starting = True
+    started = time.perf_counter()
+    try:
+        for name, filename, data, done in iter_multipart(read, boundary, chunk_size):
+            if starting:
+                field_parts = []
+                writer = None
+                if name == field and filename and (max_files is None or len(uploads) < max_files):
+                    writer = _ImageWriter(dest_dir, filename, max_pixels)
+                part_started = time.perf_counter()
+            if filename is None:
+                field_parts.append(data)
+                if sum(map(len, field_parts)) > MAX_FORM_FIELD_BYTES:
+                    raise RequestEntityTooLarge(f'Form field {name!r} is too long')
+                if done:
+                    form[name] = b''.join(field_parts).decode('utf-8', 'replace')
+            elif writer is not None:
+                if data:
+                    writer.write(data)
+                if done:
+                    # The first file's time includes the request preamble, as before
+                    seconds = time.perf_counter() - (part_started if uploads else started)
+                    uploads.append(writer.finish(field, seconds))
+                    writer = None
+            starting = done
+    except Exception:
+        if writer is not None:
+            writer.discard()
+        for upload in uploads:
+            os.remove(upload.path)
+        _record_rejection()
+        raise
+    for upload in uploads:
+        _record_upload(upload)
+    return form, uploads
+
+
+def iter_multipart(read, boundary, chunk_size=CHUNK_SIZE):
+    """Yield (name, filename, data, done) for each piece of each part of a multipart body.
+
+    filename is None for plain fields. Everything except a possible partial
+    delimiter is handed on as soon as it is read, so memory stays at about
+    one chunk whatever the part size.
+    """
+    delimiter = b'\r\n--' + boundary
+    keep = len(delimiter) - 1
+    # The first delimiter has no line break before it
+    buffer = bytearray(b'\r\n')
+    state = 'preamble'
+    name = filename = None
+    eof = False
+    while True:
+        if state == 'part_start':
+            # Some encoders (Werkzeug's test client) put no line break
+            # between an empty part's headers and the next delimiter
+            if len(buffer) >= keep - 1 or eof:
+                if buffer.startswith(delimiter[2:]):
+                    buffer[:0] = b'\r\n'
+                state = 'body'
+                continue
+        elif state in ('preamble', 'body'):
+            index = buffer.find(delimiter)
+            if index == -1:
+                if eof:
+                    raise BadRequest('Multipart body ended before its closing boundary')
+                if len(buffer) > keep:
+                    if state == 'body':
+                        yield name, filename, bytes(buffer[:-keep]), False
+                    del buffer[:-keep]
+            else:
+                if state == 'body':
+                    yield name, filename, bytes(buffer[:index]), True
+                del buffer[:index + len(delimiter)]
+                state = 'delimiter'
+                continue
+        elif state == 'delimiter':
+            if buffer[:2] == b'--':
+                return
+            line_end = buffer.find(b'\r\n')
+            if line_end != -1:
+                del buffer[:line_end + 2]
+                state = 'headers'
+                continue
+        elif state == 'headers':
+            headers_end = 0 if buffer[:2] == b'\r\n' else buffer.find(b'\r\n\r\n')
+            if headers_end != -1:
+                disposition = ''
+                for line in bytes(buffer[:headers_end]).decode('utf-8', 'replace').split('\r\n'):
+                    key, _, value = line.partition(':')
+                    if key.strip().lower() == 'content-disposition':
+                        disposition = value.strip()
+                _, params = parse_options_header(disposition)
+                name, filename = params.get('name', ''), params.get('filename')
+                del buffer[:headers_end + (2 if headers_end == 0 else 4)]
+                state = 'part_start'
+                continue
+            if len(buffer) > MAX_PART_HEADER_BYTES:
+                raise BadRequest('Multipart part headers are too long')
+        if eof:
+            raise BadRequest('Multipart body ended unexpectedly')
+        data = read(chunk_size)
+        eof = not data
+        buffer += data
+
+
+class _ImageWriter:
+    """Writes one file part to a temporary path, validating it as it grows"""
+
+    def __init__(self, dest_dir, filename, max_pixels):
+        os.makedirs(dest_dir, exist_ok=True)
+        self.dest_dir = dest_dir
+        self.filename = filename
+        self.max_pixels = max_pixels
+        self.temp_path = os.path.join(dest_dir, f'.{uuid.uuid4()}.part')
+        self.file = open(self.temp_path, 'wb')
+        self.digest = hashlib.sha256()
+        self.header = b''
+        self.image = None
+        self.size = 0
+        self.closed = False
+
+    def write(self, data):
+        if self.image is None:
+            self.header += data
+            self.image = sniff_image(self.header)
+            if self.image is None and len(self.header) > SNIFF_LIMIT:
+                raise UnsupportedMediaType('Image dimensions not found in the file header')
+            if self.image is not None:
+                kind, width, height = self.image
+                if width <= 0 or height <= 0 or width * height > self.max_pixels:
+                    raise RequestEntityTooLarge(f'{width}x{height} image exceeds {self.max_pixels} pixels')
+                self.header = b''
+        self.file.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+    def finish(self, field, seconds):
+        self.file.close()
+        self.closed = True
+        if self.image is None:
+            raise UnsupportedMediaType('Empty or truncated image')
+        kind, width, height = self.image
+        stem = os.path.splitext(secure_filename(self.filename))[0] or 'image'
+        final_name = f'{uuid.uuid4()}_{stem}.{IMAGE_TYPES[kind][1]}'
+        path = os.path.join(self.dest_dir, final_name)
+        os.replace(self.temp_path, path)
+        return Upload(field, final_name, path, self.size, kind, width, height,
+                      self.digest.hexdigest(), seconds)
+
+    def discard(self):
+        if not self.closed:
+            self.file.close()
+            self.closed = True
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def _record_upload(upload):
+    with _stats_lock:
+        _stats['uploads'] += 1
+        _stats['bytes'] += upload.size
+        _stats['seconds'] += upload.seconds
+    print(f"📥 Upload {upload.filename}: {upload.width}x{upload.height} {upload.kind}, "
+          f"{upload.size / 1024:.1f} KB in {upload.seconds * 1000:.1f} ms "
+          f"({upload.throughput / 1e6:.1f} MB/s)")
+
+
+def _record_rejection():
+    with _stats_lock:
+        _stats['rejected'] += 1
+
+
+def stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['mb_per_second'] = round(stats['bytes'] / stats['seconds'] / 1e6, 2) if stats['seconds'] else 0.0
+    stats['seconds'] = round(stats['seconds'], 3)
+    return stats
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+🧬 GREEN WORLD - Schema Migration Runner
+- Versioned migrations keyed on PRAGMA user_version
+- Only the missing steps run, all inside one transaction
+- Warm starts read a single PRAGMA and do no DDL at all
+- Helpers for adding columns and indexes without table rewrites
+"""
+
+import sqlite3
+import time
+from collections import namedtuple
+
+# steps: SQL strings or callables taking the connection, applied in order
+Migration = namedtuple('Migration', ['version', 'description', 'steps'])
+
+
+class MigrationError(Exception):
+    """Raised when a migration step fails; the whole batch is rolled back"""
+
+
+def current_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def column_names(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def add_column(table, column, declaration):
+    """Step that adds a column unless it already exists.
+
+    SQLite's ADD COLUMN only edits the schema entry, so it is constant time
+    whatever the table size, as long as the default is a constant.
+    """
+    def step(conn):
+        if column not in column_names(conn, table):
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+    step.__name__ = f'add_column_{table}_{column}'
+    return step
+
+
+def create_index(name, table, columns, unique=False):
+    """Step that creates an index (a new b-tree; the table itself is untouched)"""
+    return f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+
+
+def drop_index(name):
+    return f'DROP INDEX IF EXISTS {name}'
+
+
+def migrate(conn, migrations, target=None):
+    """Apply every migration newer than the database's user_version.
+
+    Returns the schema version after running. The pending steps and the new
+    user_version are committed together, so a failure leaves the database
+    exactly at its previous version.
+    """
+    migrations = sorted(migrations, key=lambda m: m.version)
+    target = migrations[-1].version if target is None else target
+
+    # Warm start: nothing to do beyond this single read
+    if current_version(conn) >= target:
+        return current_version(conn)
+
+    started = time.perf_counter()
+    if conn.in_transaction:
+        conn.commit()
+    # IMMEDIATE takes the write lock up front so two processes booting at once
+    # serialize here instead of both applying the same steps
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        version = current_version(conn)
+        applied = []
+        for migration in migrations:
+            if migration.version <= version or migration.version > target:
+                continue
+            for step in migration.steps:
+                try:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                except sqlite3.Error as e:
+                    raise MigrationError(f'Migration {migration.version} ({migration.description}) failed: {e}') from e
+            applied.append(migration)
+            version = migration.version
+        conn.execute(f'PRAGMA user_version = {int(version)}')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for migration in applied:
+        print(f"   🧬 v{migration.version}: {migration.description}")
+    if applied:
+        print(f"✅ Schema migrated to v{version} ({len(applied)} step(s), {elapsed_ms:.1f} ms)")
+    return version
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+🌿 GREEN WORLD - Plant Catalog
+- Species records are loaded once at import from plant_catalog.json (GREEN_WORLD_PLANT_CATALOG for another file)
+- Records are read-only; callers get plain dict copies
+- Inverted token index over common_name, aliases, scientific_name, family, type and benefits
+- Prefix matches bisect a sorted vocabulary, so a query only touches matching postings, never every species
+- rank(): typo-tolerant top-k search; a trigram index proposes words, bounded edit distance verifies
+  them, and BM25F (names weighted highest) scores the species
+- lookup() resolves a free-text plant name; search() filters the catalog
+- Try it from the command line: python plant_catalog.py "snak plant" monstra
+"""
+
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+import sys
+import time
+from types import MappingProxyType
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plant_catalog.json')
+# BM25F field weights: a word in a plant's name says more than one in its benefits
+FIELD_WEIGHTS = {
+    'common_name': 3.0,
+    'aliases': 3.0,
+    'scientific_name': 2.0,
+    'family': 1.0,
+    'type': 1.0,
+    'benefits': 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Typos allowed per query word, by word length: none up to 2 letters, one up to 5, then two
+MAX_EDITS = ((2, 0), (5, 1))
+DEFAULT_MAX_EDITS = 2
+# A half-typed last word counts a little less than a whole one
+PREFIX_WEIGHT = 0.8
+# Bounds on the work per query word: trigram candidates verified, words expanded to
+MAX_VERIFIED = 64
+MAX_EXPANSIONS = 32
+DEFAULT_LIMIT = 10
+# rank(popularity=...): a species searched n times scores (1 + POPULARITY_WEIGHT * ln(1 + n)) times
+# more, enough to order close matches without burying a better match
+POPULARITY_WEIGHT = 0.05
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Lower-case alphanumeric words of text"""
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(word, pad_end=True):
+    """Character trigrams of a word padded with two spaces at the start (and end)"""
+    padded = f"  {word}  " if pad_end else f"  {word}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(word):
+    for length, edits in MAX_EDITS:
+        if len(word) <= length:
+            return edits
+    return DEFAULT_MAX_EDITS
+
+
+def edit_distance(word, candidate, limit):
+    """Levenshtein distance from word to candidate and to candidate's closest prefix.
+
+    Returns (whole, prefix); anything above limit comes back as limit + 1,
+    and the work stops as soon as every alignment is past the limit.
+    """
+    over = limit + 1
+    if len(candidate) > len(word) + limit:
+        candidate = candidate[:len(word) + limit]
+        whole_possible = False
+    else:
+        whole_possible = True
+    previous = list(range(len(candidate) + 1))
+    for i, char in enumerate(word, 1):
+        current = [i]
+        for j, other in enumerate(candidate, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        if min(current) > limit:
+            return over, over
+        previous = current
+    whole = previous[-1] if whole_possible and previous[-1] <= limit else over
+    return whole, min(min(previous), over)
+
+
+def _freeze(record):
+    return MappingProxyType({key: tuple(value) if isinstance(value, list) else value
+                             for key, value in record.items()})
+
+
+def to_dict(record):
+    """Plain, JSON-ready copy of a catalog record"""
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in record.items()}
+
+
+def _field_tokens(record, field):
+    values = record.get(field) or ()
+    tokens = []
+    for value in (values,) if isinstance(values, str) else values:
+        tokens.extend(tokenize(value))
+    return tokens
+
+
+class PlantCatalog:
+    """Immutable species records plus the indexes that answer lookups.
+
+    Each term's postings are record positions in ascending order (so filtered
+    results keep catalog order) with the term's BM25F weight in each record.
+    Names (common name and aliases) get an index of their own for lookup(),
+    which should not match on a family or a benefit.
+    """
+
+    def __init__(self, records):
+        started = time.perf_counter()
+        self.records = tuple(_freeze(record) for record in records)
+        self._positions = {record['id']: position for position, record in enumerate(self.records)}
+        self._build_postings()
+        self._build_names()
+        self._build_trigrams()
+        self.build_seconds = time.perf_counter() - started
+
+    def _build_postings(self):
+        count = len(self.records) or 1
+        tokenized = [{field: _field_tokens(record, field) for field in FIELD_WEIGHTS} for record in self.records]
+        average_length = {field: sum(len(fields[field]) for fields in tokenized) / count or 1.0
+                          for field in FIELD_WEIGHTS}
+
+        # Weighted, length-normalized term frequency summed over fields (BM25F)
+        frequencies = {}
+        for position, fields in enumerate(tokenized):
+            weighted = {}
+            for field, tokens in fields.items():
+                if not tokens:
+                    continue
+                norm = FIELD_WEIGHTS[field] / (1 - BM25_B + BM25_B * len(tokens) / average_length[field])
+                for token in tokens:
+                    weighted[token] = weighted.get(token, 0.0) + norm
+            for token, frequency in weighted.items():
+                frequencies.setdefault(token, []).append((position, frequency))
+
+        self._postings = {}
+        for token, entries in frequencies.items():
+            idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            self._postings[token] = (
+                tuple(position for position, _ in entries),
+                tuple(idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1) for _, frequency in entries),
+            )
+        # Same position tuples, for filtering without weights
+        self._index = {token: postings[0] for token, postings in self._postings.items()}
+        self._vocabulary = sorted(self._postings)
+
+    def _build_names(self):
+        name_index = {}
+        self._names = {}          # normalized name -> position
+        self._record_names = []   # position -> token sets of each name
+        for position, record in enumerate(self.records):
+            names = []
+            for name in (record['common_name'],) + tuple(record.get('aliases') or ()):
+                name_tokens = tokenize(name)
+                if not name_tokens:
+                    continue
+                self._names.setdefault(' '.join(name_tokens), position)
+                names.append(frozenset(name_tokens))
+                for token in name_tokens:
+                    positions = name_index.setdefault(token, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+            self._record_names.append(tuple(names))
+        self._name_index = {token: tuple(positions) for token, positions in name_index.items()}
+        self._name_vocabulary = sorted(self._name_index)
+
+    def _build_trigrams(self):
+        # trigram -> ids (into _vocabulary) of the terms containing it
+        index = {}
+        for term_id, term in enumerate(self._vocabulary):
+            for gram in trigrams(term):
+                index.setdefault(gram, []).append(term_id)
+        self._trigrams = index
+
+    def __len__(self):
+        return len(self.records)
+
+    @staticmethod
+    def _prefix_terms(vocabulary, prefix):
+        for index in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[index].startswith(prefix):
+                break
+            yield vocabulary[index]
+
+    def _match(self, vocabulary, index, tokens):
+        """Positions matching every token (the last one as a prefix, since it may be half typed)"""
+        matched = None
+        for number, token in enumerate(tokens):
+            if number == len(tokens) - 1:
+                positions = set()
+                for term in self._prefix_terms(vocabulary, token):
+                    positions.update(index[term])
+            else:
+                positions = set(index.get(token, ()))
+            matched = positions if matched is None else matched & positions
+            if not matched:
+                return []
+        return sorted(matched)
+
+    def search(self, query, limit=None):
+        """Records whose indexed fields contain every word of query, in catalog order"""
+        tokens = tokenize(query or '')
+        if not tokens:
+            positions = range(len(self.records))
+        else:
+            positions = self._match(self._vocabulary, self._index, tokens)
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.records[position] for position in positions]
+
+    def expand(self, word, prefix=False):
+        """Vocabulary terms a query word may stand for, with a similarity in (0, 1].
+
+        The word itself scores 1; a term within max_edits(word) edits scores
+        less per edit. With prefix=True (the word may be half typed) terms
+        that start with it, or with a near miss of it, count too.
+        """
+        matches = {}
+        if word in self._postings:
+            matches[word] = 1.0
+        if prefix and len(word) >= 2:
+            for term in self._prefix_terms(self._vocabulary, word):
+                if len(matches) >= MAX_EXPANSIONS:
+                    break
+                matches.setdefault(term, PREFIX_WEIGHT)
+
+        limit = max_edits(word)
+        if limit:
+            # Each edit breaks at most three trigrams, so a term within `limit`
+            # edits shares at least this many with the word
+            grams = trigrams(word, pad_end=not prefix)
+            needed = len(grams) - 3 * limit
+            counts = {}
+            for gram in grams:
+                for term_id in self._trigrams.get(gram, ()):
+                    counts[term_id] = counts.get(term_id, 0) + 1
+            candidates = heapq.nlargest(MAX_VERIFIED, (item for item in counts.items() if item[1] >= needed),
+                                        key=lambda item: item[1])
+            for term_id, _ in candidates:
+                term = self._vocabulary[term_id]
+                if term in matches:
+                    continue
+                whole, head = edit_distance(word, term, limit)
+                if whole <= limit:
+                    matches[term] = 1.0 - whole / (len(word) + 1)
+                elif prefix and head <= limit:
+                    matches[term] = PREFIX_WEIGHT * (1.0 - head / (len(word) + 1))
+        return matches
+
+    def _expansions(self, tokens):
+        return [self.expand(token, prefix=number == len(tokens) - 1) for number, token in enumerate(tokens)]
+
+    def _boost(self, scores, popularity):
+        # Walk whichever is smaller: the matches or the searched species
+        if len(scores) <= len(popularity):
+            boosts = ((position, popularity.get(self.records[position]['id'])) for position in scores)
+        else:
+            boosts = ((self._positions.get(species_id), searches) for species_id, searches in popularity.items())
+        for position, searches in boosts:
+            if searches and position in scores:
+                scores[position] *= 1 + POPULARITY_WEIGHT * math.log1p(searches)
+
+    def _top(self, expansions, limit, popularity=None):
+        """Top `limit` (position, score) pairs for per-word expansions"""
+        scores = {}
+        for matches in expansions:
+            best = None
+            # Closest terms first, so the common case (one exact term) is a single C-level dict build
+            for term, similarity in sorted(matches.items(), key=lambda item: -item[1]):
+                positions, weights = self._postings[term]
+                if similarity != 1.0:
+                    weights = [weight * similarity for weight in weights]
+                if best is None:
+                    best = dict(zip(positions, weights))
+                    continue
+                for position, weight in zip(positions, weights):
+                    if weight > best.get(position, 0.0):
+                        best[position] = weight
+            if not best:
+                continue
+            # Add the smaller map into the larger one
+            if len(best) > len(scores):
+                scores, best = best, scores
+            for position, weight in best.items():
+                scores[position] = scores.get(position, 0.0) + weight
+        if not scores:
+            return []
+        if popularity:
+            self._boost(scores, popularity)
+        # Everything scoring at least the limit-th best, then ties broken by catalog order
+        cutoff = heapq.nlargest(limit, scores.values())[-1]
+        top = sorted((-score, position) for position, score in scores.items() if score >= cutoff)[:limit]
+        return [(position, -score) for score, position in top]
+
+    def rank(self, query, limit=DEFAULT_LIMIT, popularity=None):
+        """Top `limit` (record, score) pairs for query, best first, tolerating typos.
+
+        Every query word adds its best-matching term's BM25F weight, scaled
+        by how close the term is to the word; the last word may be half typed.
+        popularity ({species id: searches}) nudges often searched species up.
+        """
+        top = self._top(self._expansions(tokenize(query or '')), limit, popularity)
+        return [(self.records[position], score) for position, score in top]
+
+    def lookup(self, name):
+        """The record a free-text plant name refers to, or None.
+
+        An exact common name or alias wins. Otherwise the longest name whose
+        words all appear in the text ("my rose bush" -> Rose), failing that
+        the first name starting with the text ("snake" -> Snake Plant), and
+        finally the best typo-tolerant match ("monstra" -> Monstera Deliciosa).
+        """
+        tokens = tokenize(name or '')
+        if not tokens:
+            return None
+        position = self._names.get(' '.join(tokens))
+        if position is not None:
+            return self.records[position]
+
+        words = set(tokens)
+        best = None
+        for candidate in {position for token in words for position in self._name_index.get(token, ())}:
+            for name_tokens in self._record_names[candidate]:
+                if name_tokens <= words and (best is None or (len(name_tokens), -candidate) > best[0]):
+                    best = ((len(name_tokens), -candidate), candidate)
+        if best is not None:
+            return self.records[best[1]]
+
+        positions = self._match(self._name_vocabulary, self._name_index, tokens)
+        if positions:
+            return self.records[positions[0]]
+        # Only a species whose own name matched, not one that merely shares a benefit or family
+        expansions = self._expansions(tokens)
+        top = self._top(expansions, limit=1)
+        if not top:
+            return None
+        terms = set().union(*expansions)
+        position = top[0][0]
+        if any(name_tokens & terms for name_tokens in self._record_names[position]):
+            return self.records[position]
+        return None
+
+    def stats(self):
+        return {'species': len(self.records), 'terms': len(self._vocabulary), 'trigrams': len(self._trigrams),
+                'build_ms': round(self.build_seconds * 1000, 2)}
+
+
+def load(path=None):
+    """Catalog from a JSON list of species records"""
+    with open(path or os.environ.get('GREEN_WORLD_PLANT_CATALOG', DEFAULT_PATH), encoding='utf-8') as f:
+        return PlantCatalog(json.load(f))
+
+
+catalog = load()
+
+
+def search(query, limit=None):
+    return catalog.search(query, limit)
+
+
+def rank(query, limit=DEFAULT_LIMIT, popularity=None):
+    return catalog.rank(query, limit, popularity)
+
+
+def lookup(name):
+    return catalog.lookup(name)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    print(f"🌿 {catalog.stats()}")
+    for query in argv:
+        record = catalog.lookup(query)
+        print(f"🔍 {query!r}: lookup -> {record['common_name'] if record else None}")
+        for match, score in catalog.rank(query, limit=5):
+            print(f"   {score:6.2f}  {match['common_name']} ({match['scientific_name']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🔬 GREEN WORLD - Image-Based Plant Health Scoring
+- Scores dehydration, stress and sunlight from the uploaded photo instead of at random
+- Works on a copy downscaled to at most 256 px, so latency is bounded whatever the upload size
+- Pixel statistics are NumPy-vectorized: HSV conversion, leaf masks, histograms, edge density
+- Same image, same scores: results are deterministic
+- Needs NumPy and Pillow; without them analysis falls back to the previous simulated scores
+- Inspect an image from the command line: python plant_health.py leaf.jpg
+"""
+
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image, ImageOps
+except ImportError:
+    np = Image = ImageOps = None
+
+ANALYSIS_SIZE = 256
+# Bump whenever measure() or score() change, so cached results are recomputed
+SCORING_VERSION = 2
+
+# Hue bands in degrees, and the minimum saturation/value for a pixel to count as coloured
+GREEN_HUES = (55, 170)
+YELLOW_HUES = (38, 55)
+# Dry leaf tissue; redder hues are left out so ripe fruit does not count as browning
+BROWN_HUES = (18, 38)
+# Dry leaves are tan; darker browns are soil, bark or shadow
+BROWN_VALUES = (0.3, 0.7)
+MIN_SATURATION = 0.18
+MIN_VALUE = 0.12
+# Mean hue of well-watered foliage; leaves drying out drift from it towards yellow
+# well before whole areas turn yellow or brown
+HEALTHY_GREEN_HUE = 105
+HUE_DRIFT_SPAN = 40
+# Discoloured pixels only count as leaf tissue when this close (px) to green foliage;
+# further away they are soil, pots or background
+LEAF_REACH = 4
+SATURATION_BINS = 8
+
+# Score ranges match the simulated analysis, so the thresholds downstream keep their meaning
+DEHYDRATION_RANGE = (0.1, 0.9)
+STRESS_RANGE = (0.1, 0.8)
+SUNLIGHT_RANGE = (0.2, 0.9)
+
+
+def available():
+    return np is not None
+
+
+def load_pixels(path, size=ANALYSIS_SIZE):
+    """RGB pixels of an image file as a float32 array in [0, 1], at most size px on a side"""
+    with Image.open(path) as image:
+        # JPEG can decode straight at a reduced scale
+        image.draft('RGB', (size, size))
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        image.thumbnail((size, size), Image.BILINEAR)
+        return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def to_hsv(rgb):
+    """Hue in degrees, saturation and value arrays for an (h, w, 3) RGB array"""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    value = rgb.max(axis=-1)
+    chroma = value - rgb.min(axis=-1)
+    safe_chroma = np.maximum(chroma, 1e-6)
+    saturation = np.where(value > 0, chroma / np.maximum(value, 1e-6), 0.0)
+    hue = np.where(value == r, ((g - b) / safe_chroma) % 6,
+                   np.where(value == g, (b - r) / safe_chroma + 2, (r - g) / safe_chroma + 4)) * 60.0
+    return np.where(chroma > 0, hue, 0.0), saturation, value
+
+
+def dilate(mask, steps):
+    """Grow a boolean mask by `steps` pixels (4-neighbourhood)"""
+    grown = mask.copy()
+    for _ in range(steps):
+        shifted = grown.copy()
+        shifted[1:] |= grown[:-1]
+        shifted[:-1] |= grown[1:]
+        shifted[:, 1:] |= grown[:, :-1]
+        shifted[:, :-1] |= grown[:, 1:]
+        grown = shifted
+    return grown
+
+
+def boundary(mask):
+    """Pixels of a mask with at least one 4-neighbour outside it"""
+    interior = mask.copy()
+    interior[1:] &= mask[:-1]
+    interior[:-1] &= mask[1:]
+    interior[:, 1:] &= mask[:, :-1]
+    interior[:, :-1] &= mask[:, 1:]
+    return mask & ~interior
+
+
+def _band(hue, bounds):
+    return (hue >= bounds[0]) & (hue < bounds[1])
+
+
+def _scale(value, bounds):
+    return bounds[0] + (bounds[1] - bounds[0]) * float(np.clip(value, 0.0, 1.0))
+
+
+def measure(rgb):
+    """Colour-space statistics of the foliage in an (h, w, 3) RGB array"""
+    hue, saturation, value = to_hsv(rgb)
+    coloured = (saturation >= MIN_SATURATION) & (value >= MIN_VALUE)
+    green = coloured & _band(hue, GREEN_HUES)
+    near_leaves = dilate(green, LEAF_REACH)
+    yellow = coloured & _band(hue, YELLOW_HUES) & (value >= 0.35) & near_leaves
+    brown = (coloured & _band(hue, BROWN_HUES) & (saturation < 0.75) & _band(value, BROWN_VALUES)
+             & near_leaves)
+    foliage = green | yellow | brown
+
+    leaf_pixels = int(foliage.sum())
+    stats = {'pixels': int(foliage.size), 'coverage': leaf_pixels / foliage.size}
+    if leaf_pixels == 0:
+        return dict(stats, green_ratio=0.0, green_hue=HEALTHY_GREEN_HUE, yellow_fraction=0.0,
+                    brown_fraction=0.0, saturation_mean=0.0,
+                    washed_out=0.0, saturation_histogram=[0.0] * SATURATION_BINS, brightness_mean=0.0,
+                    highlights=0.0, shadows=0.0, brightness_histogram=[0.0] * SATURATION_BINS,
+                    edge_ratio=0.0, texture=0.0)
+
+    leaf_saturation = saturation[foliage]
+    leaf_value = value[foliage]
+    saturation_histogram, _ = np.histogram(leaf_saturation, bins=SATURATION_BINS, range=(0.0, 1.0))
+    brightness_histogram, _ = np.histogram(leaf_value, bins=SATURATION_BINS, range=(0.0, 1.0))
+
+    # Curled or drooping leaves show as a ragged outline (more edge per unit area)
+    # and as strong light/dark creases inside the leaf
+    edge_ratio = float(boundary(foliage).sum()) / (2.0 * np.sqrt(np.pi * leaf_pixels))
+    gradient = np.abs(np.diff(value, axis=0))[:, :-1] + np.abs(np.diff(value, axis=1))[:-1, :]
+    texture = float(gradient[foliage[:-1, :-1]].mean())
+
+    return dict(
+        stats,
+        green_ratio=float(green.sum()) / leaf_pixels,
+        green_hue=float(hue[green].mean()) if green.any() else HEALTHY_GREEN_HUE,
+        yellow_fraction=float(yellow.sum()) / leaf_pixels,
+        brown_fraction=float(brown.sum()) / leaf_pixels,
+        saturation_mean=float(leaf_saturation.mean()),
+        washed_out=float((leaf_saturation < 0.3).mean()),
+        saturation_histogram=(saturation_histogram / leaf_pixels).round(4).tolist(),
+        brightness_mean=float(leaf_value.mean()),
+        highlights=float((leaf_value > 0.9).mean()),
+        shadows=float((leaf_value < 0.2).mean()),
+        brightness_histogram=(brightness_histogram / leaf_pixels).round(4).tolist(),
+        edge_ratio=edge_ratio,
+        texture=texture,
+    )
+
+
+def score(stats):
+    """dehydration_score, stress_score, sunlight_score and confidence_score from measure() statistics"""
+    discoloured = stats['yellow_fraction'] + stats['brown_fraction']
+    drift = np.clip((HEALTHY_GREEN_HUE - stats['green_hue']) / HUE_DRIFT_SPAN, 0.0, 1.0)
+    # Foliage outlines run 2-10x the perimeter of a disc of the same area; creased,
+    # curling leaves add strong brightness changes inside the leaf as well. Speckled
+    # soil and busy backgrounds do too, so curl only nudges the colour evidence
+    curl = (0.3 * np.clip((stats['edge_ratio'] - 2.0) / 8.0, 0.0, 1.0)
+            + 0.7 * np.clip((stats['texture'] - 0.05) / 0.2, 0.0, 1.0))
+    dehydration = (0.25 * np.clip(stats['brown_fraction'] / 0.3, 0, 1) + 0.25 * np.clip(stats['yellow_fraction'] / 0.3, 0, 1)
+                   + 0.3 * drift + 0.1 * curl + 0.1 * stats['washed_out'])
+    stress = (0.45 * np.clip(discoloured / 0.5, 0, 1) + 0.2 * (1 - stats['saturation_mean'])
+              + 0.2 * drift + 0.15 * curl)
+    sunlight = np.clip((stats['brightness_mean'] - 0.15) / 0.65, 0, 1) * 0.8 + np.clip(stats['highlights'] * 4, 0, 1) * 0.2
+    # Little foliage in frame: the scores above rest on few pixels
+    confidence = 50 + 48 * np.clip(stats['coverage'] / 0.25, 0.0, 1.0)
+    return {
+        'dehydration_score': _scale(dehydration, DEHYDRATION_RANGE),
+        'stress_score': _scale(stress, STRESS_RANGE),
+        'sunlight_score': _scale(sunlight, SUNLIGHT_RANGE),
+        'confidence_score': int(round(confidence)),
+    }
+
+
+def analyze_image(path):
+    """Scores and the statistics behind them for the image at path"""
+    stats = measure(load_pixels(path))
+    return dict(score(stats), stats=stats)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not available():
+        print("🚨 NumPy and Pillow are required: pip install numpy Pillow")
+        return 1
+    for path in argv:
+        result = analyze_image(path)
+        stats = result['stats']
+        print(f"🔬 {path}")
+        print(f"   dehydration {result['dehydration_score']:.2f}   stress {result['stress_score']:.2f}   "
+              f"sunlight {result['sunlight_score']:.2f}   confidence {result['confidence_score']}%")
+        print(f"   foliage {stats['coverage']:.0%}   green {stats['green_ratio']:.0%}   "
+              f"hue {stats['green_hue']:.0f}   yellow {stats['yellow_fraction']:.0%}   brown {stats['brown_fraction']:.0%}   "
+              f"saturation {stats['saturation_mean']:.2f}   brightness {stats['brightness_mean']:.2f}   "
+              f"edges {stats['edge_ratio']:.2f}   texture {stats['texture']:.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+🔤 GREEN WORLD - Plant Name Autocomplete
+- Completes a typed prefix of a common name, alias or scientific name, or of any later word in one ("lily" -> Peace Lily)
+- All name keys live in one sorted array built once from the plant catalog; a prefix is a bisect away
+- Crowded prefixes (and the empty one) keep a precomputed top-k, so no query walks more than SCAN_LIMIT keys
+- Most searched species first; reweight() swaps in new search counts without blocking readers
+"""
+
+import bisect
+import heapq
+import threading
+import time
+
+import plant_catalog
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# A prefix matching more keys than this gets its top MAX_LIMIT precomputed
+SCAN_LIMIT = 64
+
+# Sorts after every character a key can contain
+_KEY_END = '\U0010ffff'
+
+
+class PlantSuggester:
+    """Prefix completion over a PlantCatalog, ranked by popularity.
+
+    Every name is indexed from each of its word starts, so "peace lily"
+    yields the keys "peace lily" and "lily". Matches rank by searches
+    (most first), then names matched from their first word, then
+    alphabetically; a species is suggested once however many keys match.
+    """
+
+    def __init__(self, catalog, popularity=None):
+        started = time.perf_counter()
+        self.catalog = catalog
+        entries = set()
+        for position, record in enumerate(catalog.records):
+            names = (record['common_name'], record['scientific_name']) + tuple(record.get('aliases') or ())
+            for name in names:
+                tokens = plant_catalog.tokenize(name or '')
+                for start in range(len(tokens)):
+                    entries.add((' '.join(tokens[start:]), start > 0, position))
+        entries = sorted(entries)
+        self._keys = [key for key, _, _ in entries]
+        self._entries = entries
+        self._positions = {record['id']: position for position, record in enumerate(catalog.records)}
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'precomputed_hits': 0, 'reweights': 0}
+        self.reweighted_at = None
+        self.reweight(popularity or {})
+        self.build_seconds = time.perf_counter() - started
+
+    def reweight(self, popularity):
+        """Re-rank from {species id: searches}; queries keep using the old ranking until the swap"""
+        searches = [0] * len(self.catalog.records)
+        for species_id, count in popularity.items():
+            position = self._positions.get(species_id)
+            if position is not None:
+                searches[position] = count
+        ranks = [(-searches[position], later_word, key, position) for key, later_word, position in self._entries]
+
+        # Walk down from the empty prefix: only a crowded prefix can have crowded extensions
+        top = {}
+        spans = [(0, len(self._keys))]
+        length = 0
+        while spans:
+            crowded = []
+            for start, end in spans:
+                index = start
+                while index < end:
+                    key = self._keys[index]
+                    if len(key) < length:
+                        index += 1
+                        continue
+                    prefix = key[:length]
+                    stop = bisect.bisect_left(self._keys, prefix + _KEY_END, index, end)
+                    if stop - index > SCAN_LIMIT:
+                        top[prefix] = self._best(ranks, index, stop, MAX_LIMIT)
+                        crowded.append((index, stop))
+                    index = stop
+            spans = crowded
+            length += 1
+
+        state = (ranks, top, searches)
+        with self._lock:
+            self._state = state
+            self._stats['reweights'] += 1
+            self.reweighted_at = time.time()
+
+    @staticmethod
+    def _best(ranks, start, end, limit):
+        positions = []
+        # Over-fetch a little: a species can match through several of its names
+        for _, _, _, position in heapq.nsmallest(limit * 2, ranks[start:end]):
+            if position not in positions:
+                positions.append(position)
+                if len(positions) == limit:
+                    break
+        return tuple(positions)
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        """Up to `limit` species completing prefix, as dicts (most searched first)"""
+        limit = max(1, min(limit, MAX_LIMIT))
+        key = ' '.join(plant_catalog.tokenize(prefix or ''))
+        ranks, top, searches = self._state
+        positions = top.get(key)
+        with self._lock:
+            self._stats['queries'] += 1
+            if positions is not None:
+                self._stats['precomputed_hits'] += 1
+        if positions is None:
+            start = bisect.bisect_left(self._keys, key)
+            end = bisect.bisect_left(self._keys, key + _KEY_END, start)
+            positions = self._best(ranks, start, end, limit)
+
+        suggestions = []
+        for position in positions[:limit]:
+            record = self.catalog.records[position]
+            suggestions.append({'id': record['id'], 'common_name': record['common_name'],
+                                'scientific_name': record['scientific_name'], 'searches': searches[position]})
+        return suggestions
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['precomputed_prefixes'] = len(self._state[1])
+        stats['keys'] = len(self._keys)
+        stats['build_ms'] = round(self.build_seconds * 1000, 2)
+        stats['reweighted_at'] = self.reweighted_at
+        return stats
+
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+📡 GREEN WORLD - Outbound Real-Time Event Dispatcher
+- Request handlers publish events; a background task emits them
+- Every event goes to a room (feed, post or user), never to all clients
+- Bursts coalesce: events sharing a key within one window keep only the latest
+- Counters for published, coalesced and emitted events
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_WINDOW = 0.1
+FEED_ROOM = 'social_feed'
+# Per-client cap on watch_posts so one socket can't join unbounded rooms
+MAX_WATCHED_POSTS = 200
+
+
+def post_room(post_id):
+    return f'post_{post_id}'
+
+
+def user_room(user_id):
+    return f'user_{user_id}'
+
+
+class EventDispatcher:
+    """Queue of outbound Socket.IO events drained every ``window`` seconds.
+
+    ``publish`` only touches an in-memory dict, so the request thread never
+    waits on socket I/O. Events published with a ``coalesce`` key replace any
+    queued event with the same (event, room, key); the emit loop runs as a
+    Flask-SocketIO background task (a greenlet under eventlet).
+    """
+
+    def __init__(self, socketio, window=DEFAULT_WINDOW, autostart=True):
+        self.socketio = socketio
+        self.window = window
+        self.autostart = autostart
+        self._queue = OrderedDict()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._task = None
+        self._stats = {'published': 0, 'coalesced': 0, 'emitted': 0, 'flushes': 0, 'errors': 0}
+
+    def publish(self, event, data, room, coalesce=None):
+        """Queue an event for a room; coalesce=key collapses bursts to the latest"""
+        with self._lock:
+            if coalesce is None:
+                self._sequence += 1
+                key = (event, room, None, self._sequence)
+            else:
+                key = (event, room, coalesce)
+                if key in self._queue:
+                    self._stats['coalesced'] += 1
+            # Re-inserting keeps the slot of the first event in the burst
+            self._queue[key] = (event, data, room)
+            self._stats['published'] += 1
+            if self._task is None and self.autostart:
+                self._task = self.socketio.start_background_task(self._run)
+
+    def flush(self):
+        """Emit everything queued; returns the number of events sent"""
+        with self._lock:
+            batch, self._queue = self._queue, OrderedDict()
+        for event, data, room in batch.values():
+            try:
+                self.socketio.emit(event, data, to=room)
+            except Exception as e:
+                with self._lock:
+                    self._stats['errors'] += 1
+                print(f"⚠️ Failed to emit {event} to {room}: {e}")
+        with self._lock:
+            self._stats['emitted'] += len(batch)
+            if batch:
+                self._stats['flushes'] += 1
+        return len(batch)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.window)
+            self.flush()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._queue)
+        stats['window_ms'] = self.window * 1000
+        stats['running'] = self._task is not None
+        return stats
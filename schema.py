@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+🗂️ GREEN WORLD - Social Schema (green_world.db)
+- Table definitions and the versioned migration list run at startup
+- Secondary indexes for the hot feed, history, quiz and notification queries
+- app_meta key/value table for one-off markers
+- Materialized home timelines for the followed-users feed
+- Plant analysis result cache keyed by image hash
+"""
+
+from werkzeug.security import generate_password_hash
+
+import timeline
+from migrations import Migration, add_column, create_index, drop_index
+
+# Users table
+USERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        email TEXT UNIQUE NOT NULL,
+        username TEXT UNIQUE NOT NULL,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        bio TEXT,
+        location TEXT,
+        website TEXT,
+        phone TEXT,
+        profile_image TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Posts table for social media features
+POSTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS posts (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        title TEXT,
+        content TEXT NOT NULL,
+        image_url TEXT,
+        video_url TEXT,
+        tags TEXT,
+        likes_count INTEGER DEFAULT 0,
+        comments_count INTEGER DEFAULT 0,
+        shares_count INTEGER DEFAULT 0,
+        post_type TEXT DEFAULT 'general',
+        is_featured BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Enhanced plant analyses table
+PLANT_ANALYSES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS plant_analyses (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        image_url TEXT NOT NULL,
+        plant_name TEXT,
+        plant_type TEXT,
+        dehydration_level TEXT NOT NULL,
+        dehydration_score REAL,
+        stress_level TEXT,
+        stress_score REAL,
+        sunlight_exposure TEXT,
+        sunlight_score REAL,
+        sunlight_warning TEXT,
+        disease_detected TEXT,
+        pest_detected TEXT,
+        overall_health_score REAL,
+        confidence_score REAL,
+        symptoms TEXT,
+        recommendations TEXT,
+        prevention_tips TEXT,
+        cure_suggestions TEXT,
+        watering_schedule TEXT,
+        fertilizer_recommendation TEXT,
+        urgency_level TEXT,
+        recovery_time TEXT,
+        follow_up_date TEXT,
+        notes TEXT,
+        analysis_status TEXT DEFAULT 'completed',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Social media tables
+FOLLOWS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS follows (
+        id TEXT PRIMARY KEY,
+        follower_id TEXT NOT NULL,
+        following_id TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (follower_id) REFERENCES users (id),
+        FOREIGN KEY (following_id) REFERENCES users (id),
+        UNIQUE(follower_id, following_id)
+    )
+'''
+
+LIKES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS likes (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        post_id TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (post_id) REFERENCES posts (id),
+        UNIQUE(user_id, post_id)
+    )
+'''
+
+COMMENTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS comments (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        post_id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (post_id) REFERENCES posts (id)
+    )
+'''
+
+MESSAGES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS messages (
+        id TEXT PRIMARY KEY,
+        sender_id TEXT NOT NULL,
+        receiver_id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        read_status BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (sender_id) REFERENCES users (id),
+        FOREIGN KEY (receiver_id) REFERENCES users (id)
+    )
+'''
+
+# Real-time notifications table
+NOTIFICATIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS notifications (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        title TEXT NOT NULL,
+        message TEXT NOT NULL,
+        data TEXT,
+        read_status BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Plant searches table
+PLANT_SEARCHES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS plant_searches (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        search_query TEXT NOT NULL,
+        plant_data TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Quiz attempts table
+QUIZ_ATTEMPTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS quiz_attempts (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        level TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        total_questions INTEGER NOT NULL,
+        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# User achievements table
+USER_ACHIEVEMENTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS user_achievements (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        flower_title TEXT NOT NULL,
+        flower_image_url TEXT NOT NULL,
+        level TEXT NOT NULL,
+        earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Key/value table for one-off markers (seeding, backfills, ...)
+APP_META_TABLE = '''
+    CREATE TABLE IF NOT EXISTS app_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+SOCIAL_INDEXES = [
+    # get_social_feed: discovery/public branch ORDER BY created_at DESC LIMIT n
+    ('idx_posts_created_at', 'posts', 'created_at'),
+    # get_social_feed: followed-users branch, one range per author
+    ('idx_posts_user_created', 'posts', 'user_id, created_at'),
+    ('idx_comments_post_created', 'comments', 'post_id, created_at'),
+    ('idx_likes_post', 'likes', 'post_id'),
+    # follower lookups (UNIQUE(follower_id, following_id) already covers followees)
+    ('idx_follows_following', 'follows', 'following_id'),
+    ('idx_notifications_user_created', 'notifications', 'user_id, created_at'),
+    # get_plant_history: WHERE user_id = ? ORDER BY created_at DESC
+    ('idx_plant_analyses_user_created', 'plant_analyses', 'user_id, created_at'),
+    ('idx_plant_searches_user_created', 'plant_searches', 'user_id, created_at'),
+    # per-level leaderboards
+    ('idx_quiz_attempts_level_score', 'quiz_attempts', 'level, score'),
+    # api_quiz_leaderboard: ORDER BY percentage DESC, completed_at DESC
+    ('idx_quiz_attempts_percentage', 'quiz_attempts', '(score * 100.0 / total_questions), completed_at'),
+    # achievements page quiz statistics: WHERE user_id = ? GROUP BY level
+    ('idx_quiz_attempts_user_level', 'quiz_attempts', 'user_id, level'),
+    ('idx_user_achievements_user_earned', 'user_achievements', 'user_id, earned_at'),
+]
+
+# get_social_feed keyset pagination: ORDER BY created_at DESC, id DESC with
+# (created_at, id) < (cursor) needs id in the index to avoid a sort per page.
+# These supersede idx_posts_created_at / idx_posts_user_created.
+FEED_KEYSET_INDEXES = [
+    ('idx_posts_created_id', 'posts', 'created_at, id'),
+    ('idx_posts_user_created_id', 'posts', 'user_id, created_at, id'),
+]
+
+# Materialized home timelines (fan-out-on-write, see timeline.py). The primary
+# key is the feed order, so a page is a single range scan of one user's rows.
+TIMELINES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS timelines (
+        user_id TEXT NOT NULL,
+        created_at TIMESTAMP NOT NULL,
+        post_id TEXT NOT NULL,
+        author_id TEXT NOT NULL,
+        PRIMARY KEY (user_id, created_at, post_id)
+    ) WITHOUT ROWID
+'''
+
+# Image scores by photo SHA-256; version is plant_health.SCORING_VERSION
+PLANT_ANALYSIS_CACHE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS plant_analysis_cache (
+        image_hash TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        result TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID
+'''
+
+# Plant search rollups (see search_rollups.py): searches per normalized query,
+# and per day and resulting plant name
+PLANT_SEARCH_QUERY_COUNTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS plant_search_query_counts (
+        query TEXT PRIMARY KEY,
+        plant_name TEXT,
+        searches INTEGER NOT NULL,
+        last_searched TIMESTAMP NOT NULL
+    ) WITHOUT ROWID
+'''
+
+PLANT_SEARCH_DAILY_COUNTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS plant_search_daily_counts (
+        day TEXT NOT NULL,
+        plant_name TEXT NOT NULL,
+        searches INTEGER NOT NULL,
+        PRIMARY KEY (day, plant_name)
+    ) WITHOUT ROWID
+'''
+
+BACKFILL_FOLLOWERS_COUNT = '''
+    UPDATE users SET followers_count = (
+        SELECT COUNT(*) FROM follows WHERE follows.following_id = users.id
+    )
+'''
+
+# Demo analyses for the demo account
+DEMO_ANALYSES = [
+    ('demo1', '1', 'demo1.jpg', 'Monstera Deliciosa', 'Tropical', 'Moderately Dehydrated', 0.65, 'Low Stress', 0.25, 'Adequate', 0.75, 'None', 'None', 0.72, 88,
+     '["Slight wilting", "Dry soil", "Brown edges"]',
+     '["Water thoroughly", "Check moisture weekly"]',
+     '["Consistent watering", "Monitor humidity"]',
+     '["Adjust watering schedule", "Improve drainage"]',
+     'Water every 7-10 days', 'Monthly liquid fertilizer', 'Medium', '3-5 days', '2024-01-20', 'Responding well'),
+
+    ('demo2', '1', 'demo2.jpg', 'Fiddle Leaf Fig', 'Indoor Tree', 'Severely Dehydrated', 0.85, 'High Stress', 0.80, 'Insufficient', 0.45, 'Leaf Spot', 'None', 0.45, 92,
+     '["Brown leaf edges", "Dropping leaves", "Dry soil"]',
+     '["Immediate watering", "Relocate to brighter spot"]',
+     '["Consistent schedule", "Proper drainage"]',
+     '["IMMEDIATE INTERVENTION", "Assess root system", "Apply fungicide"]',
+     'Water every 5-7 days', 'Diluted fertilizer bi-weekly', 'High', '1-2 weeks', '2024-01-25', 'Critical condition'),
+
+    ('demo3', '1', 'demo3.jpg', 'Snake Plant', 'Succulent', 'Well Hydrated', 0.30, 'No Stress', 0.10, 'Good', 0.85, 'None', 'None', 0.92, 95,
+     '["Healthy green leaves", "Firm texture"]',
+     '["Continue current routine"]',
+     '["Avoid overwatering", "Good drainage"]',
+     '["Maintain current care", "Regular pruning"]',
+     'Water every 2-3 weeks', 'Fertilize quarterly', 'Low', 'Healthy', '2024-02-01', 'Excellent condition')
+]
+
+
+def insert_demo_account(conn):
+    """Demo user (test@example.com / test) and its analysis history"""
+    conn.execute('''
+        INSERT OR IGNORE INTO users
+        (id, email, username, first_name, last_name, password_hash)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', ('1', 'test@example.com', 'testuser', 'Plant', 'Expert', generate_password_hash('test')))
+
+    conn.executemany('''
+        INSERT OR IGNORE INTO plant_analyses
+        (id, user_id, image_url, plant_name, plant_type, dehydration_level, dehydration_score, stress_level, stress_score, sunlight_exposure, sunlight_score, disease_detected, pest_detected, overall_health_score, confidence_score, symptoms, recommendations, prevention_tips, cure_suggestions, watering_schedule, fertilizer_recommendation, urgency_level, recovery_time, follow_up_date, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', DEMO_ANALYSES)
+
+
+# Never edit a released migration; append a new one instead.
+MIGRATIONS = [
+    Migration(1, 'social, plant analysis and quiz tables', [
+        USERS_TABLE, POSTS_TABLE, PLANT_ANALYSES_TABLE, FOLLOWS_TABLE, LIKES_TABLE,
+        COMMENTS_TABLE, MESSAGES_TABLE, NOTIFICATIONS_TABLE, PLANT_SEARCHES_TABLE,
+        QUIZ_ATTEMPTS_TABLE, USER_ACHIEVEMENTS_TABLE,
+        insert_demo_account,
+    ]),
+    Migration(2, 'app_meta table and social secondary indexes', [APP_META_TABLE] + [
+        create_index(name, table, columns) for name, table, columns in SOCIAL_INDEXES
+    ]),
+    Migration(3, 'keyset pagination indexes for the social feed', [
+        create_index(name, table, columns) for name, table, columns in FEED_KEYSET_INDEXES
+    ] + [
+        drop_index('idx_posts_created_at'),
+        drop_index('idx_posts_user_created'),
+    ]),
+    Migration(4, 'fan-out-on-write home timelines', [
+        add_column('users', 'followers_count', 'INTEGER DEFAULT 0'),
+        BACKFILL_FOLLOWERS_COUNT,
+        TIMELINES_TABLE,
+        # unfollow: DELETE ... WHERE user_id = ? AND author_id = ?
+        create_index('idx_timelines_user_author', 'timelines', 'user_id, author_id'),
+        timeline.rebuild,
+    ]),
+    Migration(5, 'plant analysis result cache', [PLANT_ANALYSIS_CACHE_TABLE]),
+    Migration(6, 'plant search rollups', [PLANT_SEARCH_QUERY_COUNTS_TABLE, PLANT_SEARCH_DAILY_COUNTS_TABLE]),
+]
+
+
+def get_meta(conn, key, default=None):
+    row = conn.execute('SELECT value FROM app_meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(conn, key, value):
+    conn.execute('''
+        INSERT INTO app_meta (key, value) VALUES (?, ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+    ''', (key, str(value)))
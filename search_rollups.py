@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+📈 GREEN WORLD - Plant Search Rollups
+- fold() adds new plant_searches rows into compact counters: per normalized query, and per day and plant
+- A high-water mark (the last folded rowid, in app_meta) means each run reads only rows added since the last one
+- Each batch and its new mark commit together, so no search is counted twice or missed
+- Once rolled up and older than the retention window, a search's plant_data JSON payload is dropped
+- Searches per catalog species feed search ranking and autocomplete weights
+"""
+
+import os
+import threading
+import time
+
+import plant_catalog
+from schema import get_meta, set_meta
+
+ROLLUP_MARK = 'plant_search_rollup_rowid'
+PAYLOAD_MARK = 'plant_search_payload_rowid'
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_PAYLOAD_DAYS = int(os.environ.get('GREEN_WORLD_SEARCH_PAYLOAD_DAYS', '30'))
+DEFAULT_INTERVAL = float(os.environ.get('GREEN_WORLD_SEARCH_ROLLUP_INTERVAL', '300'))
+# What a dropped payload is replaced with (plant_data is NOT NULL)
+EMPTY_PAYLOAD = '{}'
+
+
+def normalize_query(query):
+    """The query as it is counted: lower-case words separated by single spaces"""
+    return ' '.join(plant_catalog.tokenize(query or ''))
+
+
+class SearchRollups:
+    """Incremental search analytics over plant_searches.
+
+    plant_searches has an implicit rowid that only grows (rows are never
+    deleted), so "rowid > mark" is exactly the rows not folded yet.
+    popularity ({species id: searches}) is rebuilt by refresh() and replaced
+    whole, so readers never see it half updated.
+    """
+
+    def __init__(self, catalog, batch_size=DEFAULT_BATCH_SIZE, payload_days=DEFAULT_PAYLOAD_DAYS):
+        self.catalog = catalog
+        self.batch_size = batch_size
+        self.payload_days = payload_days
+        self.popularity = {}
+        self._lock = threading.Lock()
+        self._stats = {'runs': 0, 'rows_folded': 0, 'payloads_dropped': 0, 'last_run_ms': 0.0}
+
+    def fold(self, conn):
+        """Add every plant_searches row past the mark to the counters; returns how many were folded"""
+        folded = 0
+        while True:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                mark = int(get_meta(conn, ROLLUP_MARK, 0))
+                rows = conn.execute('''
+                    SELECT rowid, search_query, json_extract(plant_data, '$.name'), created_at
+                    FROM plant_searches
+                    WHERE rowid > ?
+                    ORDER BY rowid
+                    LIMIT ?
+                ''', (mark, self.batch_size)).fetchall()
+                if not rows:
+                    conn.rollback()
+                    break
+
+                queries = {}   # query -> [plant name, searches, last searched]
+                days = {}      # (day, plant name) -> searches
+                for _, search_query, plant_name, created_at in rows:
+                    counts = queries.setdefault(normalize_query(search_query), [plant_name, 0, created_at])
+                    counts[0] = plant_name
+                    counts[1] += 1
+                    counts[2] = max(counts[2], created_at)
+                    day = (created_at[:10], plant_name or '')
+                    days[day] = days.get(day, 0) + 1
+
+                conn.executemany('''
+                    INSERT INTO plant_search_query_counts (query, plant_name, searches, last_searched)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(query) DO UPDATE SET
+                        plant_name = excluded.plant_name,
+                        searches = searches + excluded.searches,
+                        last_searched = max(last_searched, excluded.last_searched)
+                ''', [(query, plant_name, searches, last) for query, (plant_name, searches, last) in queries.items()])
+                conn.executemany('''
+                    INSERT INTO plant_search_daily_counts (day, plant_name, searches)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(day, plant_name) DO UPDATE SET searches = searches + excluded.searches
+                ''', [(day, plant_name, searches) for (day, plant_name), searches in days.items()])
+                set_meta(conn, ROLLUP_MARK, rows[-1][0])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            folded += len(rows)
+            if len(rows) < self.batch_size:
+                break
+        with self._lock:
+            self._stats['rows_folded'] += folded
+        return folded
+
+    def drop_payloads(self, conn):
+        """Blank plant_data of searches already folded and older than payload_days; returns rows changed.
+
+        Each search is judged by its own created_at, so one written late with
+        an old timestamp is still trimmed. A second mark sits just below the
+        oldest folded search still inside the window: everything at or below
+        it is settled, so a run scans from there to the rollup mark only.
+        """
+        dropped = 0
+        cutoff = f'-{self.payload_days} days'
+        settled = True
+        while True:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Once a young search holds the mark back, carry on from the last batch instead
+                start = int(get_meta(conn, PAYLOAD_MARK, 0)) if settled else end
+                folded = int(get_meta(conn, ROLLUP_MARK, 0))
+                end = min(folded, start + self.batch_size)
+                if end <= start:
+                    conn.rollback()
+                    break
+
+                changed = conn.execute('''
+                    UPDATE plant_searches SET plant_data = ?
+                    WHERE rowid > ? AND rowid <= ? AND created_at < datetime('now', ?) AND plant_data != ?
+                ''', (EMPTY_PAYLOAD, start, end, cutoff, EMPTY_PAYLOAD)).rowcount
+                if settled:
+                    # Stop the mark short of the first search still inside the window
+                    young = conn.execute('''
+                        SELECT MIN(rowid) FROM plant_searches
+                        WHERE rowid > ? AND rowid <= ? AND created_at >= datetime('now', ?)
+                    ''', (start, end, cutoff)).fetchone()[0]
+                    settled = young is None
+                    set_meta(conn, PAYLOAD_MARK, end if settled else young - 1)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            dropped += changed
+        with self._lock:
+            self._stats['payloads_dropped'] += dropped
+        return dropped
+
+    def searches_by_species(self, conn):
+        """{catalog species id: searches} from the daily counters"""
+        popularity = {}
+        for plant_name, searches in conn.execute('''
+            SELECT plant_name, SUM(searches) FROM plant_search_daily_counts GROUP BY plant_name
+        '''):
+            # Saved care guides carry the catalog's common name; unknown plants resolve to None
+            plant = self.catalog.lookup(plant_name) if plant_name else None
+            if plant is not None:
+                popularity[plant['id']] = popularity.get(plant['id'], 0) + searches
+        return popularity
+
+    def refresh(self, conn):
+        """Fold new searches, drop expired payloads and rebuild popularity; returns the popularity"""
+        started = time.perf_counter()
+        self.fold(conn)
+        self.drop_payloads(conn)
+        self.popularity = self.searches_by_species(conn)
+        with self._lock:
+            self._stats['runs'] += 1
+            self._stats['last_run_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return self.popularity
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['species_ranked'] = len(self.popularity)
+        stats['payload_days'] = self.payload_days
+        return stats
+
+
+def start_rollup_task(refresh, socketio=None, interval=DEFAULT_INTERVAL):
+    """Call refresh() every `interval` seconds in the background"""
+    sleep = socketio.sleep if socketio is not None else time.sleep
+
+    def rollup_loop():
+        while True:
+            sleep(interval)
+            try:
+                refresh()
+            except Exception as e:
+                print(f"⚠️ Plant search rollup failed: {e}")
+
+    if socketio is not None:
+        return socketio.start_background_task(rollup_loop)
+    thread = threading.Thread(target=rollup_loop, name='plant-search-rollup', daemon=True)
+    thread.start()
+    return thread
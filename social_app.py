@@ -10,11 +10,16 @@ import json
 import random
 import requests
 
+from compression import CompressionMiddleware
+
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this-in-production'
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+# gzip/brotli and ETag/304 for pages and APIs
+app.wsgi_app = CompressionMiddleware(app.wsgi_app)
+
 # Initialize SocketIO for real-time features
 socketio = SocketIO(app, cors_allowed_origins="*")
 
@@ -994,9 +999,6 @@ def dashboard():
     if 'user_id' not in session:
         return redirect(url_for('login'))
 
-    # Create sample data if it doesn't exist
-    create_sample_data()
-
     # Get user's posts including sample posts
     conn = sqlite3.connect('greenverse_social.db')
     conn.row_factory = sqlite3.Row
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🗜️ GREEN WORLD - Compression Middleware Tests
+- gzip and brotli bodies are smaller than identity and decode back to it
+- Small responses, opted-out routes and streamed responses are handled as configured
+- A matching If-None-Match is answered with an empty 304
+
+Usage:
+    python -m pytest -q test_compression.py
+"""
+
+import gzip
+import json
+
+import pytest
+from flask import Flask, Response, jsonify
+
+import compression
+from compression import CompressionMiddleware
+
+PAGE = ('<li class="post">🌱 Watering schedule for my monstera</li>\n' * 200).encode('utf-8')
+MIN_SIZE = 1024
+
+
+@pytest.fixture
+def middleware():
+    app = Flask(__name__)
+
+    @app.get('/page')
+    def page():
+        return Response(PAGE, mimetype='text/html')
+
+    @app.get('/small')
+    def small():
+        return jsonify(status='ok')
+
+    @app.get('/raw/page')
+    def raw_page():
+        return Response(PAGE, mimetype='text/html')
+
+    @app.get('/live/page')
+    def live_page():
+        return Response(PAGE, mimetype='text/html')
+
+    @app.get('/stream')
+    def stream():
+        return Response((PAGE for _ in range(3)), mimetype='text/html')
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=MIN_SIZE, rules={
+        '/raw/': {'compress': False},
+        '/live/': {'etag': False},
+    })
+    return app
+
+
+@pytest.fixture
+def client(middleware):
+    return middleware.test_client()
+
+
+def test_gzip_is_smaller_than_identity(client):
+    identity = client.get('/page')
+    encoded = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    assert identity.headers.get('Content-Encoding') is None
+    assert identity.data == PAGE
+    assert encoded.headers['Content-Encoding'] == 'gzip'
+    assert len(encoded.data) < len(identity.data)
+    assert int(encoded.headers['Content-Length']) == len(encoded.data)
+    assert gzip.decompress(encoded.data) == PAGE
+    assert 'Accept-Encoding' in encoded.headers['Vary']
+
+
+@pytest.mark.skipif(compression.brotli is None, reason='brotli is not installed')
+def test_brotli_is_smaller_than_identity_and_gzip(client):
+    identity = client.get('/page')
+    gzipped = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    encoded = client.get('/page', headers={'Accept-Encoding': 'br, gzip'})
+    assert encoded.headers['Content-Encoding'] == 'br'
+    assert len(encoded.data) < len(identity.data)
+    assert len(encoded.data) <= len(gzipped.data)
+    assert compression.brotli.decompress(encoded.data) == PAGE
+
+
+def test_response_under_threshold_passes_through(client):
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert len(response.data) < MIN_SIZE
+    assert response.headers.get('Content-Encoding') is None
+    assert json.loads(response.data) == {'status': 'ok'}
+
+
+def test_matching_if_none_match_returns_empty_304(client):
+    first = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+
+    revalidated = client.get('/page', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+
+    # The validator is shared by every encoding of the same content
+    assert client.get('/page', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/page', headers={'If-None-Match': 'W/"stale"'}).status_code == 200
+
+
+def test_route_can_opt_out_of_compression(client):
+    response = client.get('/raw/page', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') is None
+    assert response.data == PAGE
+    # Only compression was turned off; revalidation still works
+    assert client.get('/raw/page', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_route_can_opt_out_of_etags(client):
+    response = client.get('/live/page', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'ETag' not in response.headers
+    assert client.get('/live/page', headers={'If-None-Match': '*'}).status_code == 200
+
+
+def test_streamed_response_is_compressed_incrementally(client):
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data) == PAGE * 3
+
+
+def test_non_get_requests_are_untouched(middleware):
+    @middleware.post('/echo')
+    def echo():
+        return Response(PAGE, mimetype='text/html')
+
+    response = middleware.test_client().post('/echo', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') is None
+    assert response.data == PAGE
+
+
+def test_stats_count_bytes_saved(middleware, client):
+    client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    stats = middleware.wsgi_app.stats()
+    assert stats['compressed'] == 1
+    assert stats['bytes_saved'] > 0
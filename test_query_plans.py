@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+🔎 GREEN WORLD - Query Plan Regression Tests
+- Calls the real hot-path functions in app.py against a freshly migrated, seeded database
+- Every statement they run is captured with sqlite3's trace callback, so there is no copied SQL to drift
+- Fails if EXPLAIN QUERY PLAN shows a full table scan, or a sort that no index provides
+
+Usage:
+    python -m pytest -q test_query_plans.py
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+TMP_DIR = tempfile.mkdtemp(prefix='green_world_plans_')
+os.environ['GREEN_WORLD_DB'] = os.path.join(TMP_DIR, 'plans.db')
+os.environ.setdefault('GREEN_WORLD_ASSET_DIR', os.path.join(TMP_DIR, 'assets'))
+
+import app as green_world  # noqa: E402  (reads GREEN_WORLD_DB at import)
+import database  # noqa: E402
+import engagement  # noqa: E402
+import timeline  # noqa: E402
+
+# Statements worth planning; BEGIN/COMMIT/PRAGMA and friends have no plan
+PLANNED = ('SELECT', 'WITH', 'INSERT', 'REPLACE', 'UPDATE', 'DELETE')
+
+READER = 'user_002'
+AUTHOR = 'user_001'
+# Followed by READER and made too big to fan out on write, so reads merge them in;
+# two of them, since a single author is planned as a plain equality
+READ_TIME_AUTHORS = ('user_003', 'user_004')
+DEMO_EMAIL, DEMO_PASSWORD, DEMO_USER = 'test@example.com', 'test', '1'
+
+
+def plan_problems(detail):
+    """Reasons a single EXPLAIN QUERY PLAN line is unacceptable"""
+    problems = []
+    if detail.startswith('SCAN ') and ' USING ' not in detail and detail != 'SCAN CONSTANT ROW':
+        problems.append('full table scan')
+    if 'USE TEMP B-TREE FOR ORDER BY' in detail:
+        problems.append('sort without index')
+    return problems
+
+
+@pytest.fixture(scope='module')
+def statements():
+    """Captured SQL; every pooled connection reports into it"""
+    green_world.bootstrap()
+    captured = []
+    pool = database.get_pool()
+    # Open the pool to its full size so no untraced connection appears later
+    conns = [pool.acquire() for _ in range(pool.max_size)]
+    for conn in conns:
+        conn.set_trace_callback(captured.append)
+    for conn in conns:
+        pool.release(conn)
+
+    with green_world.app.test_request_context():
+        green_world.follow_user(READER, AUTHOR)
+        for author in READ_TIME_AUTHORS:
+            green_world.follow_user(READER, author)
+            green_world.get_db().execute('UPDATE users SET followers_count = ? WHERE id = ?',
+                                         (timeline.FANOUT_FOLLOWER_LIMIT + 1, author))
+        green_world.get_db().commit()
+        green_world.save_quiz_attempt(DEMO_USER, 'simple', 4, 5)
+        green_world.save_achievement(DEMO_USER, 'Rose', '/static/rose.png', 'simple')
+
+    yield captured
+    for conn in conns:
+        conn.set_trace_callback(None)
+
+
+@pytest.fixture
+def client():
+    client = green_world.app.test_client()
+    client.post('/login', data={'email': DEMO_EMAIL, 'password': DEMO_PASSWORD})
+    return client
+
+
+def run_in_request(fn):
+    with green_world.app.test_request_context():
+        return fn()
+
+
+def public_feed():
+    # An unusual page size, so the feed cache cannot answer instead of the database
+    _, cursor = green_world.get_social_feed(None, limit=3)
+    green_world.get_social_feed(None, limit=3, cursor=cursor)
+
+
+def home_timeline():
+    _, cursor = green_world.get_social_feed(READER, limit=3)
+    green_world.get_social_feed(READER, limit=3, cursor=cursor)
+
+
+def create_post():
+    green_world.create_post(AUTHOR, 'Plan check', 'Fanned out to followers')
+
+
+def follow_and_unfollow():
+    green_world.follow_user(AUTHOR, READER)
+    green_world.unfollow_user(AUTHOR, READER)
+
+
+def like_post():
+    post_id = green_world.get_db().execute('SELECT id FROM posts WHERE user_id = ? LIMIT 1', (AUTHOR,)).fetchone()[0]
+    green_world.like_post(READER, post_id)
+    engagement.likes.flush()
+
+
+def add_comment():
+    post_id = green_world.get_db().execute('SELECT id FROM posts WHERE user_id = ? LIMIT 1', (AUTHOR,)).fetchone()[0]
+    green_world.add_comment(READER, post_id, 'Lovely leaves')
+
+
+def plant_history():
+    list(green_world.iter_plant_history(DEMO_USER))
+    green_world.get_plant_history_stats(DEMO_USER)
+
+
+HOT_PATHS = {
+    'get_social_feed: public/discovery pages': lambda client: run_in_request(public_feed),
+    'get_social_feed: home timeline pages': lambda client: run_in_request(home_timeline),
+    'create_post: timeline fan-out': lambda client: run_in_request(create_post),
+    'follow_user / unfollow_user': lambda client: run_in_request(follow_and_unfollow),
+    'like_post and like flush': lambda client: run_in_request(like_post),
+    'add_comment': lambda client: run_in_request(add_comment),
+    'login': lambda client: client.post('/login', data={'email': DEMO_EMAIL, 'password': DEMO_PASSWORD}),
+    'plant history and stats': lambda client: run_in_request(plant_history),
+    'achievements page': lambda client: client.get('/achievements').get_data(),
+    'quiz leaderboard': lambda client: client.get('/api/quiz/leaderboard').get_data(),
+}
+
+
+@pytest.mark.parametrize('name', list(HOT_PATHS))
+def test_hot_path_uses_indexes(name, statements, client):
+    del statements[:]
+    HOT_PATHS[name](client)
+    executed = [sql for sql in statements if sql.lstrip().split(None, 1)[0].upper() in PLANNED]
+    assert executed, f'{name} ran no SQL'
+
+    conn = sqlite3.connect(os.environ['GREEN_WORLD_DB'])
+    try:
+        failures = []
+        for sql in executed:
+            for row in conn.execute('EXPLAIN QUERY PLAN ' + sql):
+                failures.extend(f'{problem}: {row[3]}\n{sql.strip()}' for problem in plan_problems(row[3]))
+    finally:
+        conn.close()
+    assert not failures, '\n\n'.join(failures)
+
+
+def test_plan_problems():
+    assert plan_problems('SCAN posts') == ['full table scan']
+    assert plan_problems('SCAN p USING INDEX idx_posts_created_id') == []
+    assert plan_problems('SEARCH u USING INTEGER PRIMARY KEY (rowid=?)') == []
+    assert plan_problems('USE TEMP B-TREE FOR ORDER BY') == ['sort without index']
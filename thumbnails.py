@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+🖼️ GREEN WORLD - Background Thumbnails
+- Every stored image gets WebP copies at a few fixed widths, made in a worker pool after upload
+- Copies sit next to the original blob (<sha256>.w320.webp) and never change, like the blob itself
+- Templates get srcset strings so browsers fetch the smallest copy that fills the slot
+- Needs Pillow; without it nothing is generated and pages keep using the original image
+- Backfill existing uploads: python thumbnails.py [uploads/blobs], or flask --app app thumbnails to
+  also bring older analyzer uploads (uploads/<uuid>_<name>) into the blob store first
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import abort, url_for
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+DEFAULT_WIDTHS = (320, 640, 960)
+DEFAULT_WORKERS = 2
+WEBP_QUALITY = 80
+# Bound on the in-memory record of which widths exist for which blob
+MAX_KNOWN = 10000
+# Empty file next to a blob narrower than every width, so backfills pass it over
+SKIPPED_MARKER = 'small.skip'
+
+
+def variant_name(width):
+    return f'w{width}.webp'
+
+
+class ThumbnailPipeline:
+    """Generates and serves resized WebP copies of images in a BlobStore.
+
+    ``submit`` queues a blob and returns at once; the resizing happens on a
+    small thread pool (Pillow releases the GIL while decoding and resizing).
+    Widths at or above the original's are skipped, so small images get fewer
+    or no copies; one that gets none is marked so it is not queued again.
+    """
+
+    def __init__(self, store, app=None, widths=DEFAULT_WIDTHS, workers=DEFAULT_WORKERS):
+        self.store = store
+        self.widths = tuple(sorted(widths))
+        self.workers = workers
+        self._executor = None
+        self._known = {}
+        self._lock = threading.Lock()
+        self._stats = {'queued': 0, 'generated': 0, 'thumbnails': 0, 'skipped': 0, 'failed': 0,
+                       'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0}
+        if app is not None:
+            self.init_app(app)
+
+    @property
+    def enabled(self):
+        return Image is not None
+
+    def init_app(self, app, url_path='/blobs'):
+        app.add_url_rule(f'{url_path}/<digest>/w<int:width>.webp', 'thumbnail', self.serve)
+        app.add_template_global(self.srcset, 'image_srcset')
+
+    def submit(self, digest):
+        """Queue thumbnail generation for a stored blob; None when Pillow is missing"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='thumbnails')
+            self._stats['queued'] += 1
+        return self._executor.submit(self._run, digest)
+
+    def _run(self, digest):
+        try:
+            return self.generate(digest)
+        except Exception as e:
+            self._count(failed=1)
+            print(f"⚠️ Thumbnails for {digest[:12]} failed: {e}")
+            return ()
+
+    def generate(self, digest):
+        """Write every thumbnail of a blob now and return the widths written"""
+        source = self.store.path(digest)
+        started = time.perf_counter()
+        with Image.open(source) as original:
+            widths = [width for width in self.widths if width < original.width]
+            if not widths:
+                open(self.store.path(digest, SKIPPED_MARKER), 'w').close()
+                self._remember(digest, ())
+                self._count(skipped=1)
+                return ()
+            # JPEG can decode straight at a reduced scale, far cheaper than full size
+            original.draft('RGB', (widths[-1], max(1, original.height * widths[-1] // original.width)))
+            image = ImageOps.exif_transpose(original)
+            has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+            # An EXIF rotation may have turned a wide photo into a narrow one
+            widths = [width for width in widths if width <= image.width]
+            bytes_out = 0
+            # Largest first, each smaller copy resized from the previous one
+            for width in reversed(widths):
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.LANCZOS)
+                bytes_out += self._save(image, self.store.path(digest, variant_name(width)))
+        self._remember(digest, tuple(widths))
+        self._count(generated=1, thumbnails=len(widths), bytes_in=os.path.getsize(source),
+                    bytes_out=bytes_out, seconds=time.perf_counter() - started)
+        return tuple(widths)
+
+    def _save(self, image, path):
+        # Write then rename so a request never sees half a file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+        os.close(fd)
+        try:
+            image.save(temp_path, 'WEBP', quality=WEBP_QUALITY, method=4)
+            # mkstemp creates the file private to its owner
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return os.path.getsize(path)
+
+    def available(self, digest):
+        """Widths that have a thumbnail on disk for this blob"""
+        with self._lock:
+            widths = self._known.get(digest)
+        if widths is None:
+            widths = tuple(width for width in self.widths
+                           if os.path.exists(self.store.path(digest, variant_name(width))))
+            self._remember(digest, widths)
+        return widths
+
+    def _remember(self, digest, widths):
+        with self._lock:
+            if len(self._known) >= MAX_KNOWN:
+                self._known.clear()
+            self._known[digest] = widths
+
+    def srcset(self, digest):
+        """srcset attribute value for a blob's thumbnails, '' while there are none"""
+        if not digest:
+            return ''
+        return ', '.join(f"{url_for('thumbnail', digest=digest, width=width)} {width}w"
+                         for width in self.available(digest))
+
+    def serve(self, digest, width):
+        if width not in self.widths:
+            abort(404)
+        return self.store.send(digest, variant_name(width))
+
+    def pending(self, digest):
+        """Whether a blob still needs its thumbnails made"""
+        return not self.available(digest) and not os.path.exists(self.store.path(digest, SKIPPED_MARKER))
+
+    def backfill(self, digests=None):
+        """Queue each blob (default: every stored one) still needing thumbnails; returns the futures"""
+        if not self.enabled:
+            return []
+        digests = self.store.digests() if digests is None else digests
+        return [self.submit(digest) for digest in digests if self.pending(digest)]
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['enabled'] = self.enabled
+        stats['widths'] = list(self.widths)
+        stats['ms_per_image'] = round(stats['seconds'] * 1000 / stats['generated'], 2) if stats['generated'] else 0.0
+        return stats
+
+
+def main(argv=None):
+    from blob_store import BlobStore
+
+    argv = sys.argv[1:] if argv is None else argv
+    root = argv[0] if argv else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads', 'blobs')
+    if Image is None:
+        print("🚨 Pillow is not installed: pip install Pillow")
+        return 1
+    pipeline = ThumbnailPipeline(BlobStore(root), workers=os.cpu_count() or DEFAULT_WORKERS)
+    started = time.perf_counter()
+    wait(pipeline.backfill())
+    stats = pipeline.stats()
+    print(f"🖼️ {stats['generated']} images → {stats['thumbnails']} thumbnails in "
+          f"{time.perf_counter() - started:.1f} s ({stats['skipped']} already small, {stats['failed']} failed); "
+          f"{stats['bytes_in'] / 1e6:.2f} MB of originals → {stats['bytes_out'] / 1e6:.2f} MB of thumbnails")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
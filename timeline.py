@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+📰 GREEN WORLD - Home Timeline Store
+- Fan-out-on-write: create_post copies the post id into every follower's timeline
+- Feed reads are one range scan of timelines(user_id, created_at, post_id)
+- Authors above FANOUT_FOLLOWER_LIMIT are merged in at read time instead
+- New follows backfill the followee's recent posts; unfollows remove them
+"""
+
+import heapq
+import os
+
+# Authors with more followers than this are not fanned out on write; their
+# posts are read from posts directly and merged into each page.
+FANOUT_FOLLOWER_LIMIT = int(os.environ.get('GREEN_WORLD_FANOUT_LIMIT', '1000'))
+# How many of a followee's most recent posts a new follow copies in
+BACKFILL_POSTS = 200
+
+# Only what the feed renders: never p.*, so wide or new post columns stay off the hot path
+FEED_COLUMNS = ('p.id, p.user_id, p.title, p.content, p.image_url, p.video_url, p.tags, p.post_type, '
+                'p.likes_count, p.comments_count, p.shares_count, p.created_at, '
+                'u.username, u.first_name, u.last_name, u.profile_image')
+
+
+def fan_out_post(conn, post_id):
+    """Copy a new post into its author's and followers' timelines.
+
+    Returns the number of timeline rows written. The caller commits.
+    """
+    author = conn.execute('''
+        SELECT p.user_id, u.followers_count
+        FROM posts p
+        JOIN users u ON p.user_id = u.id
+        WHERE p.id = ?
+    ''', (post_id,)).fetchone()
+    if author is None:
+        return 0
+    author_id, followers_count = author[0], author[1] or 0
+
+    # The author always sees their own post
+    written = conn.execute('''
+        INSERT OR IGNORE INTO timelines (user_id, created_at, post_id, author_id)
+        SELECT user_id, created_at, id, user_id FROM posts WHERE id = ?
+    ''', (post_id,)).rowcount
+
+    if followers_count > FANOUT_FOLLOWER_LIMIT:
+        return written
+
+    written += conn.execute('''
+        INSERT OR IGNORE INTO timelines (user_id, created_at, post_id, author_id)
+        SELECT f.follower_id, p.created_at, p.id, p.user_id
+        FROM follows f
+        JOIN posts p ON p.id = ?
+        WHERE f.following_id = ?
+    ''', (post_id, author_id)).rowcount
+    return written
+
+
+def backfill_follow(conn, follower_id, following_id, limit=BACKFILL_POSTS):
+    """Copy the followee's most recent posts into the follower's timeline"""
+    followers_count = conn.execute(
+        'SELECT followers_count FROM users WHERE id = ?', (following_id,)).fetchone()
+    if followers_count is not None and (followers_count[0] or 0) > FANOUT_FOLLOWER_LIMIT:
+        # Read-time author: nothing to materialize
+        return 0
+    return conn.execute('''
+        INSERT OR IGNORE INTO timelines (user_id, created_at, post_id, author_id)
+        SELECT ?, created_at, id, user_id FROM posts
+        WHERE user_id = ?
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    ''', (follower_id, following_id, limit)).rowcount
+
+
+def remove_follow(conn, follower_id, following_id):
+    """Drop an unfollowed author's posts from the follower's timeline"""
+    return conn.execute('''
+        DELETE FROM timelines WHERE user_id = ? AND author_id = ?
+    ''', (follower_id, following_id)).rowcount
+
+
+def read_only_followees(conn, user_id):
+    """Followed authors too big to fan out on write"""
+    return [row[0] for row in conn.execute('''
+        SELECT f.following_id
+        FROM follows f
+        JOIN users u ON u.id = f.following_id
+        WHERE f.follower_id = ? AND u.followers_count > ?
+    ''', (user_id, FANOUT_FOLLOWER_LIMIT))]
+
+
+def read_page(conn, user_id, limit, before=None):
+    """Up to `limit` feed rows for user_id, newest first.
+
+    `before` is an optional (created_at, post_id) keyset boundary. Rows from
+    high-follower authors are fetched from posts and merged in.
+    """
+    keyset = 'AND (t.created_at, t.post_id) < (?, ?)' if before else ''
+    params = [user_id] + (list(before) if before else []) + [limit]
+    rows = conn.execute(f'''
+        SELECT {FEED_COLUMNS}
+        FROM timelines t
+        JOIN posts p ON p.id = t.post_id
+        JOIN users u ON p.user_id = u.id
+        WHERE t.user_id = ? {keyset}
+        ORDER BY t.created_at DESC, t.post_id DESC
+        LIMIT ?
+    ''', params).fetchall()
+
+    authors = read_only_followees(conn, user_id)
+    if not authors:
+        return rows
+
+    # One range scan of posts(user_id, created_at, id) per author, already in
+    # feed order; a single "user_id IN (...)" query would sort every match instead
+    keyset = 'AND (p.created_at, p.id) < (?, ?)' if before else ''
+    pulled = [conn.execute(f'''
+        SELECT {FEED_COLUMNS}
+        FROM posts p
+        JOIN users u ON p.user_id = u.id
+        WHERE p.user_id = ? {keyset}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT ?
+    ''', [author] + (list(before) if before else []) + [limit]).fetchall() for author in authors]
+
+    # Every input is already newest-first; an author that crossed the limit
+    # can have posts in the timeline too, so skip ids already taken
+    merged, seen = [], set()
+    for row in heapq.merge(rows, *pulled, key=lambda r: (r['created_at'], r['id']), reverse=True):
+        if row['id'] in seen:
+            continue
+        seen.add(row['id'])
+        merged.append(row)
+        if len(merged) == limit:
+            break
+    return merged
+
+
+def rebuild(conn):
+    """Materialize every user's timeline from posts and follows (migration step)"""
+    conn.execute('DELETE FROM timelines')
+    conn.execute('''
+        INSERT OR IGNORE INTO timelines (user_id, created_at, post_id, author_id)
+        SELECT user_id, created_at, id, user_id FROM posts
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO timelines (user_id, created_at, post_id, author_id)
+        SELECT f.follower_id, p.created_at, p.id, p.user_id
+        FROM follows f
+        JOIN users u ON u.id = f.following_id
+        JOIN posts p ON p.user_id = f.following_id
+        WHERE u.followers_count <= ?
+    ''', (FANOUT_FOLLOWER_LIMIT,))